@@ -0,0 +1,122 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+
+from .settings import (
+    SUMMARIZER_MODEL, SENTIMENT_MODEL, MODEL_BACKEND, SUM_MAX_INPUT_TOKENS, SUM_MIN_CHUNK_TOKENS, SUM_MAX_LEN, SUM_MIN_LEN,
+    SUM_REDUCE, SUM_REDUCE_MAX_ROUNDS, SENTI_MAX_TOKENS, KW_EMBEDDING_MODEL, KEYWORDS_TOPK, RESULT_CACHE_ENABLED, RESULT_CACHE_PATH, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_AGE_DAYS,
+)
+
+
+def _clean(x) -> str:
+    if not isinstance(x, str):
+        return ""
+    return re.sub(r"\s+", " ", x.strip())
+
+def model_signature() -> str:
+    """결과에 영향을 주는 모델명/파라미터. 값이 바뀌면 캐시 키도 바뀜."""
+    return "|".join(map(str, (
+        SUMMARIZER_MODEL, SENTIMENT_MODEL, MODEL_BACKEND, SUM_MAX_INPUT_TOKENS, SUM_MIN_CHUNK_TOKENS, SUM_MAX_LEN, SUM_MIN_LEN,
+        SUM_REDUCE, SUM_REDUCE_MAX_ROUNDS, SENTI_MAX_TOKENS, KW_EMBEDDING_MODEL, KEYWORDS_TOPK,
+    )))
+
+def text_hash(content: str) -> str:
+    """정제 본문의 sha256 (모델과 무관한 기사 본문 식별자, 결과 파일의 content_hash)"""
+    return hashlib.sha256(_clean(content).encode("utf-8")).hexdigest()
+
+def content_key(content: str, signature: str | None = None) -> str:
+    """정제 본문 + 모델 시그니처의 sha256 (티커/실행과 무관하게 동일 본문이면 같은 키)"""
+    h = hashlib.sha256()
+    h.update((signature or model_signature()).encode("utf-8"))
+    h.update(b"\0")
+    h.update(_clean(content).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite 기반 영속 결과 캐시.
+    - key: content_key(), value: 분석 결과 dict(JSON)
+    - 조회 시 accessed_at 갱신 → 용량 초과 시 가장 오래 안 쓴 항목부터(LRU) 삭제
+    - max_age_days 지난 항목은 저장 시점에 정리
+    """
+    def __init__(self, path: str = RESULT_CACHE_PATH, max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+                 max_age_days: int = RESULT_CACHE_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_sec = max_age_days * 86400
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 여러 프로세스(워커)가 동시에 열 수 있도록 WAL + busy timeout
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed_at)")
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        # SQLite 변수 개수 제한 회피용 분할 조회
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            q = f"SELECT key, payload, created_at FROM results WHERE key IN ({','.join('?' * len(part))})"
+            for k, payload, created in self._conn.execute(q, part):
+                if self.max_age_sec and now - created > self.max_age_sec:
+                    continue
+                try:
+                    found[k] = json.loads(payload)
+                except ValueError:
+                    continue
+        if found:
+            self._conn.executemany("UPDATE results SET accessed_at = ? WHERE key = ?", [(now, k) for k in found])
+            self._conn.commit()
+        return found
+
+    def put_many(self, items: dict[str, dict]) -> None:
+        if not items:
+            return
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO results (key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            [(k, json.dumps(v, ensure_ascii=False), now, now) for k, v in items.items()],
+        )
+        self._conn.commit()
+        self.evict()
+
+    def evict(self) -> None:
+        if self.max_age_sec:
+            self._conn.execute("DELETE FROM results WHERE created_at < ?", (time.time() - self.max_age_sec,))
+        if self.max_entries:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            if n > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed_at ASC LIMIT ?)",
+                    (n - self.max_entries,),
+                )
+        self._conn.commit()
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+# Lazy 싱글톤 (비활성화 시 None)
+_cache = None
+
+def get_result_cache() -> ResultCache | None:
+    global _cache
+    if not RESULT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
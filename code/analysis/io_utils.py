@@ -1,10 +1,17 @@
 import os
 import glob
-from typing import List
+import uuid
+from typing import Iterable, Iterator, List, TYPE_CHECKING
 
-import pandas as pd
+from .settings import (
+    BASE_DIR, DATA_DIR, RAW_DIR, RESULTS_DIR, INPUT_FILENAMES, INPUT_PARTS_DIRNAME, INPUT_COLUMNS,
+    OUTPUT_COLUMNS, OUTPUT_PROB_COLUMNS, OUTPUT_FORMAT, MANIFEST_ENABLED,
+)
+from utils.manifest import get_manifest, partition_signature
 
-from .settings import BASE_DIR, DATA_DIR, RAW_DIR, RESULTS_DIR, INPUT_FILENAME, OUTPUT_COLUMNS
+# pandas는 실제 입출력 시점에 import (pending 판단만 하는 빈 실행의 시작 시간 단축)
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def list_tickers() -> List[str]:
@@ -23,34 +30,83 @@ def list_dates(ticker: str) -> List[str]:
 
 
 def input_path(ticker: str, date:str) -> str:
-    return os.path.join(RAW_DIR, ticker, date, INPUT_FILENAME)
+    """입력 파티션 디렉토리 (data/raw/{ticker}/{date})"""
+    return os.path.join(RAW_DIR, ticker, date)
+
+
+def input_files(path: str) -> List[str]:
+    """
+    입력 파티션의 파일 목록: 기본 파일(news.parquet 우선, 없으면 news.csv) + parts/part-* (생성 순)
+    path가 파일이면 그 파일만.
+    """
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for name in INPUT_FILENAMES:
+        p = os.path.join(path, name)
+        if os.path.exists(p):
+            files.append(p)
+            break
+    files += sorted(glob.glob(os.path.join(path, INPUT_PARTS_DIRNAME, "part-*.parquet"))
+                    + glob.glob(os.path.join(path, INPUT_PARTS_DIRNAME, "part-*.csv")))
+    return files
+
+
+def input_fingerprint(path: str) -> list[list]:
+    """입력 파일 목록의 [파일명, 크기, mtime_ns] (내용이 바뀌면 값도 바뀜)"""
+    out = []
+    for f in input_files(path):
+        st = os.stat(f)
+        out.append([os.path.relpath(f, path) if os.path.isdir(path) else os.path.basename(f), st.st_size, st.st_mtime_ns])
+    return out
 
 
 def output_path(ticker: str, date:str) -> str:
-    return os.path.join(RESULTS_DIR, ticker, f"{date}.csv")
+    ext = "csv" if OUTPUT_FORMAT == "csv" else "parquet"
+    return os.path.join(RESULTS_DIR, ticker, f"{date}.{ext}")
+
+
+def _existing_output(ticker: str, date: str) -> str | None:
+    """현재 형식의 결과 → 없으면 다른 형식(이전 csv 결과 등)"""
+    op = output_path(ticker, date)
+    if os.path.exists(op):
+        return op
+    base = os.path.splitext(op)[0]
+    for ext in (".parquet", ".csv"):
+        if os.path.exists(base + ext):
+            return base + ext
+    return None
+
+
+def _num_rows(path: str) -> int:
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows  # 메타데이터만 읽음
+    import pandas as pd
+    return len(pd.read_csv(path, nrows=1))
+
 
 def is_pending(ticker: str, date: str) -> bool:
     """입력 존재 & (출력 없음 or 입력이 더 최신 or 출력이 비어있음) → 처리 필요"""
-    ip = input_path(ticker, date)
-    op = output_path(ticker, date)
+    files = input_files(input_path(ticker, date))
 
     # 입력 없으면 처리 불가 → pending 아님
-    if not os.path.exists(ip):
+    if not files:
         return False
 
+    op = _existing_output(ticker, date)
     # 출력이 없으면 처리 필요
-    if not os.path.exists(op):
+    if op is None:
         return True
 
     try:
-        # 입력이 더 최근이면 재처리
-        if os.path.getmtime(ip) > os.path.getmtime(op):
+        # 입력(기본 파일/조각 중 하나라도)이 더 최근이면 재처리
+        if max(os.path.getmtime(f) for f in files) > os.path.getmtime(op):
             return True
 
         # 출력이 비어 있으면 재처리
         try:
-            out_head = pd.read_csv(op, nrows=1)
-            if out_head.empty:
+            if _num_rows(op) == 0:
                 return True
         except Exception:
             # 손상/파싱 오류 시 재처리
@@ -63,31 +119,222 @@ def is_pending(ticker: str, date: str) -> bool:
 
 
 def pending_dates(ticker: str) -> list[str]:
-    """해당 티커에서 처리 필요 날짜만 반환"""
-    return [d for d in list_dates(ticker) if is_pending(ticker, d)]
+    """
+    해당 티커에서 처리 필요 날짜만 반환.
+    매니페스트 사용 시 쿼리 1회 + 디렉토리 목록으로 판단하고,
+    매니페스트에 없는 날짜(이전 레이아웃/수동 복사 등)만 기존 방식(is_pending)으로 1회 판단 후 기록.
+    """
+    if not MANIFEST_ENABLED:
+        return [d for d in list_dates(ticker) if is_pending(ticker, d)]
+
+    manifest = get_manifest(os.path.join(RAW_DIR, ticker))
+    known = manifest.entries()
+    pending = set(manifest.pending())
+    for d in list_dates(ticker):
+        if d in known and known[d]["input_sig"] is not None:
+            continue
+        sig = partition_signature(input_path(ticker, d))
+        if sig is None:
+            continue
+        manifest.record_input(d, sig)
+        if is_pending(ticker, d):
+            pending.add(d)
+        else:
+            manifest.record_output(d, sig, rows=None)
+    return sorted(pending)
 
 
-def read_news_csv(path: str) -> pd.DataFrame:
-    if not os.path.exists(path):
+def input_signature(ticker: str, date: str) -> str | None:
+    """처리 시작 시점의 입력 지문(매니페스트 값 우선, 없으면 계산). 처리 완료 후 mark_done에 전달"""
+    if not MANIFEST_ENABLED:
+        return None
+    manifest = get_manifest(os.path.join(RAW_DIR, ticker))
+    sig = manifest.input_sig(date)
+    if sig is None:
+        sig = partition_signature(input_path(ticker, date))
+        manifest.record_input(date, sig)
+    return sig
+
+
+def mark_done(ticker: str, date: str, sig: str | None, rows: int | None) -> None:
+    """결과 저장 성공 → 매니페스트에 처리한 입력 지문 기록(이후 입력이 바뀌기 전까지 pending 아님)"""
+    if MANIFEST_ENABLED and sig is not None:
+        get_manifest(os.path.join(RAW_DIR, ticker)).record_output(date, sig, rows)
+
+
+def _read_input_file(path: str) -> "pd.DataFrame":
+    import pandas as pd
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        names = pq.read_schema(path).names
+        return pd.read_parquet(path, columns=[c for c in INPUT_COLUMNS if c in names])
+    return pd.read_csv(path, usecols=lambda c: c in INPUT_COLUMNS, dtype=str)
+
+
+def _has_body(df: "pd.DataFrame") -> "pd.Series":
+    """본문을 받은 행(크롤러 수집 실패 행은 빈 본문/"본문 없음") — url 중복 시 이 행을 우선(storage.read_partition과 동일)"""
+    content = df["content"].fillna("").astype(str).str.strip()
+    return (content != "") & (content != "본문 없음")
+
+
+def read_news(path: str) -> "pd.DataFrame":
+    """입력 파티션(또는 단일 파일)을 읽어 url/title/content 문자열 컬럼으로 반환(url 중복은 본문을 받은 행 → 먼저 나온 행 우선)"""
+    import pandas as pd
+
+    files = input_files(path)
+    if not files:
         raise FileNotFoundError(path)
-    df = pd.read_csv(path)
-    # content 필드 유효성 보정
-    if "content" not in df.columns:
-        df["content"] = ""
-    else:
-        df["content"] = df["content"].map(lambda x: x.strip() if isinstance(x, str) else "")
+    frames = [_read_input_file(f) for f in files]
+    df = pd.concat(frames, ignore_index=True, sort=False) if len(frames) > 1 else frames[0]
+    for c in INPUT_COLUMNS:
+        if c not in df.columns:
+            df[c] = ""
+    # content 필드 유효성 보정 + 문자열 타입 고정
+    for c in INPUT_COLUMNS:
+        df[c] = df[c].map(lambda x: x.strip() if isinstance(x, str) else "").astype(str)
+    if len(frames) > 1:
+        # 이전 실행의 수집 실패 행보다 재시도로 받은 본문 행을 남김(원래 순서 유지)
+        order = (~_has_body(df)).sort_values(kind="stable").index
+        df = df.loc[order].drop_duplicates(subset=["url"], keep="first").sort_index().reset_index(drop=True)
     return df
 
 
+def _iter_input_file(path: str, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(path)
+        cols = [c for c in INPUT_COLUMNS if c in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=chunk_rows, columns=cols):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, usecols=lambda c: c in INPUT_COLUMNS, dtype=str, chunksize=chunk_rows)
+
+
+def iter_news(path: str, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+    """
+    read_news의 스트리밍 버전: 파일별로 최대 chunk_rows행씩 읽어 반환(하루치 전체를 메모리에 올리지 않음).
+    url 중복은 본문을 받은 행 중 먼저 나온 행 우선으로 제거(수집 실패 행은 뒤에 재시도 성공 행이 있어도 그대로 반환되지만
+    본문이 없어 분석에서 제외). 같은 입력이면 청크 경계도 항상 같음(체크포인트 재개용).
+    """
+    files = input_files(path)
+    if not files:
+        raise FileNotFoundError(path)
+    seen: set[str] = set()
+    for f in files:
+        for df in _iter_input_file(f, chunk_rows):
+            df = df.reindex(columns=INPUT_COLUMNS)
+            for c in INPUT_COLUMNS:
+                df[c] = df[c].map(lambda x: x.strip() if isinstance(x, str) else "").astype(str)
+            urls, body = df["url"], _has_body(df)
+            # 본문 행: 이미 본 url이거나 청크 안 앞선 본문 행과 중복 / 실패 행: 본문 행이 있는 url이거나 앞선 실패 행과 중복
+            dup = (urls != "") & (
+                urls.isin(seen)
+                | (body & urls.where(body).duplicated())
+                | (~body & (urls.isin(urls[body]) | urls.where(~body).duplicated()))
+            )
+            seen.update(urls[body & ~dup & (urls != "")])
+            yield df[~dup].reset_index(drop=True)
+
+
+def read_results(path: str, columns: List[str] | None = None) -> "pd.DataFrame":
+    """결과 파일 읽기(확장자로 형식 판단, columns 지정 시 해당 컬럼만). 없으면 빈 DataFrame"""
+    import pandas as pd
+
+    base = os.path.splitext(path)[0]
+    for p in (path, base + ".parquet", base + ".csv"):
+        if not os.path.exists(p):
+            continue
+        if p.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            names = pq.read_schema(p).names
+            return pd.read_parquet(p, columns=[c for c in columns if c in names] if columns else None)
+        return pd.read_csv(p, usecols=(lambda c: c in columns) if columns else None)
+    return pd.DataFrame(columns=columns or OUTPUT_COLUMNS)
+
+
+def iter_results(path: str, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+    """read_results의 스트리밍 버전(기존 결과를 chunk_rows행씩)"""
+    import pandas as pd
+
+    base = os.path.splitext(path)[0]
+    for p in (path, base + ".parquet", base + ".csv"):
+        if not os.path.exists(p):
+            continue
+        if p.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(p).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(p, chunksize=chunk_rows)
+        return
+
+
 def ensure_dir_for_file(fpath: str) -> None:
     os.makedirs(os.path.dirname(fpath), exist_ok = True)
 
 
-def write_results(path: str, df: pd.DataFrame) -> None:
-    ensure_dir_for_file(path)
-    out = df[OUTPUT_COLUMNS].copy()
+def _normalize_results(df: "pd.DataFrame") -> "pd.DataFrame":
+    import pandas as pd
+
+    # 이전 결과에 없던 컬럼(예: 감성 확률)은 빈 값으로 채움
+    out = df.reindex(columns=OUTPUT_COLUMNS).copy()
     for c in out.columns:
-        if out[c].dtype == object:
-            out[c] = out[c].map(lambda x: x.strip() if isinstance(x, str) else "")
-    out.to_csv(path, index=False)
+        if c in OUTPUT_PROB_COLUMNS:
+            out[c] = pd.to_numeric(out[c], errors="coerce")
+        else:
+            out[c] = out[c].map(lambda x: x.strip() if isinstance(x, str) else "").astype(str)
+    return out
+
+
+def _remove_legacy_csv(path: str) -> None:
+    # 형식 전환 후 남은 이전 csv 결과 제거(중복 결과 방지)
+    legacy = os.path.splitext(path)[0] + ".csv"
+    if path.endswith(".parquet") and os.path.exists(legacy):
+        os.remove(legacy)
 
+
+def write_results(path: str, df: "pd.DataFrame") -> None:
+    ensure_dir_for_file(path)
+    out = _normalize_results(df)
+    if path.endswith(".parquet"):
+        out.to_parquet(path, index=False)
+    else:
+        out.to_csv(path, index=False)
+    _remove_legacy_csv(path)
+
+
+def write_results_stream(path: str, frames: Iterable["pd.DataFrame"]) -> int:
+    """
+    결과 DataFrame 스트림을 임시 파일에 순서대로 이어 쓴 뒤 os.replace로 교체(메모리는 프레임 1개 분량).
+    반환값: 기록한 행 수
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    ensure_dir_for_file(path)
+    tmp = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    schema = pa.schema([(c, pa.float64() if c in OUTPUT_PROB_COLUMNS else pa.string()) for c in OUTPUT_COLUMNS])
+    n = 0
+    try:
+        if path.endswith(".parquet"):
+            with pq.ParquetWriter(tmp, schema) as writer:
+                for df in frames:
+                    writer.write_table(pa.Table.from_pandas(_normalize_results(df), schema=schema, preserve_index=False))
+                    n += len(df)
+        else:
+            header = True
+            for df in frames:
+                _normalize_results(df).to_csv(tmp, index=False, mode="w" if header else "a", header=header)
+                header = False
+                n += len(df)
+            if header:
+                import pandas as pd
+                pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _remove_legacy_csv(path)
+    return n
@@ -1,14 +1,106 @@
+import threading
+from collections import OrderedDict
+
 from .nlp_models import get_kw_model
-from .settings import KEYWORDS_TOPK
+from .model_server import call_model_server
+from .settings import KEYWORDS_TOPK, KW_BATCH_SIZE, KW_PHRASE_CACHE_SIZE
+
+def _s(x): return x.strip() if isinstance(x, str) else ""
+
+# 후보 구(phrase) 임베딩 LRU 캐시: 금융 기사 어휘는 문서/날짜 간 반복이 많아 재계산을 크게 줄임
+_phrase_cache: "OrderedDict[str, object]" = OrderedDict()
+_phrase_lock = threading.Lock()
 
 def extract_keywords(text: str, top_k: int = KEYWORDS_TOPK) -> str:
-    def _s(x): return x.strip() if isinstance(x, str) else ""
     text = _s(text)
     if not text:
         return ""
+    res = call_model_server("keywords", [text], top_k=top_k)
+    if res is not None:
+        return res[0]
     try:
         pairs = get_kw_model().extract_keywords(text, top_n=top_k)
         return ", ".join([_s(w) for w, _ in pairs])
     except Exception as e:
         return f"error: {e}"
 
+def _embed(kw, texts: list[str], batch_size: int):
+    """KeyBERT 백엔드 임베딩(sentence-transformers면 encode에 batch_size 전달)"""
+    import numpy as np
+
+    st = getattr(kw.model, "embedding_model", None)
+    if st is not None and hasattr(st, "encode"):
+        return np.asarray(st.encode(texts, batch_size=batch_size, show_progress_bar=False))
+    return np.asarray(kw.model.embed(texts))
+
+def _phrase_embeddings(kw, phrases: list[str], batch_size: int):
+    """캐시에 없는 후보 구만 한 번에 임베딩 → phrases 순서의 행렬"""
+    import numpy as np
+
+    with _phrase_lock:
+        found = {p: _phrase_cache[p] for p in phrases if p in _phrase_cache}
+        for p in found:
+            _phrase_cache.move_to_end(p)
+    missing = [p for p in phrases if p not in found]
+    if missing:
+        for p, v in zip(missing, _embed(kw, missing, batch_size)):
+            found[p] = v
+        with _phrase_lock:
+            for p in missing:
+                _phrase_cache[p] = found[p]
+            while len(_phrase_cache) > KW_PHRASE_CACHE_SIZE:
+                _phrase_cache.popitem(last=False)
+    return np.vstack([found[p] for p in phrases])
+
+def _normalize(m):
+    import numpy as np
+    return m / np.clip(np.linalg.norm(m, axis=1, keepdims=True), 1e-12, None)
+
+def _extract_keywords_vectorized(kw, docs: list[str], top_k: int, batch_size: int) -> list[list[str]]:
+    """
+    KeyBERT 기본 방식(CountVectorizer 1-gram 후보, 영어 불용어 제거, 문서-후보 코사인 유사도 상위 top_k)을
+    문서 임베딩 1회 + 후보 구 임베딩 캐시로 계산
+    """
+    import numpy as np
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    count = CountVectorizer(ngram_range=(1, 1), stop_words="english", min_df=1).fit(docs)
+    words = count.get_feature_names_out()
+    df = count.transform(docs)
+
+    doc_emb = _normalize(_embed(kw, docs, batch_size))
+    word_emb = _normalize(_phrase_embeddings(kw, list(words), batch_size))
+
+    out = []
+    for i in range(len(docs)):
+        cand = df[i].nonzero()[1]
+        if len(cand) == 0:
+            out.append([])
+            continue
+        sims = word_emb[cand] @ doc_emb[i]
+        top = np.argsort(sims)[::-1][:top_k]
+        out.append([str(words[cand[j]]) for j in top])
+    return out
+
+def extract_keywords_batch(texts: list[str], top_k: int = KEYWORDS_TOPK, batch_size: int = KW_BATCH_SIZE) -> list[str]:
+    """
+    문서 리스트의 키워드를 한 번에 추출(문서 임베딩 1회, 후보 구 임베딩은 캐시 재사용).
+    batch_size는 임베딩 모델 encode 배치 크기. 모델 서버 설정 시 서버에 위임(실패 시 로컬 모델).
+    """
+    res = call_model_server("keywords", texts, top_k=top_k)
+    if res is not None:
+        return res
+    texts = [_s(t) for t in texts]
+    out = [""] * len(texts)
+    idx = [i for i, t in enumerate(texts) if t]
+    if not idx:
+        return out
+    try:
+        res = _extract_keywords_vectorized(get_kw_model(), [texts[i] for i in idx], top_k, batch_size)
+        for i, words in zip(idx, res):
+            out[i] = ", ".join([_s(w) for w in words])
+    except Exception:
+        # 불용어만 있는 입력(빈 어휘) 등 → 건별 KeyBERT로 폴백
+        for i in idx:
+            out[i] = extract_keywords(texts[i], top_k=top_k)
+    return out
@@ -1,13 +1,109 @@
 import argparse
 import os
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+# processor/nlp_models(→ transformers, torch)는 처리할 작업이 있을 때만 import (빈 실행은 즉시 종료)
 from .io_utils import list_tickers, list_dates, input_path, pending_dates
-from .processor import process_one_day
+from .settings import (
+    RAW_DIR, TORCH_THREADS, MODEL_WARMUP, QUEUE_POLL_SEC, QUEUE_LEASE_SEC, QUEUE_MAX_ATTEMPTS, QUEUE_IDLE_TIMEOUT_SEC,
+)
+from utils.work_queue import get_work_queue
 
 
-def run(ticker: str | None, date: str | None, mode: str) -> None:
+def _print_phases(phases: dict[str, float]) -> None:
+    print("──── Startup Timing ────")
+    for name, sec in phases.items():
+        print(f"  {name}: {sec:.2f} sec")
+    print("────────────────────────")
+
+
+def _preload(warmup: bool) -> dict[str, float]:
+    """모델 서버 사용 시 연결 확인만, 아니면 로컬 모델 선로드"""
+    from .model_server import get_model_client
+    client = get_model_client()
+    if client is not None:
+        t0 = time.perf_counter()
+        client.ping()
+        return {"model server": time.perf_counter() - t0}
+
+    from .nlp_models import preload_models
+    return preload_models(warmup)
+
+
+def _init_worker(threads: int, warmup: bool = MODEL_WARMUP) -> None:
+    """워커 프로세스 초기화: 스레드 과다 구독 방지 + 모델 1회 로드(+ 워밍업)"""
+    # torch import 전에 설정해야 OpenMP/MKL 풀에 반영됨
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    from .model_server import get_model_client
+    if get_model_client() is None:
+        import torch
+        torch.set_num_threads(threads)
+
+    phases = _preload(warmup)
+    print(f"worker {os.getpid()} ready: " + ", ".join(f"{k}={v:.2f}s" for k, v in phases.items()))
+
+
+def _process_unit(unit: tuple[str, str, str], stream: bool = False) -> tuple[str, str, str, float, bool]:
+    """(ticker, date, 결과 메시지, 소요 시간, 완료 여부(입력 없음 포함))"""
+    from .processor import process_one_day, process_one_day_streaming
+
+    t, d, ipath = unit
+    t0 = time.perf_counter()
+    ok = True
+    try:
+        process = process_one_day_streaming if stream else process_one_day
+        path, stats = process(t, d, ipath, with_stats=True)
+        st = stats["sentiment_stats"]
+        msg = (f"📁 저장 완료: {path} (감성 avg={st['avg']:+.3f}, "
+               f"pos/neg/neu={st['positive_ratio']:.0%}/{st['negative_ratio']:.0%}/{st['neutral_ratio']:.0%}, "
+               f"keywords={stats['keyword_count']})")
+    except FileNotFoundError:
+        msg = f"⚠️ 입력 없음: {ipath}"
+    except Exception as e:
+        msg = f"❗ 오류: {t} {d} → {e}"
+        ok = False
+    return t, d, msg, time.perf_counter() - t0, ok
+
+
+def _print_timing(timings: list[tuple[str, str, float]], elapsed: float) -> None:
+    if not timings:
+        return
+    print("\n──── Analysis Timing ────")
+    for t, d, sec in sorted(timings, key=lambda x: -x[2]):
+        print(f"  {t} {d}: {sec:.2f} sec")
+    busy = sum(x[2] for x in timings)
+    print(f"⏱  units={len(timings)} wall={elapsed:.2f} sec busy={busy:.2f} sec avg={busy / len(timings):.2f} sec")
+    print("─────────────────────────\n")
+
+
+def _run_parallel(units: list[tuple[str, str, str]], workers: int, warmup: bool = MODEL_WARMUP,
+                  stream: bool = False) -> None:
+    threads = TORCH_THREADS or max(1, (os.cpu_count() or 1) // workers)
+    print(f"workers={workers}, torch threads/worker={threads}")
+    t0 = time.perf_counter()
+    timings = []
+    # fork 시 부모의 torch 스레드 풀 상태가 복제되지 않도록 spawn 사용
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(threads, warmup)) as ex:
+        futures = [ex.submit(_process_unit, u, stream) for u in units]
+        for fut in as_completed(futures):
+            t, d, msg, sec, _ = fut.result()
+            timings.append((t, d, sec))
+            print(f"{msg} ({sec:.2f}s)")
+    _print_timing(timings, time.perf_counter() - t0)
+
+
+def run(ticker: str | None, date: str | None, mode: str, batch_scope: str = "day", workers: int = 1,
+        warmup: bool = MODEL_WARMUP, stream: bool = False) -> None:
+    t_start = time.perf_counter()
     tickers = [ticker] if ticker else list_tickers()
     print(f"tickers : {tickers}")
+    units = []
     for t in tickers:
         if date:
             dates = [date]
@@ -18,27 +114,107 @@ def run(ticker: str | None, date: str | None, mode: str) -> None:
             print(f"⏭️ {t}: 처리할 날짜가 없습니다(mode={mode}).")
             continue
 
-        for d in dates:
-            ipath = input_path(t, d)
-            try:
-                out = process_one_day(t, d, ipath)
-                print(f"📁 저장 완료: {out}")
-            except FileNotFoundError:
-                print(f"⚠️ 입력 없음: {ipath}")
-            except Exception as e:
-                print(f"❗ 오류: {t} {d} → {e}")
+        units.extend((t, d, input_path(t, d)) for d in dates)
+
+    phases = {"scan": time.perf_counter() - t_start}
+    if not units:
+        _print_phases(phases)
+        return
+
+    if workers > 1 and len(units) > 1 and batch_scope != "run":
+        # 모델 로드/워밍업은 각 워커 initializer에서 수행
+        _print_phases(phases)
+        _run_parallel(units, min(workers, len(units)), warmup, stream)
+        return
+
+    phases.update(_preload(warmup))
+    _print_phases(phases)
+
+    # 실행 단위 배치: 모든 티커/날짜의 기사를 모아 한 번에 추론
+    if batch_scope == "run":
+        from .processor import process_days
+
+        for (t, d), res in process_days(units).items():
+            if isinstance(res, FileNotFoundError):
+                print(f"⚠️ 입력 없음: {input_path(t, d)}")
+            elif isinstance(res, Exception):
+                print(f"❗ 오류: {t} {d} → {res}")
+            else:
+                print(f"📁 저장 완료: {res}")
+        return
+
+    t0 = time.perf_counter()
+    timings = []
+    for u in units:
+        t, d, msg, sec, _ = _process_unit(u, stream)
+        timings.append((t, d, sec))
+        print(msg)
+    _print_timing(timings, time.perf_counter() - t0)
+
+def follow(stream: bool = False, warmup: bool = MODEL_WARMUP, idle_timeout: float = QUEUE_IDLE_TIMEOUT_SEC) -> None:
+    """
+    파이프라인 소비자: 크롤러가 파티션을 저장할 때마다 작업 큐로 받은 (ticker, date)를 바로 분석.
+    - 성공(ack)/실패(nack, 재시도) 처리, 중단되면 lease 만료 후 다른 소비자가 다시 처리(at-least-once)
+    - 생산자(크롤러)가 종료되고 큐가 비면 종료 → 마지막으로 pending 실행으로 누락분 확인
+    """
+    q = get_work_queue(RAW_DIR, lease_sec=QUEUE_LEASE_SEC)
+    start = q.meta()
+    q.heartbeat()
+    print(f"🔄 작업 큐 대기: {q.path}")
+
+    preloaded, timings = False, []
+    t0 = last_activity = time.time()
+    while True:
+        claimed = q.claim(1)
+        if claimed:
+            if not preloaded:
+                _print_phases(_preload(warmup))
+                preloaded = True
+            t, d = claimed[0]
+            _, _, msg, sec, ok = _process_unit((t, d, input_path(t, d)), stream)
+            if ok:
+                q.ack(t, d)
+            else:
+                q.nack(t, d, max_attempts=QUEUE_MAX_ATTEMPTS)
+            timings.append((t, d, sec))
+            print(f"{msg} ({sec:.2f}s, 대기 {q.depth()}건)")
+            last_activity = time.time()
+            continue
+
+        # 이 소비자 시작 이후 생산자가 열렸던 적이 있고, 지금 닫혀 있으면 종료
+        m = q.meta()
+        seen = start.get("producer_state") == "open" or m.get("producer_gen") != start.get("producer_gen")
+        if seen and m.get("producer_state") == "closed" and q.depth() == 0:
+            break
+        if time.time() - max(last_activity, float(m.get("producer_at", "0"))) > idle_timeout:
+            print(f"⏹️ 생산자 활동 없음({idle_timeout:.0f}s) → 종료")
+            break
+        q.heartbeat()
+        time.sleep(QUEUE_POLL_SEC)
+
+    _print_timing(timings, time.time() - t0)
+    # 큐 밖에서 생긴 입력 변경/실패 작업은 매니페스트 기준으로 마무리
+    run(None, None, "pending", warmup=warmup and not preloaded, stream=stream)
 
 def main():
     p = argparse.ArgumentParser(description="StockMind Step 2: Analysis")
     p.add_argument("--ticker", type=str, default=None, help="특정 티커만 처리")
     p.add_argument("--date", type=str, default=None, help="특정 날짜만 처리 (YYYY-MM-DD)")
     p.add_argument("--mode", choices=["all", "pending"], default="pending", help="처리 범위: 전체(all) 또는 미처리/갱신 필요만(pending)")
+    p.add_argument("--batch-scope", choices=["day", "run"], default="day", help="배치 추론 범위: 티커/날짜 단위(day) 또는 실행 전체(run)")
+    p.add_argument("--workers", type=int, default=1, help="(ticker, date) 단위 병렬 처리 프로세스 수 (batch-scope=day에서만 적용)")
+    p.add_argument("--stream", action="store_true", help="청크 단위 스트리밍 처리(메모리 제한, 체크포인트로 중단 후 재개). batch-scope=day에서만 적용")
+    p.add_argument("--follow", action="store_true", help="크롤러와 동시 실행: 작업 큐(STOCKMIND_PIPELINE_QUEUE=true로 크롤링)에서 저장된 파티션을 받아 바로 분석")
+    p.add_argument("--no-warmup", action="store_true", help="모델 로드 후 더미 추론(워밍업) 생략")
     args = p.parse_args()
-    
+
     # 디버그 로그
-    print(f"args: ticker={args.ticker}. date={args.date}, mode={args.mode}")
+    print(f"args: ticker={args.ticker}. date={args.date}, mode={args.mode}, batch_scope={args.batch_scope}, workers={args.workers}, stream={args.stream}, follow={args.follow}")
 
-    run(args.ticker, args.date, args.mode)
+    if args.follow:
+        follow(stream=args.stream, warmup=not args.no_warmup)
+        return
+    run(args.ticker, args.date, args.mode, args.batch_scope, args.workers, warmup=not args.no_warmup, stream=args.stream)
 
 if __name__ == "__main__":
     main()
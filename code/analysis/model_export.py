@@ -0,0 +1,126 @@
+import argparse
+import os
+import shutil
+import time
+
+from .nlp_models import BACKENDS, build_pipeline, local_model_dir, _ort_model_class
+from .settings import SUMMARIZER_MODEL, SENTIMENT_MODEL, MODEL_BACKEND
+
+MODELS = [("summarization", SUMMARIZER_MODEL), ("sentiment-analysis", SENTIMENT_MODEL)]
+
+# 패리티 검사용 기본 문장 (--ticker/--date 지정 시 실제 기사 본문 사용)
+SAMPLE_TEXTS = [
+    "Apple reported record quarterly revenue as iPhone sales beat analyst expectations, sending shares higher in after-hours trading.",
+    "Tesla shares fell sharply after the company missed delivery estimates and warned of slowing demand in China.",
+    "Microsoft said it will continue to invest in data centers, while keeping its full-year guidance unchanged.",
+    "Nvidia announced a new chip architecture, but investors remained cautious amid concerns about export restrictions.",
+    "Amazon's cloud division grew faster than expected, offsetting weaker margins in its retail business.",
+]
+
+
+def _quantize_onnx(src: str, dst: str) -> None:
+    """src의 모든 .onnx 파일을 동적 int8로 양자화해 같은 파일명으로 dst에 저장(설정/토크나이저 파일은 복사)"""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    os.makedirs(dst, exist_ok=True)
+    for f in sorted(os.listdir(src)):
+        path = os.path.join(src, f)
+        if f.endswith(".onnx"):
+            ORTQuantizer.from_pretrained(src, file_name=f).quantize(
+                save_dir=dst, quantization_config=qconfig, file_suffix=None,
+            )
+        elif os.path.isfile(path):
+            shutil.copy2(path, os.path.join(dst, f))
+
+
+def export_models(backend: str) -> None:
+    """onnx / onnx-int8 백엔드용 모델을 MODEL_DIR 아래로 내보내기 (torch/int8은 로드 시 처리)"""
+    if not backend.startswith("onnx"):
+        print(f"ℹ️ {backend}: 내보내기 불필요(로드 시 처리)")
+        return
+    from transformers import AutoTokenizer
+
+    for task, name in MODELS:
+        dst = local_model_dir(name, "onnx")
+        if not os.path.isdir(dst):
+            t0 = time.perf_counter()
+            model = _ort_model_class(task).from_pretrained(name, export=True)
+            model.save_pretrained(dst)
+            AutoTokenizer.from_pretrained(name).save_pretrained(dst)
+            print(f"📦 ONNX 내보내기: {name} → {dst} ({time.perf_counter() - t0:.1f}s)")
+        if backend == "onnx-int8":
+            qdst = local_model_dir(name, "onnx-int8")
+            _quantize_onnx(dst, qdst)
+            print(f"📦 int8 양자화: {name} → {qdst}")
+
+
+def _jaccard(a: str, b: str) -> float:
+    x, y = set(a.lower().split()), set(b.lower().split())
+    return len(x & y) / len(x | y) if x | y else 1.0
+
+
+def parity_check(backend: str, texts: list[str] = SAMPLE_TEXTS) -> dict:
+    """
+    torch 기준 대비 backend 출력 비교 + 처리 시간.
+    - sentiment: 라벨 일치율, 최대 점수 차이
+    - summary: 동일 입력 토큰에 대한 요약 단어 Jaccard 평균
+    """
+    from .summarizer import _chunk_token_ids, _generate
+
+    report = {"backend": backend, "n": len(texts)}
+
+    ref, cand = (build_pipeline("sentiment-analysis", SENTIMENT_MODEL, b) for b in ("torch", backend))
+    t0 = time.perf_counter()
+    r = ref(texts, truncation=True)
+    t1 = time.perf_counter()
+    c = cand(texts, truncation=True)
+    t2 = time.perf_counter()
+    report["sentiment_label_agree"] = sum(a["label"] == b["label"] for a, b in zip(r, c)) / len(texts)
+    report["sentiment_max_score_diff"] = max(abs(a["score"] - b["score"]) for a, b in zip(r, c))
+    report["sentiment_speedup"] = (t1 - t0) / max(t2 - t1, 1e-9)
+    del ref, cand
+
+    ref, cand = (build_pipeline("summarization", SUMMARIZER_MODEL, b) for b in ("torch", backend))
+    chunks = [_chunk_token_ids(t, ref.tokenizer)[0] for t in texts if t]
+    t0 = time.perf_counter()
+    r = _generate(ref, chunks)
+    t1 = time.perf_counter()
+    c = _generate(cand, chunks)
+    t2 = time.perf_counter()
+    report["summary_jaccard"] = sum(_jaccard(a, b) for a, b in zip(r, c)) / max(1, len(chunks))
+    report["summary_speedup"] = (t1 - t0) / max(t2 - t1, 1e-9)
+
+    report["ok"] = report["sentiment_label_agree"] >= 0.9 and report["summary_jaccard"] >= 0.7
+    return report
+
+
+def _load_texts(ticker: str, date: str, limit: int) -> list[str]:
+    from .io_utils import input_path, read_news
+    df = read_news(input_path(ticker, date))
+    return [c for c in df["content"].tolist() if c][:limit]
+
+
+def main():
+    p = argparse.ArgumentParser(description="분석 모델 백엔드 내보내기 / 패리티 검사")
+    p.add_argument("--backend", choices=BACKENDS, default=MODEL_BACKEND)
+    p.add_argument("--export", action="store_true", help="MODEL_DIR 아래로 ONNX(양자화) 모델 내보내기")
+    p.add_argument("--check", action="store_true", help="torch 대비 출력/속도 비교")
+    p.add_argument("--ticker", type=str, default=None, help="패리티 검사에 사용할 기사 티커")
+    p.add_argument("--date", type=str, default=None, help="패리티 검사에 사용할 기사 날짜 (YYYY-MM-DD)")
+    p.add_argument("--limit", type=int, default=16, help="패리티 검사 기사 수")
+    args = p.parse_args()
+
+    if args.export:
+        export_models(args.backend)
+    if args.check:
+        texts = _load_texts(args.ticker, args.date, args.limit) if args.ticker and args.date else SAMPLE_TEXTS
+        report = parity_check(args.backend, texts)
+        print("\n──── Backend Parity ────")
+        for k, v in report.items():
+            print(f"  {k}: {v:.3f}" if isinstance(v, float) else f"  {k}: {v}")
+        print("────────────────────────\n")
+
+if __name__ == "__main__":
+    main()
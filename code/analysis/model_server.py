@@ -0,0 +1,309 @@
+"""
+노드당 1개의 모델 사본을 여러 분석 프로세스가 공유하기 위한 로컬 추론 서버 (Unix 소켓)
+- 서버: python -m analysis.model_server (모델 선로드 후 대기, --check: 작업별 응답 확인 후 종료)
+- 클라이언트: ANALYSIS_MODEL_SERVER=<소켓 경로> 설정 시 summarize/sentiment/keywords 호출을 서버에 위임(서버 오류·연결 끊김 시 로컬 모델)
+- 동적 배치: 작업(op)별로 여러 호출자의 요청을 MAX_WAIT_MS 동안 모아 한 번에 추론
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import Listener, Client
+
+from .settings import (
+    MODEL_SERVER_ADDRESS, MODEL_SERVER_AUTHKEY, MODEL_SERVER_MAX_BATCH, MODEL_SERVER_MAX_WAIT_MS, KEYWORDS_TOPK,
+)
+
+# 서버 프로세스 안에서는 클라이언트 모드 비활성화(자기 자신에게 위임하지 않도록)
+_serving = False
+
+
+def _mark_serving() -> None:
+    # python -m 실행 시 이 파일은 __main__으로 로드되고, 래퍼(summarizer 등)는 analysis.model_server를 따로 import
+    # → 전역이 두 벌이므로 import되는 모듈 쪽에도 표시
+    global _serving
+    _serving = True
+    if __name__ == "__main__":
+        import importlib
+        importlib.import_module(f"{__package__}.model_server")._serving = True
+
+
+# ─── 서버 ───────────────────────────────────────────────
+
+class _Request:
+    __slots__ = ("texts", "result", "error", "done")
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _Batcher(threading.Thread):
+    """op 하나를 담당하는 배치 스레드: 첫 요청 이후 max_wait 동안(또는 max_batch건까지) 모아 fn에 한 번에 전달"""
+    def __init__(self, fn, max_batch: int = MODEL_SERVER_MAX_BATCH, max_wait_ms: int = MODEL_SERVER_MAX_WAIT_MS):
+        super().__init__(daemon=True)
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.q: queue.Queue[_Request] = queue.Queue()
+        self.start()
+
+    def submit(self, texts: list[str]) -> list:
+        req = _Request(texts)
+        self.q.put(req)
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+    def run(self) -> None:
+        while True:
+            reqs = [self.q.get()]
+            n = len(reqs[0].texts)
+            deadline = time.monotonic() + self.max_wait
+            while n < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    r = self.q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                reqs.append(r)
+                n += len(r.texts)
+
+            try:
+                out = self.fn([t for r in reqs for t in r.texts])
+                pos = 0
+                for r in reqs:
+                    r.result = out[pos:pos + len(r.texts)]
+                    pos += len(r.texts)
+            except Exception as e:
+                for r in reqs:
+                    r.error = e
+            for r in reqs:
+                r.done.set()
+
+
+def _op_fn(op: str, kwargs: dict):
+    from .summarizer import summarize_batch
+    from .sentiment import infer_sentiment_batch, infer_sentiment_proba_batch
+    from .keywords import extract_keywords_batch
+
+    if op == "summarize":
+        return summarize_batch
+    if op == "sentiment":
+        return infer_sentiment_batch
+    if op == "sentiment_proba":
+        return infer_sentiment_proba_batch
+    if op == "keywords":
+        top_k = int(kwargs.get("top_k", KEYWORDS_TOPK))
+        return lambda texts: extract_keywords_batch(texts, top_k=top_k)
+    raise ValueError(f"알 수 없는 작업: {op}")
+
+
+class ModelServer:
+    def __init__(self, address: str = MODEL_SERVER_ADDRESS, authkey: bytes = MODEL_SERVER_AUTHKEY):
+        self.address = address
+        self.authkey = authkey
+        self._batchers: dict[tuple, _Batcher] = {}
+        self._lock = threading.Lock()
+
+    def _batcher(self, op: str, kwargs: dict) -> _Batcher:
+        key = (op, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key not in self._batchers:
+                self._batchers[key] = _Batcher(_op_fn(op, kwargs))
+            return self._batchers[key]
+
+    def _handle(self, conn) -> None:
+        with conn:
+            while True:
+                try:
+                    op, texts, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    res = ("ok", None if op == "ping" else self._batcher(op, kwargs).submit(list(texts)))
+                except Exception as e:
+                    res = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(res)
+                except OSError:
+                    return
+
+    def serve_forever(self) -> None:
+        _mark_serving()
+        # 이전 실행이 남긴 소켓 파일 제거
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        os.makedirs(os.path.dirname(os.path.abspath(self.address)), exist_ok=True)
+        with Listener(self.address, family="AF_UNIX", authkey=self.authkey) as listener:
+            print(f"🟢 모델 서버 대기: {self.address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # 인증 실패 등은 해당 연결만 버림
+                    print(f"⚠️ 연결 거부: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+
+# ─── 클라이언트 ─────────────────────────────────────────
+
+class ModelClient:
+    """스레드 안전(연결 1개를 락으로 직렬화). 끊기면 1회 재연결 후 재시도."""
+    def __init__(self, address: str = MODEL_SERVER_ADDRESS, authkey: bytes = MODEL_SERVER_AUTHKEY):
+        self.address = address
+        self.authkey = authkey
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _call(self, op: str, texts: list[str], **kwargs):
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+                    self._conn.send((op, list(texts), kwargs))
+                    status, payload = self._conn.recv()
+                    break
+                except (EOFError, OSError):
+                    self._close()
+                    if attempt:
+                        raise
+        if status != "ok":
+            raise RuntimeError(f"모델 서버 오류: {payload}")
+        return payload
+
+    def ping(self) -> None:
+        self._call("ping", [])
+
+    def summarize(self, texts: list[str]) -> list[str]:
+        return self._call("summarize", texts)
+
+    def sentiment(self, texts: list[str]) -> list[str]:
+        return self._call("sentiment", texts)
+
+    def sentiment_proba(self, texts: list[str]) -> list[dict]:
+        return self._call("sentiment_proba", texts)
+
+    def keywords(self, texts: list[str], top_k: int = KEYWORDS_TOPK) -> list[str]:
+        return self._call("keywords", texts, top_k=top_k)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+
+# Lazy 싱글톤 (서버 미설정/서버 프로세스 내부/소켓 없음/응답 없음 → None = 로컬 모델 사용)
+_client = None
+_client_checked = False
+
+def get_model_client() -> ModelClient | None:
+    global _client, _client_checked
+    if _serving or not MODEL_SERVER_ADDRESS:
+        return None
+    if not _client_checked:
+        _client_checked = True
+        if not os.path.exists(MODEL_SERVER_ADDRESS):
+            print(f"⚠️ 모델 서버 소켓 없음({MODEL_SERVER_ADDRESS}) → 로컬 모델 사용")
+            return None
+        # 서버가 비정상 종료(SIGKILL/OOM)하면 소켓 파일만 남음 → 실제 연결/ping으로 확인
+        client = ModelClient()
+        try:
+            client.ping()
+        except (OSError, EOFError) as e:
+            client.close()
+            print(f"⚠️ 모델 서버 응답 없음({MODEL_SERVER_ADDRESS}: {e}) → 로컬 모델 사용")
+            return None
+        _client = client
+    return _client
+
+
+def close_model_client() -> None:
+    """클라이언트 정리 → 다음 get_model_client()가 서버를 다시 확인"""
+    global _client, _client_checked
+    client, _client, _client_checked = _client, None, False
+    if client is not None:
+        client.close()
+
+
+def call_model_server(op: str, texts: list[str], **kwargs):
+    """
+    op(summarize/sentiment/sentiment_proba/keywords)를 서버에 위임한 결과. 서버 미사용/호출 실패면 None → 호출자가 로컬 모델 사용
+    - 연결 끊김(서버 종료): 클라이언트를 초기화해 다음 호출에서 서버를 다시 확인(없으면 로컬 모델로 전환)
+    - 서버 쪽 오류: 이번 호출만 로컬 모델로 처리
+    """
+    client = get_model_client()
+    if client is None:
+        return None
+    try:
+        return getattr(client, op)(texts, **kwargs)
+    except (OSError, EOFError) as e:
+        print(f"⚠️ 모델 서버 연결 끊김({MODEL_SERVER_ADDRESS}: {e}) → 로컬 모델 사용")
+        close_model_client()
+    except RuntimeError as e:
+        print(f"⚠️ {e} → 로컬 모델로 처리")
+    return None
+
+
+def self_check(address: str, timeout: float = 60.0) -> bool:
+    """서버를 스레드로 띄우고 작업별로 1번씩 요청 → 제한 시간 안에 응답하는지 확인(서버가 자기 자신에게 위임하면 교착)"""
+    from .model_export import SAMPLE_TEXTS
+
+    threading.Thread(target=ModelServer(address).serve_forever, daemon=True).start()
+    deadline = time.monotonic() + timeout
+    conn = None
+    while conn is None:
+        try:
+            conn = Client(address, family="AF_UNIX", authkey=MODEL_SERVER_AUTHKEY)
+        except OSError:
+            if time.monotonic() > deadline:
+                print(f"❌ 모델 서버에 연결하지 못함: {address}")
+                return False
+            time.sleep(0.1)
+
+    ok = True
+    with conn:
+        for op in ("summarize", "sentiment", "sentiment_proba", "keywords"):
+            conn.send((op, SAMPLE_TEXTS[:2], {}))
+            if not conn.poll(timeout):
+                print(f"❌ {op}: {timeout:.0f}초 안에 응답 없음")
+                return False
+            status, payload = conn.recv()
+            print(f"  {op}: {status} {payload}")
+            ok &= status == "ok"
+    return ok
+
+
+def main():
+    p = argparse.ArgumentParser(description="StockMind 분석 모델 서버 (Unix 소켓, 동적 배치)")
+    p.add_argument("--address", type=str, default=MODEL_SERVER_ADDRESS or "/tmp/stockmind-models.sock", help="Unix 소켓 경로")
+    p.add_argument("--no-warmup", action="store_true", help="모델 로드 후 더미 추론(워밍업) 생략")
+    p.add_argument("--check", action="store_true", help="서버를 띄워 작업별 응답을 확인한 뒤 종료(실패 시 종료 코드 1)")
+    args = p.parse_args()
+
+    _mark_serving()
+    from .nlp_models import preload_models
+    phases = preload_models(not args.no_warmup)
+    print("모델 로드: " + ", ".join(f"{k}={v:.2f}s" for k, v in phases.items()))
+    if args.check:
+        raise SystemExit(0 if self_check(args.address) else 1)
+    ModelServer(args.address).serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+신디케이션(같은 통신사 기사 재게재) 근접 중복 탐지
+- 정제 본문의 단어 3-shingle로 64비트 SimHash 계산
+- 해밍 거리 NEAR_DUP_MAX_DISTANCE(≤5) 이내면 같은 기사로 간주
+- 10~11비트 밴드 6개로 후보 검색(거리 ≤5면 최소 1개 밴드가 일치)
+- 영속 색인(SQLite): 처음 분석된 사본의 결과 캐시 키/본문 해시를 기록 → 이후 실행/다른 티커의 사본이 결과 재사용
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Iterable, Optional
+
+from .settings import (
+    NEAR_DUP_ENABLED, NEAR_DUP_INDEX_PATH, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_MIN_TOKENS, RESULT_CACHE_MAX_AGE_DAYS,
+)
+
+_BANDS = 6
+_BAND_WIDTHS = (11, 11, 11, 11, 10, 10)
+_WORD = re.compile(r"\w+")
+
+
+def simhash(text: str) -> Optional[int]:
+    """64비트 SimHash (단어 수가 NEAR_DUP_MIN_TOKENS 미만이면 None: 짧은 글은 오탐이 많음)"""
+    import numpy as np
+
+    words = _WORD.findall(text.lower()) if isinstance(text, str) else []
+    if len(words) < max(3, NEAR_DUP_MIN_TOKENS):
+        return None
+    shingles = {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+    hs = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    bits = (hs[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(hs)
+    return int(sum(1 << i for i in np.nonzero(votes > 0)[0].tolist()))
+
+
+def _bands(h: int) -> list[int]:
+    out, shift = [], 0
+    for w in _BAND_WIDTHS:
+        out.append((h >> shift) & ((1 << w) - 1))
+        shift += w
+    return out
+
+
+def _hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _to_sql(h: int) -> int:
+    # SQLite INTEGER는 부호 있는 64비트
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+def _from_sql(v: int) -> int:
+    return v + (1 << 64) if v < 0 else v
+
+
+class BatchGrouper:
+    """한 배치 안에서 먼저 나온 사본을 대표로 묶기(메모리 내 밴드 색인)"""
+    def __init__(self, max_distance: int = NEAR_DUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        self._hashes: list[int] = []
+
+    def find_or_add(self, h: int) -> Optional[int]:
+        """이전에 추가된 근접 중복의 순번(없으면 None). 대표가 아닌 경우 추가하지 않음"""
+        best = None
+        for i, b in enumerate(_bands(h)):
+            for j in self._buckets.get((i, b), ()):
+                d = _hamming(h, self._hashes[j])
+                if d <= self.max_distance and (best is None or d < best[0]):
+                    best = (d, j)
+        if best is not None:
+            return best[1]
+        j = len(self._hashes)
+        self._hashes.append(h)
+        for i, b in enumerate(_bands(h)):
+            self._buckets.setdefault((i, b), []).append(j)
+        return None
+
+
+class NearDupIndex:
+    """SimHash → 처음 분석된 사본(결과 캐시 키, 본문 해시). 여러 프로세스 공유용 SQLite(WAL)"""
+    def __init__(self, path: str = NEAR_DUP_INDEX_PATH, max_distance: int = NEAR_DUP_MAX_DISTANCE,
+                 max_age_days: int = RESULT_CACHE_MAX_AGE_DAYS):
+        self.max_distance = max_distance
+        self.max_age_sec = max_age_days * 86400
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sigs ("
+            " rkey TEXT PRIMARY KEY, thash TEXT NOT NULL, simhash INTEGER NOT NULL,"
+            + "".join(f" b{i} INTEGER NOT NULL," for i in range(_BANDS))
+            + " created_at REAL NOT NULL)"
+        )
+        for i in range(_BANDS):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_sigs_b{i} ON sigs(b{i})")
+        self._conn.commit()
+
+    def find(self, h: int) -> Optional[tuple[str, str]]:
+        """가장 가까운 근접 중복의 (결과 캐시 키, 본문 해시). 없으면 None"""
+        where = " OR ".join(f"b{i} = ?" for i in range(_BANDS))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT rkey, thash, simhash FROM sigs WHERE {where}", _bands(h)).fetchall()
+        best = None
+        for rkey, thash, v in rows:
+            d = _hamming(h, _from_sql(v))
+            if d <= self.max_distance and (best is None or d < best[0]):
+                best = (d, rkey, thash)
+        return (best[1], best[2]) if best else None
+
+    def add_many(self, items: Iterable[tuple[str, str, int]]) -> None:
+        """items: (결과 캐시 키, 본문 해시, simhash)"""
+        now = time.time()
+        data = [(rkey, thash, _to_sql(h), *_bands(h), now) for rkey, thash, h in items]
+        if not data:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO sigs (rkey, thash, simhash, {', '.join(f'b{i}' for i in range(_BANDS))}, created_at)"
+                f" VALUES ({', '.join('?' * (_BANDS + 4))})",
+                data,
+            )
+            if self.max_age_sec:
+                self._conn.execute("DELETE FROM sigs WHERE created_at < ?", (now - self.max_age_sec,))
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+# Lazy 싱글톤 (비활성화 시 None)
+_index = None
+
+def get_near_dup_index() -> NearDupIndex | None:
+    global _index
+    if not NEAR_DUP_ENABLED:
+        return None
+    if _index is None:
+        _index = NearDupIndex()
+    return _index
@@ -1,31 +1,122 @@
-from transformers import pipeline
-from transformers.utils import logging
-from keybert import KeyBERT
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from .settings import SUMMARIZER_MODEL, SENTIMENT_MODEL
+from .settings import SUMMARIZER_MODEL, SENTIMENT_MODEL, KW_EMBEDDING_MODEL, MODEL_BACKEND, MODEL_DIR
 
-logging.set_verbosity_error()
+# transformers / keybert(→ torch)는 import만으로 수 초가 걸리므로 모델이 실제로 필요할 때 import
+
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
 
 # Lazy-loaded 싱글톤 파이프라인/모델
 _summarizer = None
 _sentiment = None
 _kw_model = None
 
+def import_backends() -> None:
+    """무거운 의존성 import + 로그 레벨 설정 (여러 번 호출해도 1회만 비용 발생)"""
+    from transformers.utils import logging
+    import keybert  # noqa: F401
+
+    logging.set_verbosity_error()
+
+def local_model_dir(name: str, backend: str) -> str:
+    """내보낸 모델 경로: MODEL_DIR/{backend}/{org__model}"""
+    return os.path.join(MODEL_DIR, backend, name.replace("/", "__"))
+
+def _ort_model_class(task: str):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+    return ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+
+def build_pipeline(task: str, name: str, backend: str = MODEL_BACKEND):
+    """
+    task 파이프라인을 backend로 생성.
+    - onnx/onnx-int8: 로컬 내보내기 경로가 있으면 사용, 없으면 허브 모델을 즉석 ONNX 변환
+    - optimum 미설치 시 int8(PyTorch 동적 양자화)로 대체
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+
+    if backend.startswith("onnx"):
+        try:
+            cls = _ort_model_class(task)
+        except ImportError:
+            cls = None
+        if cls is None:
+            print(f"⚠️ optimum[onnxruntime] 미설치 → int8 백엔드로 대체 ({name})")
+            return build_pipeline(task, name, "int8")
+        from transformers import AutoTokenizer
+        src = local_model_dir(name, backend)
+        if os.path.isdir(src):
+            model = cls.from_pretrained(src)
+            tok = AutoTokenizer.from_pretrained(src)
+        else:
+            if backend == "onnx-int8":
+                print(f"⚠️ 양자화 ONNX 모델 없음({src}) → 비양자화 ONNX로 즉석 변환")
+            model = cls.from_pretrained(name, export=True)
+            tok = AutoTokenizer.from_pretrained(name)
+        from transformers import pipeline
+
+        import_backends()
+        return pipeline(task, model=model, tokenizer=tok)
+
+    from transformers import pipeline
+
+    import_backends()
+    p = pipeline(task, model=name)
+    if backend == "int8":
+        import torch
+        # Linear 가중치만 int8로 동적 양자화(CPU 전용, 활성값은 실행 시 양자화)
+        p.model = torch.quantization.quantize_dynamic(p.model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+    return p
+
 def get_summarizer():
     global _summarizer
     if _summarizer is None:
-        _summarizer = pipeline("summarization", model=SUMMARIZER_MODEL)
+        _summarizer = build_pipeline("summarization", SUMMARIZER_MODEL)
     return _summarizer
 
 def get_sentiment():
     global _sentiment
     if _sentiment is None:
-        _sentiment = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+        _sentiment = build_pipeline("sentiment-analysis", SENTIMENT_MODEL)
     return _sentiment
 
 def get_kw_model():
     global _kw_model
     if _kw_model is None:
-        _kw_model = KeyBERT()
+        from keybert import KeyBERT
+
+        import_backends()
+        _kw_model = KeyBERT(model=KW_EMBEDDING_MODEL)
     return _kw_model
 
+def preload_models(warmup: bool = True) -> dict[str, float]:
+    """
+    세 모델을 미리 로드(+ 더미 추론으로 워밍업). 반환값: 단계별 소요 시간(import/load/warmup)
+    - import는 메인 스레드에서 먼저 수행(스레드 간 동시 import 경합 방지)
+    - 모델 로드는 스레드 3개로 병렬 수행(가중치 역직렬화 동안 GIL 해제)
+    """
+    timings = {}
+    t0 = time.perf_counter()
+    import_backends()
+    from transformers import pipeline  # noqa: F401
+    timings["import"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        for f in [ex.submit(g) for g in (get_summarizer, get_sentiment, get_kw_model)]:
+            f.result()
+    timings["load"] = time.perf_counter() - t0
+
+    if warmup:
+        t0 = time.perf_counter()
+        from .summarizer import _generate
+
+        text = "Shares rose after the company reported strong quarterly earnings."
+        s = get_summarizer()
+        _generate(s, [s.tokenizer(text, add_special_tokens=False)["input_ids"]])
+        get_sentiment()([text], truncation=True)
+        get_kw_model().extract_keywords(text, top_n=1)
+        timings["warmup"] = time.perf_counter() - t0
+    return timings
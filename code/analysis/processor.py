@@ -1,64 +1,343 @@
 import os
+import json
+import shutil
+import hashlib
 
 import pandas as pd
 
-from .summarizer import summarize_long
-from .sentiment import infer_sentiment
-from .keywords import extract_keywords
-from .io_utils import read_news_csv, output_path, write_results
-from .settings import OUTPUT_COLUMNS, DEDUP_SUBSET
+from .summarizer import summarize_long, summarize_batch
+from .sentiment import infer_sentiment_proba_batch, sentiment_partials, merge_sentiment
+from .keywords import extract_keywords, extract_keywords_batch
+from .cache import get_result_cache, content_key, text_hash, _clean
+from .near_dup import simhash, BatchGrouper, get_near_dup_index
+from .io_utils import (
+    read_news, read_results, output_path, write_results, input_fingerprint, iter_news, iter_results, write_results_stream,
+    input_signature, mark_done,
+)
+from .settings import (
+    OUTPUT_COLUMNS, OUTPUT_PROB_COLUMNS, DEDUP_SUBSET, BATCH_INFERENCE, SENTI_CLASSES, STREAM_CHUNK_ROWS, NEAR_DUP_ENABLED,
+)
 
 
 def _s(x):
     return x.strip() if isinstance(x, str) else ""
 
-def process_one_day(ticker: str, date: str, input_csv_path: str) -> str:
+def _is_error(row: dict) -> bool:
+    return ("[요약 오류" in row.get("summary", "")
+            or row.get("sentiment", "").startswith("error:")
+            or row.get("keywords", "").startswith("error:"))
+
+def _error_mask(df: pd.DataFrame) -> pd.Series:
+    """_is_error의 DataFrame 버전(행별 True/False)"""
+    def col(c):
+        return df[c].fillna("").astype(str) if c in df.columns else pd.Series("", index=df.index)
+    return (col("summary").str.contains("[요약 오류", regex=False)
+            | col("sentiment").str.startswith("error:")
+            | col("keywords").str.startswith("error:"))
+
+def _row(summary: str, senti: dict, kw: str) -> dict:
+    row = {"summary": _s(summary), "sentiment": _s(senti["label"]), "keywords": _s(kw)}
+    row.update({f"sentiment_{c}": senti.get(c) for c in SENTI_CLASSES})
+    return row
+
+def analyze_contents(contents: list[str], batched: bool = BATCH_INFERENCE) -> list[dict]:
+    """
+    본문 리스트 → [{summary, sentiment, keywords, sentiment_positive/negative/neutral, dup_of}, ...] (입력 순서 유지)
+    결과 캐시를 먼저 조회하고, 캐시에 없는 (중복 제거된) 본문만 모델에 전달.
+    근접 중복(신디케이션 사본)은 처음 분석된 사본의 결과를 재사용하고 dup_of에 원본 content_hash 기록.
+    """
+    cache = get_result_cache()
+    keys = [content_key(c) for c in contents]
+    hits = cache.get_many(keys) if cache is not None else {}
+    miss_keys = list(dict.fromkeys(k for k in keys if k not in hits))
+    if miss_keys:
+        first = {}
+        for k, c in zip(keys, contents):
+            first.setdefault(k, c)
+        reused, alias, sigs = _resolve_near_dups(miss_keys, first, cache)
+        canon = [k for k in miss_keys if k not in reused and k not in alias]
+        fresh = dict(zip(canon, _run_models([first[k] for k in canon], batched)))
+        for k in fresh:
+            fresh[k]["dup_of"] = ""
+        for k, ck in alias.items():
+            fresh[k] = {**fresh[ck], "dup_of": text_hash(first[ck])}
+        fresh.update(reused)
+        # 오류 결과는 캐시/색인하지 않음(다음 실행에서 재시도)
+        ok = {k: r for k, r in fresh.items() if not _is_error(r)}
+        if cache is not None:
+            cache.put_many(ok)
+        index = get_near_dup_index() if cache is not None else None
+        if index is not None:
+            index.add_many((k, text_hash(first[k]), sigs[k]) for k in canon if k in ok and k in sigs)
+        hits.update(fresh)
+    return [{"dup_of": "", **hits[k]} for k in keys]
+
+def _resolve_near_dups(keys: list[str], texts: dict, cache) -> tuple[dict, dict, dict]:
     """
-    단일 티커/날짜 입력 CSV를 읽어 summary/sentiment/keywords로 변환 후 저장.
-    반환값: 저장된 결과 파일 경로
+    캐시 미스 본문의 근접 중복 판별.
+    반환값: (영속 색인으로 찾은 원본 결과 {key: row}, 이번 배치 안의 사본 {key: 원본 key}, 원본 후보 SimHash {key: int})
     """
-    df = read_news_csv(input_csv_path)
+    if not NEAR_DUP_ENABLED:
+        return {}, {}, {}
+    index = get_near_dup_index() if cache is not None else None
+    sigs = {k: h for k in keys if (h := simhash(_clean(texts[k]))) is not None}
+    found = {k: m for k, h in sigs.items() if index is not None and (m := index.find(h)) is not None}
+    # 원본 결과가 캐시에서 빠졌으면(만료/모델 변경) 새로 분석
+    cached = cache.get_many([rkey for rkey, _ in found.values()]) if found else {}
+    reused = {k: {**cached[rkey], "dup_of": thash} for k, (rkey, thash) in found.items() if rkey in cached}
 
-    if "content" not in df.columns:
-        df["content"] = ""
-    else:
-        df["content"] = df["content"].apply(_s)
+    alias, grouper, owners = {}, BatchGrouper(), []
+    for k, h in sigs.items():
+        if k in reused:
+            continue
+        j = grouper.find_or_add(h)
+        if j is None:
+            owners.append(k)
+        else:
+            alias[k] = owners[j]
+    if reused or alias:
+        print(f"🔁 근접 중복 {len(reused) + len(alias)}건 → 원본 결과 재사용")
+    return reused, alias, sigs
+
+def _run_models(contents: list[str], batched: bool = BATCH_INFERENCE) -> list[dict]:
+    """batched=True면 모델별로 전체 본문을 모아 배치 추론, False면 기사 단위 순차 처리."""
+    if not batched:
+        rows = []
+        for content in contents:
+            summary = summarize_long(content)
+            base = summary if summary else content
+            rows.append(_row(summary, infer_sentiment_proba_batch([base], batch_size=1)[0], extract_keywords(base)))
+        return rows
+
+    summaries = summarize_batch(contents)
+    bases = [s if s else c for s, c in zip(summaries, contents)]
+    sentis = infer_sentiment_proba_batch(bases)
+    kws = extract_keywords_batch(bases)
+    return [_row(summary, senti, kw) for summary, senti, kw in zip(summaries, sentis, kws)]
 
+def _new_articles(df: pd.DataFrame, done_hashes: set) -> pd.DataFrame:
+    """입력 중 아직 분석하지 않은 기사만 [url, content, content_hash]로 (빈 본문/수집 실패("본문 없음") 제외, 같은 본문 해시가 결과에 있으면 제외)"""
+    df = df.reindex(columns=["url", "content"]).fillna("")
+    df["content"] = df["content"].apply(_s)
+    df = df[(df["content"] != "") & (df["content"] != "본문 없음")].copy()
+    df["content_hash"] = df["content"].map(text_hash)
+    return df[~df["content_hash"].isin(done_hashes)].reset_index(drop=True)
 
-    # 이미 존재하는 결과와 병합을 위해 기존 파일 로드
+def _done_hashes(prev: pd.DataFrame) -> set:
+    """분석 완료 기사의 본문 해시(오류 결과는 제외 → 다음 실행에서 재분석, 기존 오류 행은 _drop_replaced가 교체)"""
+    if "content_hash" not in prev.columns:
+        return set()
+    return set(prev.loc[~_error_mask(prev).to_numpy(), "content_hash"].dropna())
+
+def _mark_done(ticker: str, date: str, sig: str | None, rows: int, errors: int) -> None:
+    """오류 결과가 남아 있으면 완료로 기록하지 않음 → 매니페스트 pending으로 다음 실행에서 재시도"""
+    if errors:
+        print(f"⚠️ {ticker} {date}: 분석 오류 {errors}건 → 완료 기록 생략(다음 실행에서 재분석)")
+        return
+    mark_done(ticker, date, sig, rows)
+
+def _load_day(ticker: str, date: str, input_path: str) -> tuple[pd.DataFrame, pd.DataFrame, str]:
+    """신규 기사(결과에 없는 url/본문), 기존 결과, 결과 경로를 반환"""
+    # 이미 존재하는 결과와 병합 + 처리 완료 기사 판별을 위해 기존 파일 로드
     out_path = output_path(ticker, date)
-    if os.path.exists(out_path):
-        prev = pd.read_csv(out_path)
-    else:
-        prev = pd.DataFrame(columns=OUTPUT_COLUMNS)
-
-
-# 처리
-    rows = []
-    for _, row in df.iterrows():
-        content =  _s(row.get("content"))
-        if not content:
-            # 비어있으면 스킵(필요 시 summary="", sentiment="unknown" 등으로 기록 가능)
-            continue
-        summary = summarize_long(content)
-        base = summary if summary else content
-        senti = infer_sentiment(base)
-        kw = extract_keywords(base)
-        rows.append({
-            "summary": _s(summary),
-            "sentiment": _s(senti),
-            "keywords": _s(kw),
-        })
+    prev = read_results(out_path)
+    news = _new_articles(read_news(input_path), _done_hashes(prev))
+    print(f"🧮 {ticker} {date}: 신규 {len(news)}건 분석 (기존 결과 {len(prev)}건)")
+    return news, prev, out_path
 
+def _with_keys(news: pd.DataFrame, rows: list[dict]) -> list[dict]:
+    return [{**r, "url": u, "content_hash": h} for u, h, r in zip(news["url"], news["content_hash"], rows)]
 
-    cur = pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
+def _drop_replaced(prev: pd.DataFrame, urls: set, hashes: set) -> pd.DataFrame:
+    """기존 결과 중 이번에 다시 분석된 기사(같은 url 또는 같은 본문) 제거. url/해시 없는 이전 형식 결과는 전부 대체"""
+    if "content_hash" not in prev.columns:
+        return prev.iloc[0:0]
+    url = prev["url"] if "url" in prev.columns else pd.Series("", index=prev.index)
+    replaced = (url.isin(urls) & (url != "")) | prev["content_hash"].isin(hashes)
+    return prev[~replaced.to_numpy()]
+
+class DailyStats:
+    """
+    daily_stats를 청크 단위로 누적(결과 행을 보관하지 않음).
+    같은 기사(동일 본문 또는 근접 중복 사본)는 1건으로 집계해 재게재 기사가 감성 통계를 왜곡하지 않도록 함.
+    """
+    def __init__(self):
+        self.stories: set[str] = set()
+        self.keywords: set[str] = set()
+        self.count, self.diff_sum, self.class_counts = 0, 0.0, [0] * len(SENTI_CLASSES)
+
+    def add(self, df: pd.DataFrame) -> None:
+        if "content_hash" in df.columns:
+            hashes = df["content_hash"].fillna("").astype(str)
+            dup_of = df["dup_of"].fillna("").astype(str) if "dup_of" in df.columns else hashes.map(lambda _: "")
+            story = dup_of.where(dup_of != "", hashes)
+            repeat = (story.duplicated() | story.isin(self.stories)) & (story != "")
+            self.stories.update(story[story != ""])
+            df = df[~repeat.to_numpy()]
+        probs = df.reindex(columns=OUTPUT_PROB_COLUMNS).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        labels = df["sentiment"].tolist() if "sentiment" in df.columns else [""] * len(df)
+        n, diff, counts = sentiment_partials(labels, probs)
+        self.count += n
+        self.diff_sum += diff
+        self.class_counts = [a + b for a, b in zip(self.class_counts, counts)]
+        self.keywords.update(
+            k.strip()
+            for v in (df["keywords"] if "keywords" in df.columns else [])
+            if isinstance(v, str) and not v.startswith("error:")
+            for k in v.split(",") if k.strip()
+        )
+
+    def result(self) -> dict:
+        return {"sentiment_stats": merge_sentiment(self.count, self.diff_sum, self.class_counts),
+                "keyword_count": len(self.keywords)}
 
+def daily_stats(df: pd.DataFrame) -> dict:
+    """
+    결과 DataFrame → DBManager.update_analysis_success 인자
+    {"sentiment_stats": {avg, positive_ratio, negative_ratio, neutral_ratio, count}, "keyword_count": 고유 키워드 수}
+    """
+    acc = DailyStats()
+    acc.add(df)
+    return acc.result()
+
+def _save_day(prev: pd.DataFrame, rows: list[dict], out_path: str) -> tuple[str, pd.DataFrame]:
+    cur = pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
+    prev = _drop_replaced(prev, set(cur["url"]), set(cur["content_hash"]))
 
     # 병합 및 중복 제거
     merged = pd.concat([prev, cur], ignore_index=True)
     if DEDUP_SUBSET:
         merged.drop_duplicates(subset=DEDUP_SUBSET, inplace=True)
 
-
     write_results(out_path, merged)
-    return out_path
+    return out_path, merged
+
+def process_one_day(ticker: str, date: str, input_path: str, with_stats: bool = False):
+    """
+    단일 티커/날짜 입력(Parquet/CSV 파티션)을 읽어 summary/sentiment/keywords로 변환 후 저장.
+    결과에 이미 있는 기사(url + 본문 해시)는 건너뛰고 신규/변경 기사만 추론.
+    반환값: 저장된 결과 파일 경로 (with_stats=True면 (경로, daily_stats) — 결과 파일을 다시 읽지 않음)
+    """
+    sig = input_signature(ticker, date)
+    news, prev, out_path = _load_day(ticker, date, input_path)
+    rows = _with_keys(news, analyze_contents(news["content"].tolist()))
+    out_path, merged = _save_day(prev, rows, out_path)
+    _mark_done(ticker, date, sig, len(merged), int(_error_mask(merged).sum()))
+    return (out_path, daily_stats(merged)) if with_stats else out_path
+
+def _load_checkpoint(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_checkpoint(path: str, ckpt: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ckpt, f)
+    os.replace(tmp, path)
+
+def _dedup_stream(frames, stats: DailyStats | None = None):
+    """DEDUP_SUBSET 기준 중복 제거(먼저 나온 행 우선)를 키 해시 집합으로 스트리밍 수행 + 통계 누적"""
+    seen = set()
+    for df in frames:
+        if DEDUP_SUBSET and len(df):
+            keys = df.reindex(columns=DEDUP_SUBSET).astype(str).agg("\0".join, axis=1)
+            hashes = keys.map(lambda k: hashlib.sha1(k.encode("utf-8")).digest())
+            keep = ~(hashes.isin(seen) | hashes.duplicated())
+            seen.update(hashes[keep])
+            df = df[keep.to_numpy()]
+        if stats is not None:
+            stats.add(df)
+        yield df
+
+def process_one_day_streaming(ticker: str, date: str, input_path: str, chunk_rows: int = STREAM_CHUNK_ROWS,
+                              with_stats: bool = False):
+    """
+    process_one_day의 메모리 제한 버전. 최대 메모리는 하루 기사 수가 아니라 chunk_rows에 비례.
+    - 입력을 chunk_rows행씩 읽어 추론 → 청크 결과를 {결과}.stream/chunk-*.parquet로 저장 + checkpoint.json 갱신
+    - 중단 후 재실행 시 입력 파일이 같으면 완료된 청크는 건너뜀(입력이 바뀌면 처음부터)
+    - 마지막에 기존 결과 + 청크 결과를 스트리밍 병합(중복 제거)해 결과 파일 교체
+    """
+    sig = input_signature(ticker, date)
+    out_path = output_path(ticker, date)
+    stage = os.path.splitext(out_path)[0] + ".stream"
+    ckpt_path = os.path.join(stage, "checkpoint.json")
+    fingerprint = {"input": input_fingerprint(input_path), "chunk_rows": chunk_rows}
+
+    done = set()
+    for prev in iter_results(out_path, chunk_rows):
+        done |= _done_hashes(prev)
+
+    ckpt = _load_checkpoint(ckpt_path)
+    if ckpt.get("fingerprint") != fingerprint:
+        shutil.rmtree(stage, ignore_errors=True)
+        ckpt = {"fingerprint": fingerprint, "done": 0}
+    elif ckpt.get("done"):
+        print(f"↩️ {ticker} {date}: 체크포인트에서 재개 (완료 청크 {ckpt['done']}개)")
+    os.makedirs(stage, exist_ok=True)
+
+    chunk_files = []
+    for i, chunk in enumerate(iter_news(input_path, chunk_rows)):
+        chunk_file = os.path.join(stage, f"chunk-{i:06d}.parquet")
+        chunk_files.append(chunk_file)
+        if i < ckpt["done"] and os.path.exists(chunk_file):
+            continue
+        news = _new_articles(chunk, done)
+        rows = _with_keys(news, analyze_contents(news["content"].tolist()))
+        write_results_stream(chunk_file, [pd.DataFrame(rows, columns=OUTPUT_COLUMNS)])
+        ckpt["done"] = max(ckpt["done"], i + 1)
+        _save_checkpoint(ckpt_path, ckpt)
+
+    fresh = pd.concat([pd.read_parquet(f, columns=["url", "content_hash"]) for f in chunk_files], ignore_index=True) \
+        if chunk_files else pd.DataFrame(columns=["url", "content_hash"])
+    fresh_urls, fresh_hashes = set(fresh["url"]), set(fresh["content_hash"])
+    print(f"🧮 {ticker} {date}: 신규 {len(fresh)}건 분석")
+    del fresh
+
+    def frames():
+        for prev in iter_results(out_path, chunk_rows):
+            yield _drop_replaced(prev, fresh_urls, fresh_hashes)
+        for f in chunk_files:
+            yield pd.read_parquet(f)
+
+    errors = 0
+
+    def counted(frames):
+        nonlocal errors
+        for df in frames:
+            errors += int(_error_mask(df).sum())
+            yield df
+
+    stats = DailyStats() if with_stats else None
+    n = write_results_stream(out_path, counted(_dedup_stream(frames(), stats)))
+    shutil.rmtree(stage, ignore_errors=True)
+    _mark_done(ticker, date, sig, n, errors)
+    return (out_path, stats.result()) if with_stats else out_path
+
+def process_days(units: list[tuple[str, str, str]]) -> dict:
+    """
+    여러 (ticker, date, input_path)를 한 번에 배치 추론(실행 단위 배치).
+    반환값: {(ticker, date): 결과 경로 또는 Exception}
+    """
+    results, loaded = {}, []
+    for t, d, ipath in units:
+        try:
+            loaded.append(((t, d), input_signature(t, d)) + _load_day(t, d, ipath))
+        except Exception as e:
+            results[(t, d)] = e
+
+    all_contents = [c for _, _, news, _, _ in loaded for c in news["content"].tolist()]
+    all_rows = analyze_contents(all_contents, batched=True)
+
+    pos = 0
+    for key, sig, news, prev, out_path in loaded:
+        rows = _with_keys(news, all_rows[pos:pos + len(news)])
+        pos += len(news)
+        try:
+            results[key], merged = _save_day(prev, rows, out_path)
+            _mark_done(*key, sig, len(merged), int(_error_mask(merged).sum()))
+        except Exception as e:
+            results[key] = e
+    return results
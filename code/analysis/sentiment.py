@@ -1,12 +1,100 @@
 from .nlp_models import get_sentiment
+from .model_server import call_model_server
+from .settings import SENTI_BATCH_SIZE, SENTI_MAX_TOKENS, SENTI_CLASSES
+
+def _s(x): return x.strip() if isinstance(x, str) else ""
+
+def _empty(label: str) -> dict:
+    return {"label": label, **{c: None for c in SENTI_CLASSES}}
+
+def _from_scores(scores: list[dict]) -> dict:
+    """파이프라인 top_k=None 출력([{label, score}, ...]) → {label, positive, negative, neutral}"""
+    probs = {_s(r.get("label", "")).lower(): float(r.get("score", 0.0)) for r in scores}
+    row = {c: probs.get(c, 0.0) for c in SENTI_CLASSES}
+    row["label"] = max(probs, key=probs.get) if probs else "unknown"
+    return row
+
 def infer_sentiment(text: str) -> str:
-    def _s(x): return x.strip() if isinstance(x, str) else ""
     text = _s(text)
     if not text:
         return "unknown"
+    res = call_model_server("sentiment", [text])
+    if res is not None:
+        return res[0]
     try:
-        res = get_sentiment()(text[:512])[0] # FinBERT: 앞부분만으로도 충분
+        # FinBERT: 토크나이저 기준 앞 SENTI_MAX_TOKENS 토큰만으로도 충분
+        res = get_sentiment()(text, truncation=True, max_length=SENTI_MAX_TOKENS)[0]
         return _s(res.get("label", "unknown")).lower()
     except Exception as e:
         return f"error: {e}"
 
+def infer_sentiment_proba_batch(texts: list[str], batch_size: int = SENTI_BATCH_SIZE) -> list[dict]:
+    """
+    texts와 같은 순서의 {label, positive, negative, neutral} 리스트 (클래스 확률 전체).
+    빈 입력은 label "unknown", 확률 None. 모델 서버 설정 시 서버에 위임(실패 시 로컬 모델).
+    """
+    res = call_model_server("sentiment_proba", texts)
+    if res is not None:
+        return res
+    texts = [_s(t) for t in texts]
+    rows = [_empty("unknown") for _ in texts]
+    idx = [i for i, t in enumerate(texts) if t]
+    if not idx:
+        return rows
+    pipe = get_sentiment()
+    for start in range(0, len(idx), batch_size):
+        part = idx[start:start + batch_size]
+        try:
+            res = pipe([texts[i] for i in part], batch_size=batch_size, truncation=True,
+                       max_length=SENTI_MAX_TOKENS, top_k=None)
+            for i, scores in zip(part, res):
+                rows[i] = _from_scores(scores)
+        except Exception:
+            # 배치 실패 시 건별 처리로 폴백(라벨만)
+            for i in part:
+                rows[i] = _empty(infer_sentiment(texts[i]))
+    return rows
+
+def infer_sentiment_batch(texts: list[str], batch_size: int = SENTI_BATCH_SIZE) -> list[str]:
+    """texts와 같은 순서의 라벨 리스트. 빈 입력은 "unknown". 모델 서버 설정 시 서버에 위임(실패 시 로컬 모델)."""
+    res = call_model_server("sentiment", texts)
+    if res is not None:
+        return res
+    return [r["label"] for r in infer_sentiment_proba_batch(texts, batch_size)]
+
+def sentiment_partials(labels: list[str], probs) -> tuple[int, float, list[int]]:
+    """
+    aggregate_sentiment의 부분합 (청크별로 더해 하루 전체 집계 가능).
+    - probs: (N, 3) [positive, negative, neutral] 확률 배열, 확률이 없는 행(NaN)은 라벨 one-hot으로 대체
+    - 반환값: (유효 기사 수, Σ(positive - negative), 최대 확률 클래스별 건수)
+    - unknown/error 기사는 제외
+    """
+    import numpy as np
+
+    labels = np.asarray([_s(x).lower() for x in labels], dtype=object)
+    probs = np.asarray(probs, dtype=float).reshape(len(labels), len(SENTI_CLASSES))
+    classes = np.asarray(SENTI_CLASSES, dtype=object)
+
+    onehot = (labels[:, None] == classes[None, :]).astype(float)
+    missing = np.isnan(probs).any(axis=1)
+    probs = np.where(missing[:, None], onehot, probs)
+    valid = onehot.any(axis=1) | ~missing
+    probs = probs[valid]
+    if not len(probs):
+        return 0, 0.0, [0] * len(SENTI_CLASSES)
+    counts = np.bincount(probs.argmax(axis=1), minlength=len(SENTI_CLASSES))
+    return int(len(probs)), float(np.sum(probs[:, 0] - probs[:, 1])), counts.tolist()
+
+def merge_sentiment(count: int, diff_sum: float, class_counts: list[int]) -> dict:
+    """부분합 → {count, avg(평균 positive - negative ∈ [-1, 1]), *_ratio(라벨 비율)}"""
+    stats = {"count": int(count), "avg": 0.0, "positive_ratio": 0.0, "negative_ratio": 0.0, "neutral_ratio": 0.0}
+    if not count:
+        return stats
+    stats["avg"] = float(diff_sum / count)
+    for c, n in zip(SENTI_CLASSES, class_counts):
+        stats[f"{c}_ratio"] = float(n / count)
+    return stats
+
+def aggregate_sentiment(labels: list[str], probs) -> dict:
+    """하루치 기사 감성 집계 (analysis_history 기록용)"""
+    return merge_sentiment(*sentiment_partials(labels, probs))
@@ -11,19 +11,86 @@ RESULTS_DIR = os.path.join(BASE_DIR, "results")
 SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"
 SENTIMENT_MODEL = "ProsusAI/finbert"
 
-# 요약 파라미터
-CHUNK_CHARS = 1100
+# 추론 백엔드 (CPU 워커용)
+# - torch: 기본 PyTorch 파이프라인
+# - int8: PyTorch 동적 int8 양자화(nn.Linear)
+# - onnx / onnx-int8: ONNX Runtime(optimum[onnxruntime] 필요). MODEL_DIR/{backend}/{모델명}에 내보낸 모델 사용
+MODEL_BACKEND = os.getenv("ANALYSIS_MODEL_BACKEND", "torch").lower()
+MODEL_DIR = os.getenv("ANALYSIS_MODEL_DIR", os.path.join(BASE_DIR, "models"))
+
+# 요약 파라미터 (청크는 요약 모델 토크나이저 기준으로 문장 단위 패킹)
+SUM_MAX_INPUT_TOKENS = int(os.getenv("ANALYSIS_SUM_MAX_INPUT_TOKENS", "1024")) # 모델 최대 입력과 작은 값 사용
+SUM_MIN_CHUNK_TOKENS = int(os.getenv("ANALYSIS_SUM_MIN_CHUNK_TOKENS", "64")) # 이보다 짧은 꼬리 청크는 생략
 SUM_MAX_LEN = 130
 SUM_MIN_LEN = 30
+# 요약 모드: 청크 요약(map) 후 청크가 여러 개면 요약들을 다시 요약(reduce)해 SUM_MAX_LEN 이내로 제한
+SUM_REDUCE = os.getenv("ANALYSIS_SUM_REDUCE", "true").lower() == "true"
+SUM_REDUCE_MAX_ROUNDS = int(os.getenv("ANALYSIS_SUM_REDUCE_MAX_ROUNDS", "2"))
+
+# 배치 추론 (기사/청크를 모아 파이프라인에 batch_size 단위로 전달)
+BATCH_INFERENCE = os.getenv("ANALYSIS_BATCH_INFERENCE", "true").lower() == "true"
+SUM_BATCH_SIZE = int(os.getenv("ANALYSIS_SUM_BATCH_SIZE", "8"))
+SENTI_BATCH_SIZE = int(os.getenv("ANALYSIS_SENTI_BATCH_SIZE", "32"))
+KW_BATCH_SIZE = int(os.getenv("ANALYSIS_KW_BATCH_SIZE", "32"))
+
+# 감성 분류 (FinBERT): 토크나이저 기준 truncation, 클래스 확률 전체 저장
+SENTI_MAX_TOKENS = 512
+SENTI_CLASSES = ("positive", "negative", "neutral")
 
-# 키워드 추출
+# 키워드 추출 (KeyBERT 임베딩 모델: 더 작은 모델 예) paraphrase-MiniLM-L3-v2)
 KEYWORDS_TOPK = 5
+KW_EMBEDDING_MODEL = os.getenv("ANALYSIS_KW_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+KW_PHRASE_CACHE_SIZE = int(os.getenv("ANALYSIS_KW_PHRASE_CACHE_SIZE", "100000")) # 후보 구 임베딩 캐시(LRU) 최대 항목 수
+
+# 병렬 워커(--workers) 당 torch intra-op 스레드 수 (0 = 코어 수 / 워커 수)
+TORCH_THREADS = int(os.getenv("ANALYSIS_TORCH_THREADS", "0"))
+
+# 처리할 작업이 있을 때 모델 3개를 병렬 선로드 후 더미 추론으로 워밍업
+MODEL_WARMUP = os.getenv("ANALYSIS_MODEL_WARMUP", "true").lower() == "true"
+
+# 공유 모델 서버 (python -m analysis.model_server). 소켓 경로가 설정되면 모델 호출을 서버에 위임(클라이언트 모드)
+MODEL_SERVER_ADDRESS = os.getenv("ANALYSIS_MODEL_SERVER", "")
+MODEL_SERVER_AUTHKEY = os.getenv("ANALYSIS_MODEL_SERVER_AUTHKEY", "stockmind").encode("utf-8")
+MODEL_SERVER_MAX_BATCH = int(os.getenv("ANALYSIS_MODEL_SERVER_MAX_BATCH", "64")) # 동적 배치 최대 건수
+MODEL_SERVER_MAX_WAIT_MS = int(os.getenv("ANALYSIS_MODEL_SERVER_MAX_WAIT_MS", "20")) # 첫 요청 후 배치 수집 대기
+
+# 결과 캐시 (정제 본문 + 모델/파라미터 해시 → 분석 결과)
+CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", os.path.join(BASE_DIR, "cache"))
+RESULT_CACHE_ENABLED = os.getenv("ANALYSIS_RESULT_CACHE", "true").lower() == "true"
+RESULT_CACHE_PATH = os.path.join(CACHE_DIR, "analysis_results.sqlite")
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_RESULT_CACHE_MAX_ENTRIES", "200000"))
+RESULT_CACHE_MAX_AGE_DAYS = int(os.getenv("ANALYSIS_RESULT_CACHE_MAX_AGE_DAYS", "90"))
+
+# 근접 중복(신디케이션 기사) 탐지: 정제 본문 SimHash 해밍 거리 이내면 처음 분석된 사본의 결과 재사용
+NEAR_DUP_ENABLED = os.getenv("ANALYSIS_NEAR_DUP", "true").lower() == "true"
+NEAR_DUP_INDEX_PATH = os.path.join(CACHE_DIR, "near_dup.sqlite")
+NEAR_DUP_MAX_DISTANCE = min(5, int(os.getenv("ANALYSIS_NEAR_DUP_MAX_DISTANCE", "4"))) # 64비트 중 다른 비트 수(밴드 6개 → 최대 5)
+NEAR_DUP_MIN_TOKENS = int(os.getenv("ANALYSIS_NEAR_DUP_MIN_TOKENS", "50")) # 이보다 짧은 본문은 탐지 제외
+
+# pending 판단: data/raw/{ticker}/_manifest.sqlite(크롤러/분석기가 함께 갱신) 사용. false면 파일 mtime 비교
+MANIFEST_ENABLED = os.getenv("ANALYSIS_MANIFEST", "true").lower() == "true"
+
+# 스트리밍 처리(--stream): 입력을 청크 단위로 읽고 청크별 결과를 체크포인트와 함께 저장(중단 시 이어서 처리)
+STREAM_CHUNK_ROWS = int(os.getenv("ANALYSIS_STREAM_CHUNK_ROWS", "256"))
+
+# 파이프라인 소비자(--follow): data/raw/_work_queue.sqlite에서 크롤러가 넣은 (ticker, date)를 받아 바로 분석
+QUEUE_POLL_SEC = float(os.getenv("ANALYSIS_QUEUE_POLL_SEC", "2"))
+QUEUE_LEASE_SEC = float(os.getenv("ANALYSIS_QUEUE_LEASE_SEC", "1800")) # 처리 중 작업 lease(만료 시 다시 배달)
+QUEUE_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_QUEUE_MAX_ATTEMPTS", "3"))
+QUEUE_IDLE_TIMEOUT_SEC = float(os.getenv("ANALYSIS_QUEUE_IDLE_TIMEOUT_SEC", "1800")) # 생산자 활동이 없으면 종료
 
 # 병합 정책
-DEDUP_SUBSET = ["summary"] # summary 기준 중복 제거
+DEDUP_SUBSET = ["url", "content_hash"] # 기사(url + 본문 해시) 기준 중복 제거
+
+# 입력 파일: data/raw/{ticker}/{date}/news.parquet (없으면 news.csv) + parts/part-*.(parquet|csv)
+INPUT_FILENAMES = ["news.parquet", "news.csv"] # 앞쪽 우선
+INPUT_PARTS_DIRNAME = "parts"
+INPUT_COLUMNS = ["url", "title", "content"] # 필요한 컬럼만 읽음(Parquet 컬럼 projection)
 
-# 입출력 파일명
-INPUT_FILENAME = "news.csv" # data/raw/{ticker}/{date}/news.csv
+# 결과 파일 형식: results/{ticker}/{date}.parquet (csv 선택 가능, 기존 csv 결과도 읽음)
+OUTPUT_FORMAT = os.getenv("ANALYSIS_OUTPUT_FORMAT", "parquet")
 
 # 결과 컬럼 고정
-OUTPUT_COLUMNS = ["summary", "sentiment", "keywords"]
+OUTPUT_PROB_COLUMNS = [f"sentiment_{c}" for c in SENTI_CLASSES] # 감성 클래스 확률(float)
+OUTPUT_KEY_COLUMNS = ["url", "content_hash", "dup_of"] # 처리한 입력 기사 식별(신규 기사만 분석) + 근접 중복 원본의 content_hash
+OUTPUT_COLUMNS = OUTPUT_KEY_COLUMNS + ["summary", "sentiment", "keywords"] + OUTPUT_PROB_COLUMNS
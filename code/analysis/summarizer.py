@@ -1,8 +1,10 @@
 import re
-import textwrap
 
 from .nlp_models import get_summarizer
-from .settings import CHUNK_CHARS, SUM_MAX_LEN, SUM_MIN_LEN
+from .model_server import call_model_server
+from .settings import (
+    SUM_MAX_INPUT_TOKENS, SUM_MIN_CHUNK_TOKENS, SUM_MAX_LEN, SUM_MIN_LEN, SUM_BATCH_SIZE, SUM_REDUCE, SUM_REDUCE_MAX_ROUNDS,
+)
 
 def _clean_text(x: str) -> str:
     if not isinstance(x, str):
@@ -11,18 +13,125 @@ def _clean_text(x: str) -> str:
     x = re.sub(r"\s+", " ", x)
     return x
 
+def _input_budget(tok) -> int:
+    """청크당 본문 토큰 예산 = min(설정값, 모델 최대 입력) - 특수 토큰 수"""
+    limit = min(SUM_MAX_INPUT_TOKENS, getattr(tok, "model_max_length", SUM_MAX_INPUT_TOKENS) or SUM_MAX_INPUT_TOKENS)
+    return max(16, limit - tok.num_special_tokens_to_add())
+
+def _chunk_token_ids(text: str, tok, min_tokens: int = SUM_MIN_CHUNK_TOKENS) -> list[list[int]]:
+    """
+    본문을 한 번만 토크나이즈한 뒤, 문장 경계(., !, ?)에서 끊으며 토큰 예산까지 채워 청크(토큰 id 리스트)로 분할.
+    - 예산 안에 문장 경계가 없으면 예산 위치에서 자름
+    - 첫 청크 이후 min_tokens 미만의 자투리 청크는 생략(생성 호출 1회 절약)
+    """
+    fast = getattr(tok, "is_fast", False)
+    enc = tok(text, add_special_tokens=False, return_offsets_mapping=fast)
+    ids = enc["input_ids"]
+    if not ids:
+        return []
+    offsets = enc["offset_mapping"] if fast else None
+    is_end = [e > 0 and text[e - 1] in ".!?" for _, e in offsets] if offsets else []
+
+    budget = _input_budget(tok)
+    chunks, start, n = [], 0, len(ids)
+    while start < n:
+        end = min(start + budget, n)
+        if end < n and is_end:
+            # 예산 후반부의 마지막 문장 경계에서 끊기
+            for j in range(end - 1, start + budget // 2 - 1, -1):
+                if is_end[j]:
+                    end = j + 1
+                    break
+        chunks.append(ids[start:end])
+        start = end
+    return [c for i, c in enumerate(chunks) if i == 0 or len(c) >= min_tokens]
+
+def _generate(s, chunks: list[list[int]]) -> list[str]:
+    """이미 토크나이즈된 청크들을 그대로 generate에 전달(재토크나이즈 없음)"""
+    import torch
+
+    tok, model = s.tokenizer, s.model
+    batch = tok.pad([{"input_ids": tok.build_inputs_with_special_tokens(c)} for c in chunks], return_tensors="pt")
+    batch = {k: v.to(model.device) for k, v in batch.items()}
+    # 파이프라인이 보유한 summarization 생성 설정(num_beams 등)이 있으면 그대로 사용
+    gen_cfg = getattr(s, "generation_config", None)
+    if gen_cfg is not None:
+        batch["generation_config"] = gen_cfg
+    with torch.no_grad():
+        out = model.generate(**batch, max_length=SUM_MAX_LEN, min_length=SUM_MIN_LEN, do_sample=False)
+    return [x.strip() for x in tok.batch_decode(out, skip_special_tokens=True)]
+
+def _summarize_chunk(s, chunk: list[int]) -> str:
+    try:
+        return _generate(s, [chunk])[0]
+    except Exception as e:
+        return f"[요약 오류: {e}]"
+
 def summarize_long(text: str) -> str:
-    text = _clean_text(text)
-    if not text:
-        return ""
-    chunks = textwrap.wrap(text, CHUNK_CHARS)
-    s = get_summarizer()
-    outputs = []
-    for ch in chunks:
+    return summarize_batch([text])[0]
+
+def _map_chunks(s, docs: dict[int, list[list[int]]], batch_size: int) -> dict[int, list[str]]:
+    """모든 문서의 청크를 한 번에 모아 batch_size 단위로 요약 → 문서별 청크 요약 리스트"""
+    owners, chunks = [], []
+    for i, doc_chunks in docs.items():
+        for ch in doc_chunks:
+            owners.append(i)
+            chunks.append(ch)
+
+    # 길이순 정렬 → 배치 내 패딩 최소화 (결과는 원래 위치로 되돌림)
+    order = sorted(range(len(chunks)), key=lambda k: len(chunks[k]))
+    outs = [""] * len(chunks)
+    for start in range(0, len(order), batch_size):
+        part = order[start:start + batch_size]
         try:
-            out = s(ch, max_length=SUM_MAX_LEN, min_length=SUM_MIN_LEN, do_sample=False)[0]["summary_text"]
-        except Exception as e:
-            out = f"[요약 오류: {e}]"
-        outputs.append(out)
-    return " ".join(outputs).strip()
+            for k, out in zip(part, _generate(s, [chunks[k] for k in part])):
+                outs[k] = out
+        except Exception:
+            # 배치 실패 시 청크 단위로 재시도(오류는 청크별로 기록)
+            for k in part:
+                outs[k] = _summarize_chunk(s, chunks[k])
+
+    per_doc = {i: [] for i in docs}
+    for owner, out in zip(owners, outs):
+        per_doc[owner].append(out)
+    return per_doc
+
+def summarize_batch(texts: list[str], batch_size: int = SUM_BATCH_SIZE, reduce: bool = SUM_REDUCE) -> list[str]:
+    """
+    여러 기사를 계층적(map-reduce)으로 요약. 반환값: texts와 같은 길이/순서의 요약 리스트
+    - 빠른 경로: 토큰 수가 이미 SUM_MAX_LEN 이하인 짧은 기사는 생성 없이 정제 본문 그대로 사용
+    - map: 모든 기사의 청크를 한 번에 배치 요약
+    - reduce: 청크가 여러 개인 기사는 청크 요약들을 이어 붙여 다시 요약(최대 SUM_REDUCE_MAX_ROUNDS회)
+    - 모델 서버 설정 시 서버에 위임(실패 시 로컬 모델)
+    """
+    res = call_model_server("summarize", texts)
+    if res is not None:
+        return res
+
+    s = get_summarizer()
+    results = [""] * len(texts)
+    docs: dict[int, list[list[int]]] = {}
+    for i, t in enumerate(texts):
+        t = _clean_text(t)
+        if not t:
+            continue
+        chunks = _chunk_token_ids(t, s.tokenizer)
+        if len(chunks) == 1 and len(chunks[0]) <= SUM_MAX_LEN:
+            results[i] = t
+            continue
+        docs[i] = chunks
 
+    rounds = 0
+    while docs:
+        nxt = {}
+        for i, outs in _map_chunks(s, docs, batch_size).items():
+            joined = " ".join(outs).strip()
+            failed = any(o.startswith("[요약 오류") for o in outs)
+            if reduce and len(outs) > 1 and rounds < SUM_REDUCE_MAX_ROUNDS and not failed:
+                # 요약문은 자투리도 버리지 않음(min_tokens=0)
+                nxt[i] = _chunk_token_ids(joined, s.tokenizer, min_tokens=0)
+            else:
+                results[i] = joined
+        docs = nxt
+        rounds += 1
+    return results
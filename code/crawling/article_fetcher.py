@@ -1,160 +1,199 @@
-import os
-import time, random, datetime as dt
+"""
+기사 본문 수집 (URL 목록 → 제목/본문/날짜 dict 리스트, urls 순서 유지)
+- 엔진: threads(requests 세션 + 스레드 풀) / async(aiohttp 또는 httpx, 실행 전체 연결 풀 공유. 둘 다 미설치 시 threads)
+- 호스트별 초당 요청 수·동시 요청 수 제한, 본문이 빈약하면 선택적으로 Selenium 폴백(드라이버 풀)
+"""
+
+import time, datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, Optional, Tuple
 
-import pandas as pd
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-
-from .http_utils import make_session, http_get, UARotator
-from .settings import UA_LIST, SELENIUM, ACCEPT_LANGUAGE
-
-def _get_driver_for_fallback(user_agent: str | None = None) -> webdriver.Remote:
-    opts = Options()
-    opts.add_argument("--headless=new")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    if user_agent:
-        opts.add_argument(f"--user-agent={user_agent}")
-
-    use_remote = os.getenv("USE_REMOTE_WEBDRIVER", "false").lower() == "true"
-    if use_remote:
-        remote_url = os.getenv("SELENIUM_REMOTE_URL", "http://selenium:4444")
-        return webdriver.Remote(command_executor=remote_url, options=opts)
-    else:
-        return webdriver.Chrome(options=opts)
-
-def _extract_title_safely(soup: BeautifulSoup) -> str:
-    # 1) 메타 우선
-    og = soup.find("meta", attrs={"property": "og:title"})
-    if og and og.get("content"):
-        return og["content"].strip()
-
-    meta_title = soup.find("meta", attrs={"name": "title"})
-    if meta_title and meta_title.get("content"):
-        return meta_title["content"].strip()
-
-    # 2) 구조화된 h1 후보들
-    for sel in (
-        "h1",
-        "header h1",
-        "article h1",
-        "div.caas-title-wrapper h1",
-        "div.caas-content-header h1",
-    ):
-        h = soup.select_one(sel)
-        if h and h.get_text(strip=True):
-            return h.get_text(strip=True)
-
-    # 3) 최후: <title>
-    if soup.title and soup.title.get_text():
-        return soup.title.get_text(strip=True)
-    return ""
-
-
-def _extract_content_safely(soup: BeautifulSoup) -> str:
-    # 1) 주력 본문 선택자(다중 OR)
-    primary = soup.select("article p, main p, div[data-test-locator='mega'] p")
-    if primary:
-        return " ".join(p.get_text(strip=True) for p in primary if p.get_text(strip=True))
-
-    # 2) fallback 후보들(구 Yahoo/caas/일반 기사 템플릿)
-    fallbacks = [
-        "div.caas-body p",
-        "div#article-body p",
-        "div[itemprop='articleBody'] p",
-        "div[itemprop='articleBody'] div p",  # 중첩 구조
-        "section[data-test-locator='mega'] p",
-    ]
-    for sel in fallbacks:
-        nodes = soup.select(sel)
-        if nodes:
-            return " ".join(p.get_text(strip=True) for p in nodes if p.get_text(strip=True))
-
-    # 3) 최후의 수단: meta description
-    meta = soup.find("meta", {"name": "description"}) or soup.find("meta", {"property": "og:description"})
-    if meta and meta.get("content"):
-        return meta["content"].strip()
-
-    # 4) 정말 없으면 빈 문자열(상위에서 "본문 없음" 처리)
-    return ""
-
-
-def _parse_datetime_kst(soup: BeautifulSoup) -> str:
-    # 1) 가장 신뢰할 수 있는 time[datetime]
-    t = soup.select_one("time[datetime]")
-    if t and t.has_attr("datetime"):
-        try:
-            utc_iso = t["datetime"].replace("Z", "+00:00")
-            kst = pd.to_datetime(utc_iso).tz_convert("Asia/Seoul").to_pydatetime()
-            return kst.strftime("%Y-%m-%d")
-        except Exception:
-            pass
-
-    # 2) 기사 메타에 자주 쓰이는 퍼블리시드 타임
-    for meta_name in (
-        {"property": "article:published_time"},
-        {"name": "article:published_time"},
-        {"name": "publish-date"},
-        {"itemprop": "datePublished"},
-    ):
-        meta = soup.find("meta", attrs=meta_name)
-        if meta and meta.get("content"):
+from .html_cache import get_html_cache
+from .html_extract import extract_article
+from .http_utils import make_session, http_get, UARotator, HostRateLimiter
+from . import async_http
+from .async_http import AsyncHostRateLimiter, get_async_engine
+from .driver_pool import get_driver_pool
+from .parse_pool import ParsePool, get_parse_pool
+from .settings import (
+    UA_LIST, FETCH_CONCURRENCY, PER_HOST_CONCURRENCY, PER_HOST_RPS, PER_HOST_BURST, FETCH_ENGINE,
+    PARSE_WORKERS,
+)
+
+def _needs_fallback(u: str, content: str, min_len_for_ok: int, enable_selenium_fallback: bool) -> bool:
+    return enable_selenium_fallback and len(content) < min_len_for_ok and "finance.yahoo.com" in u
+
+def _build_article(u: str, status: int, art: dict, rotator: UARotator, min_len_for_ok: int,
+                   enable_selenium_fallback: bool) -> dict:
+    """추출 결과 → 기사 dict. 본문이 빈약하면 선택적으로 Selenium 폴백"""
+    content, date_str, title = art["content"], art["date"], art["title"]
+
+    # 요청 결과가 빈약하면(짧거나 paywall 등) 선택적으로 Selenium 폴백
+    if _needs_fallback(u, content, min_len_for_ok, enable_selenium_fallback):
+        # 드라이버 풀에서 세션을 빌려 사용(매 기사마다 Chrome 기동/종료하지 않음)
+        with get_driver_pool().lease(user_agent=rotator.pick()) as driver:
+            driver.get(u)
+            time.sleep(1.5)
+            page_source = driver.page_source
+        art2 = extract_article(page_source)
+        if len(art2["content"]) > len(content):
+            content = art2["content"]
+            date_str = art2["date"] or date_str
+            if art2["title"]:
+                title = art2["title"]
+
+    return {
+        "url": u,
+        "title": title or "",
+        "content": content or "본문 없음",
+        "date": date_str,
+        "status_code": status,
+    }
+
+def _parse_article(u: str, resp, rotator: UARotator, min_len_for_ok: int, enable_selenium_fallback: bool) -> dict:
+    """응답(requests/aiohttp/httpx) → 기사 dict (호출 스레드에서 파싱)"""
+    return _build_article(u, resp.status_code, extract_article(resp.text), rotator, min_len_for_ok, enable_selenium_fallback)
+
+def _error_article(u: str, e: Exception) -> dict:
+    return {"url": u, "error": str(e), "date": dt.datetime.now().strftime("%Y-%m-%d")}
+
+def _fetch_one(u: str, session, rotator: UARotator, limiter: HostRateLimiter, min_len_for_ok: int, enable_selenium_fallback: bool,
+               use_cache: bool = True) -> dict:
+    try:
+        with limiter.limit(u):
+            resp = http_get(u, session=session, ua_rotator=rotator, use_cache=use_cache)
+        return _parse_article(u, resp, rotator, min_len_for_ok, enable_selenium_fallback)
+    except Exception as e:
+        return _error_article(u, e)
+
+def _fetch_async(urls: list[str], rotator: UARotator, rate_per_host: float, max_per_host: int, concurrency: int,
+                 min_len_for_ok: int, enable_selenium_fallback: bool, pool: Optional[ParsePool],
+                 use_cache: bool = True) -> list[dict]:
+    # 실행 전체가 공유하는 연결 풀(이벤트 루프 스레드)에서 다운로드, 파싱은 엔진의 스레드 풀(또는 파싱 프로세스 풀)에서
+    limiter = AsyncHostRateLimiter(rate_per_host, burst=PER_HOST_BURST, max_concurrent_per_host=max_per_host)
+
+    def on_response(u: str, resp) -> dict:
+        if pool is None:
+            return _parse_article(u, resp, rotator, min_len_for_ok, enable_selenium_fallback)
+        art = pool.submit(resp.content, resp.encoding).result()
+        return _build_article(u, resp.status_code, art, rotator, min_len_for_ok, enable_selenium_fallback)
+
+    return get_async_engine().fetch_many(
+        urls, rotator, limiter, concurrency=concurrency,
+        on_response=on_response, on_error=_error_article,
+        max_pending=pool.max_pending if pool is not None else None, use_cache=use_cache,
+    )
+
+def _fetch_pooled(urls: list[str], session, rotator: UARotator, limiter: HostRateLimiter, concurrency: int,
+                  min_len_for_ok: int, enable_selenium_fallback: bool, pool: ParsePool, use_cache: bool = True) -> list[dict]:
+    """
+    스레드 엔진 + 파싱 프로세스 풀: 수집 스레드는 응답 원본을 풀에 넘기고 바로 다음 URL로.
+    파싱 대기 응답이 pool.max_pending개면 submit이 블록되어 수집도 대기(메모리 상한)
+    """
+    def download(u: str):
+        with limiter.limit(u):
+            resp = http_get(u, session=session, ua_rotator=rotator, use_cache=use_cache)
+        return resp.status_code, pool.submit(resp.content, resp.encoding)
+
+    out: list = [None] * len(urls)
+    fallback = []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls)))) as ex:
+        staged = [ex.submit(download, u) for u in urls]
+        for i, (u, fut) in enumerate(zip(urls, staged)):
             try:
-                utc_iso = meta["content"].replace("Z", "+00:00")
-                kst = pd.to_datetime(utc_iso).tz_convert("Asia/Seoul").to_pydatetime()
-                return kst.strftime("%Y-%m-%d")
-            except Exception:
+                status, parsed = fut.result()
+                art = parsed.result()
+            except Exception as e:
+                out[i] = _error_article(u, e)
                 continue
+            if _needs_fallback(u, art["content"], min_len_for_ok, enable_selenium_fallback):
+                fallback.append((i, u, status, art))
+            else:
+                out[i] = _build_article(u, status, art, rotator, min_len_for_ok, False)
+
+        # Selenium 폴백은 드라이버 풀을 쓰므로 부모 프로세스의 수집 스레드에서 (다운로드가 끝난 뒤)
+        def finish(item):
+            i, u, status, art = item
+            try:
+                return i, _build_article(u, status, art, rotator, min_len_for_ok, enable_selenium_fallback)
+            except Exception as e:
+                return i, _error_article(u, e)
+
+        for i, a in ex.map(finish, fallback):
+            out[i] = a
+    return out
+
+def fetch_articles_http(
+    urls: Iterable[str],
+    ua_mode: str = "round_robin",
+    delay_range: Optional[Tuple[float, float]] = None,
+    min_len_for_ok: int = 120,
+    enable_selenium_fallback: bool = True,
+    concurrency: int = FETCH_CONCURRENCY,
+    rate_per_host: Optional[float] = None,
+    max_per_host: int = PER_HOST_CONCURRENCY,
+    engine: str = FETCH_ENGINE,
+    parse_workers: int = PARSE_WORKERS,
+    use_cache: bool = True,
+) -> list[dict]:
+    """
+    URL 목록을 스레드 풀로 동시 수집. 반환 순서/형태는 urls 순서의 dict 리스트로 동일.
+    예의(politeness)는 요청 사이 sleep 대신 호스트별 초당 요청 수(rate_per_host, 토큰 버킷)와
+    호스트별 동시 요청 수(max_per_host)로 제한.
+    - rate_per_host 미지정 시 delay_range(구 방식)의 평균 간격으로 환산, 둘 다 없으면 PER_HOST_RPS
+    - concurrency=1이면 순차 수집
+    - engine="async"면 비동기 엔진(aiohttp 또는 httpx, 실행 전체 연결 풀 공유) 사용, 둘 다 미설치 시 threads
+    - parse_workers>0이면 HTML 파싱을 프로세스 풀(실행 전체 공유)에서 수행, 수집 I/O는 파싱을 기다리지 않고 진행
+    - use_cache면 HTML 캐시로 조건부 요청(304면 캐시 본문 사용, YF_HTML_CACHE=false면 무시)
+    """
+    urls = list(urls)
+    if rate_per_host is None:
+        rate_per_host = 2.0 / sum(delay_range) if delay_range else PER_HOST_RPS
+    rotator = UARotator(UA_LIST, ua_mode)
+    # 기사가 1건이면 프로세스 왕복 없이 바로 파싱
+    pool = get_parse_pool(parse_workers) if len(urls) > 1 else None
 
-    # 3) 실패 시 오늘 날짜
-    return dt.datetime.now().strftime("%Y-%m-%d")
+    if engine == "async":
+        if async_http.available():
+            return _fetch_async(urls, rotator, rate_per_host, max_per_host, concurrency, min_len_for_ok,
+                                enable_selenium_fallback, pool, use_cache)
+        print("⚠️ aiohttp/httpx 미설치 → threads 엔진으로 수집")
 
-def fetch_articles_http(urls: Iterable[str], ua_mode: str = "round_robin", delay_range=(0.8, 1.6), min_len_for_ok: int = 120, enable_selenium_fallback: bool = True) -> list[dict]:
-    rotator = UARotator(UA_LIST, ua_mode)
     session = make_session()
-    results = []
+    limiter = HostRateLimiter(rate_per_host, burst=PER_HOST_BURST, max_concurrent_per_host=max_per_host)
+
+    def work(u: str) -> dict:
+        return _fetch_one(u, session, rotator, limiter, min_len_for_ok, enable_selenium_fallback, use_cache)
+
+    if pool is not None:
+        return _fetch_pooled(urls, session, rotator, limiter, concurrency, min_len_for_ok, enable_selenium_fallback, pool,
+                             use_cache)
+
+    if concurrency <= 1 or len(urls) <= 1:
+        return [work(u) for u in urls]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(urls))) as ex:
+        return list(ex.map(work, urls))
+
+def reextract_articles(urls: Iterable[str], backend: Optional[str] = None) -> list[dict]:
+    """
+    HTML 캐시에 있는 기사를 다시 추출(네트워크 요청 없음, 선택자/파서 변경 후 재처리용).
+    fetch_articles_http와 같은 형태의 dict 리스트(캐시에 없는 URL은 제외)
+    """
+    cache = get_html_cache()
+    if cache is None:
+        return []
+    out = []
     for u in urls:
-        try:
-            resp = http_get(u, session=session, ua_rotator=rotator)
-            html = resp.text
-            soup = BeautifulSoup(html, "html.parser")
-            content = _extract_content_safely(soup)
-            date_str = _parse_datetime_kst(soup)
-            title = _extract_title_safely(soup)
-            status = resp.status_code
-
-            # 요청 결과가 빈약하면(짧거나 paywall 등) 선택적으로 Selenium 폴백
-            if enable_selenium_fallback and len(content) < min_len_for_ok and "finance.yahoo.com" in u:
-                driver = _get_driver_for_fallback(user_agent=rotator.pick())
-                try:
-                    driver.set_page_load_timeout(SELENIUM.get("page_load_timeout", 180))
-                    driver.get(u)
-                    time.sleep(1.5)
-                    soup2 = BeautifulSoup(driver.page_source, "html.parser")
-                    content2 = _extract_content_safely(soup2)
-                    if len(content2) > len(content):
-                        content = content2
-                        date_str = _parse_datetime_kst(soup2) or date_str
-                        title2 = _extract_title_safely(soup2)
-                        if title2:
-                            title = title2
-                finally:
-                    try:
-                        driver.quit()
-                    except Exception:
-                        pass
-
-            results.append({
-                "url": u,
-                "title": title or "",
-                "content": content or "본문 없음",
-                "date": date_str,
-                "status_code": status,
-            })
-        except Exception as e:
-            results.append({"url": u, "error": str(e), "date": dt.datetime.now().strftime("%Y-%m-%d")})
-        time.sleep(random.uniform(*delay_range))
-    return results
+        page = cache.get(u)
+        if page is None:
+            continue
+        art = extract_article(page.body.decode(page.encoding or "utf-8", errors="replace"), backend=backend)
+        out.append({
+            "url": u,
+            "title": art["title"] or "",
+            "content": art["content"] or "본문 없음",
+            "date": art["date"],
+            "status_code": 200,
+        })
+    return out
@@ -0,0 +1,279 @@
+"""
+비동기 본문 수집 엔진 (선택 의존성: aiohttp 또는 httpx[http2])
+- 실행 전체(모든 티커)가 연결 풀 1개 공유: 백그라운드 이벤트 루프 스레드 + Lazy 싱글톤 (close_async_engine()으로 종료)
+- keep-alive 연결 재사용. 백엔드: aiohttp(HTTP/1.1, 기본) / httpx(YF_HTTP2=true면 HTTP/2 다중화)
+  (httpx 연결 풀은 HTTP/1.1 동시 연결이 많을 때 느려서 HTTP/1.1은 aiohttp 우선)
+- 재시도: make_session의 urllib3 Retry와 같은 규칙(status_forcelist, 지수 backoff, Retry-After, 마지막 응답 반환)
+- HTML 캐시: http_get과 같은 조건부 요청(ETag/Last-Modified) + 304 처리
+- 응답 처리(HTML 파싱 등)는 스레드 풀에서 실행 → 이벤트 루프는 계속 다운로드 (max_pending으로 처리 대기 응답 수 제한)
+"""
+
+import atexit
+import asyncio
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .html_cache import get_html_cache
+from .http_utils import UARotator, DEFAULT_HEADERS, RETRY_STATUS
+from .settings import (
+    REQUEST_TIMEOUT, TOTAL_RETRY, BACKOFF_FACTOR, ASYNC_BACKEND, ASYNC_MAX_CONNECTIONS, ASYNC_HTTP2, PER_HOST_BURST,
+)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# urllib3 Retry 기본값과 동일
+_BACKOFF_MAX = 120.0
+_RETRY_AFTER_STATUS = (413, 429, 503)
+
+
+def available() -> bool:
+    return aiohttp is not None or httpx is not None
+
+
+def _pick_backend(backend: str, http2: bool) -> str:
+    if backend == "auto":
+        if http2 and httpx is not None and importlib.util.find_spec("h2") is not None:
+            return "httpx"
+        return "aiohttp" if aiohttp is not None else "httpx"
+    return backend
+
+
+def _backoff(errors: int, factor: float) -> float:
+    # urllib3: 첫 재시도는 즉시, 이후 factor * 2^(n-1)
+    if errors <= 1:
+        return 0.0
+    return min(_BACKOFF_MAX, factor * (2 ** (errors - 1)))
+
+
+def _retry_after(resp) -> Optional[float]:
+    if resp.status_code not in _RETRY_AFTER_STATUS:
+        return None
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+
+class FetchedResponse:
+    """백엔드와 무관한 응답(requests.Response처럼 status_code/headers/content/text 제공)"""
+    __slots__ = ("url", "status_code", "headers", "content", "encoding")
+
+    def __init__(self, url: str, status_code: int, headers: dict, content: bytes, encoding: Optional[str]):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class AsyncHostRateLimiter:
+    """HostRateLimiter의 asyncio 버전: 호스트별 동시 요청 수 + 초당 요청 수(토큰 버킷)"""
+    def __init__(self, rate_per_host: float, burst: int = PER_HOST_BURST, max_concurrent_per_host: int = 1):
+        self.rate_per_host = rate_per_host
+        self.capacity = max(1, burst)
+        self.max_concurrent_per_host = max(1, max_concurrent_per_host)
+        # host → [세마포어, 토큰 수, 마지막 충전 시각]
+        self._hosts: dict[str, list] = {}
+
+    async def _acquire_token(self, state: list) -> None:
+        if self.rate_per_host <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            state[1] = min(self.capacity, state[1] + (now - state[2]) * self.rate_per_host)
+            state[2] = now
+            if state[1] >= 1:
+                state[1] -= 1
+                return
+            await asyncio.sleep((1 - state[1]) / self.rate_per_host)
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = [asyncio.Semaphore(self.max_concurrent_per_host), float(self.capacity), time.monotonic()]
+        state = self._hosts[host]
+        async with state[0]:
+            await self._acquire_token(state)
+            yield
+
+
+class AsyncFetchEngine:
+    def __init__(self, max_connections: int = ASYNC_MAX_CONNECTIONS, backend: str = ASYNC_BACKEND,
+                 http2: bool = ASYNC_HTTP2, total_retry: int = TOTAL_RETRY, backoff_factor: float = BACKOFF_FACTOR):
+        if not available():
+            raise ImportError("aiohttp/httpx 미설치: pip install aiohttp (HTTP/2: pip install 'httpx[http2]')")
+        self.backend = _pick_backend(backend, http2)
+        self.http2 = http2 and self.backend == "httpx" and importlib.util.find_spec("h2") is not None
+        self.total_retry = total_retry
+        self.backoff_factor = backoff_factor
+        self._closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-fetch", daemon=True)
+        self._thread.start()
+        # 응답 처리(파싱)용 스레드 풀
+        self._workers = ThreadPoolExecutor(max_workers=max(1, min(8, max_connections)), thread_name_prefix="async-parse")
+        self.client = self._run(self._make_client(max_connections))
+
+    async def _make_client(self, max_connections: int):
+        if self.backend == "aiohttp":
+            return aiohttp.ClientSession(
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                connector=aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=30.0),
+            )
+        return httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                keepalive_expiry=30.0),
+            http2=self.http2,
+            follow_redirects=True,
+        )
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _transport_errors(self) -> tuple:
+        if self.backend == "aiohttp":
+            return (aiohttp.ClientError, asyncio.TimeoutError)
+        return (httpx.TransportError,)
+
+    async def _request(self, url: str, headers: dict) -> FetchedResponse:
+        if self.backend == "aiohttp":
+            async with self.client.get(url, headers=headers) as r:
+                body = await r.read()
+                return FetchedResponse(str(r.url), r.status, dict(r.headers), body, r.charset)
+        r = await self.client.get(url, headers=headers)
+        return FetchedResponse(str(r.url), r.status_code, dict(r.headers), r.content, r.encoding)
+
+    async def get(self, url: str, rotator: UARotator, limiter: Optional[AsyncHostRateLimiter] = None,
+                  headers: Optional[dict] = None, use_cache: bool = True) -> FetchedResponse:
+        """
+        재시도 포함 GET. 연결/읽기 오류는 total_retry회까지 재시도 후 예외, 재시도 상태 코드는 마지막 응답 반환.
+        HTML 캐시 처리는 http_get과 동일(조건부 요청, 304 → 캐시 본문의 200 응답, 새 200 응답 저장)
+        """
+        headers = {"User-Agent": rotator.pick(), **(headers or {})}
+        cache = get_html_cache() if use_cache else None
+        if cache is None:
+            return await self._get(url, headers, limiter)
+        # SQLite/zlib 작업은 스레드 풀에서(이벤트 루프 블록 방지)
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(self._workers, cache.get, url)
+        if cached is not None:
+            headers = {**cached.conditional_headers(), **headers}
+        resp = await self._get(url, headers, limiter)
+        if resp.status_code == 304 and cached is not None:
+            await loop.run_in_executor(self._workers, cache.refresh, url, resp.headers)
+            resp.status_code, resp.content, resp.encoding = 200, cached.body, cached.encoding
+        elif resp.status_code == 200:
+            await loop.run_in_executor(self._workers, cache.put, url, resp.content, resp.encoding, resp.headers)
+        return resp
+
+    async def _get(self, url: str, headers: dict, limiter: Optional[AsyncHostRateLimiter]) -> FetchedResponse:
+        transport_errors = self._transport_errors()
+        errors = 0
+        while True:
+            try:
+                if limiter is not None:
+                    async with limiter.limit(url):
+                        resp = await self._request(url, headers)
+                else:
+                    resp = await self._request(url, headers)
+            except transport_errors:
+                errors += 1
+                if errors > self.total_retry:
+                    raise
+                await asyncio.sleep(_backoff(errors, self.backoff_factor))
+                continue
+            if resp.status_code not in RETRY_STATUS or errors >= self.total_retry:
+                return resp
+            errors += 1
+            wait = _retry_after(resp)
+            await asyncio.sleep(wait if wait is not None else _backoff(errors, self.backoff_factor))
+
+    async def _fetch_many(self, urls: list[str], rotator: UARotator, limiter, concurrency: int,
+                          on_response: Callable, on_error: Callable, max_pending: Optional[int], use_cache: bool) -> list:
+        sem = asyncio.Semaphore(max(1, concurrency))
+        pending = asyncio.Semaphore(max(1, max_pending)) if max_pending else None
+        loop = asyncio.get_running_loop()
+
+        async def one(u: str):
+            async with sem:
+                try:
+                    resp = await self.get(u, rotator, limiter, use_cache=use_cache)
+                except Exception as e:
+                    return on_error(u, e)
+                # 처리 대기 응답이 max_pending개면 자리가 날 때까지 다음 다운로드도 대기(메모리 상한)
+                if pending is not None:
+                    await pending.acquire()
+            # 세마포어 반납 후 처리 → 파싱 중에도 다음 요청 진행
+            try:
+                return await loop.run_in_executor(self._workers, on_response, u, resp)
+            except Exception as e:
+                return on_error(u, e)
+            finally:
+                if pending is not None:
+                    pending.release()
+
+        return await asyncio.gather(*(one(u) for u in urls))
+
+    def fetch_many(self, urls: Iterable[str], rotator: UARotator, limiter: Optional[AsyncHostRateLimiter] = None,
+                   concurrency: int = ASYNC_MAX_CONNECTIONS,
+                   on_response: Callable = lambda u, resp: resp, on_error: Callable = lambda u, e: e,
+                   max_pending: Optional[int] = None, use_cache: bool = True) -> list:
+        """
+        urls 순서대로 on_response(url, 응답) 또는 on_error(url, 예외) 결과 리스트 (호출 스레드에서 블록)
+        max_pending: 받았지만 아직 on_response가 끝나지 않은 응답 수 상한(None이면 제한 없음)
+        """
+        return self._run(self._fetch_many(list(urls), rotator, limiter, concurrency, on_response, on_error,
+                                          max_pending, use_cache))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self.client.close() if self.backend == "aiohttp" else self.client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._workers.shutdown(wait=False)
+
+
+# 프로세스 단위 공유 엔진 (Lazy 싱글톤)
+_engine: Optional[AsyncFetchEngine] = None
+_engine_lock = threading.Lock()
+
+def get_async_engine(max_connections: int = ASYNC_MAX_CONNECTIONS, backend: str = ASYNC_BACKEND) -> AsyncFetchEngine:
+    """max_connections/backend는 엔진을 처음 만들 때만 적용"""
+    global _engine
+    with _engine_lock:
+        if _engine is None or _engine._closed:
+            _engine = AsyncFetchEngine(max_connections=max_connections, backend=backend)
+            atexit.register(_engine.close)
+        return _engine
+
+def close_async_engine() -> None:
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.close()
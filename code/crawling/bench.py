@@ -0,0 +1,242 @@
+"""
+크롤러 벤치마크 (Yahoo 요청 없이 로컬에서 실행)
+- fetch: 로컬 스텁 HTTP 서버(별도 프로세스, 지연/간헐적 503 재현)를 대상으로 본문 수집 엔진 처리량 비교
+  python -m crawling.bench fetch --n 400 --latency-ms 100 --concurrency 64 --engines threads,aiohttp,httpx
+  python -m crawling.bench fetch --heavy --parse-workers 0,4 --engines threads,aiohttp   # 파싱 프로세스 풀 효과
+- parse: 저장된 기사 HTML(fixture)로 파서 백엔드별 추출 속도 + bs4 대비 결과 일치율 비교
+  python -m crawling.bench fixtures --urls-file urls.txt   # 실제 기사 페이지를 fixture로 1회 저장
+  python -m crawling.bench parse --repeat 5                # fixture 없으면 합성 페이지 사용
+  python -m crawling.bench parse --from-cache 200          # 크롤링 중 저장된 HTML 캐시(최근 200개) 사용
+"""
+
+import argparse
+import glob
+import hashlib
+import http.server
+import multiprocessing as mp
+import os
+import random
+import time
+import zlib
+
+from .article_fetcher import fetch_articles_http
+from .async_http import get_async_engine, close_async_engine, aiohttp, httpx
+from .html_cache import get_html_cache, close_html_cache
+from .html_extract import extract_article, available_backends
+from .parse_pool import close_parse_pool
+from .http_utils import make_session, http_get, UARotator
+from .settings import DATA_DIR
+
+FIXTURE_DIR = os.path.join(DATA_DIR, "fixtures", "html")
+
+_STUB_HTML = (
+    "<html><head><meta property='og:title' content='Stub {path}'>"
+    "<meta property='article:published_time' content='2025-01-02T03:00:00Z'></head>"
+    "<body><article><h1>Stub {path}</h1>{paras}</article>"
+    "<time datetime='2025-01-02T03:00:00Z'></time></body></html>"
+)
+
+
+# ─── 스텁 서버 ──────────────────────────────────────────
+def _serve_stub(port_q, counter, latency_ms: float, fail_every: int, heavy: bool = False) -> None:
+    paras = "".join(f"<p>Paragraph {i} of a stub article body used for fetch benchmarks.</p>" for i in range(20))
+    # heavy: Yahoo 기사 크기의 합성 페이지(파싱 비용 재현)
+    pages = [_synthetic_page(i, random.Random(i)).encode("utf-8") for i in range(16)] if heavy else []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            with counter.get_lock():
+                counter.value += 1
+                n = counter.value
+            time.sleep(latency_ms / 1000)
+            if fail_every and n % fail_every == 0:
+                body, status = b"busy", 503
+            elif pages:
+                body, status = pages[zlib.crc32(self.path.encode()) % len(pages)], 200
+            else:
+                body, status = _STUB_HTML.format(path=self.path, paras=paras).encode("utf-8"), 200
+            # 조건부 요청(HTML 캐시) 확인용 ETag
+            etag = f'"{zlib.crc32(body):08x}"' if status == 200 else None
+            if etag and self.headers.get("If-None-Match") == etag:
+                body, status = b"", 304
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_q.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_stub_server(latency_ms: float = 100.0, fail_every: int = 0, heavy: bool = False):
+    """
+    스텁 서버를 별도 프로세스로 시작(클라이언트와 GIL을 나누지 않도록).
+    반환값: (프로세스, base_url, 누적 요청 수 mp.Value). fail_every=N이면 N번째 요청마다 503, heavy면 대용량 합성 페이지
+    """
+    ctx = mp.get_context("spawn")
+    port_q, counter = ctx.Queue(), ctx.Value("i", 0)
+    proc = ctx.Process(target=_serve_stub, args=(port_q, counter, latency_ms, fail_every, heavy), daemon=True)
+    proc.start()
+    return proc, f"http://127.0.0.1:{port_q.get(timeout=30)}", counter
+
+
+# ─── fetch ──────────────────────────────────────────────
+def bench_fetch(n: int, latency_ms: float, concurrency: int, fail_every: int, engines: list[str],
+                heavy: bool = False, parse_workers: list[int] = (0,), use_cache: bool = False) -> None:
+    proc, base, counter = start_stub_server(latency_ms=latency_ms, fail_every=fail_every, heavy=heavy)
+    print(f"스텁 서버: {base} (latency={latency_ms:.0f}ms, fail_every={fail_every}, heavy={heavy})")
+    try:
+        for engine, workers in ((e, w) for e in engines for w in parse_workers):
+            if engine != "threads":
+                if (engine == "aiohttp" and aiohttp is None) or (engine == "httpx" and httpx is None):
+                    print(f"⚠️ {engine} 미설치 → 생략")
+                    continue
+                # 연결 풀 크기를 동시 요청 수에 맞춤(스레드 엔진과 같은 조건)
+                close_async_engine()
+                get_async_engine(max_connections=concurrency, backend=engine)
+
+            if workers:
+                # 파싱 프로세스 기동(spawn + import)은 cold에 포함
+                close_parse_pool()
+            # revalidate: warm과 같은 URL 재요청(HTML 캐시 조건부 요청 → 304)
+            for label in ("cold", "warm", "revalidate") if use_cache else ("cold", "warm"):
+                urls = [f"{base}/{engine}/p{workers}/{label.replace('revalidate', 'warm')}/{i}" for i in range(n)]
+                before = counter.value
+                t0 = time.perf_counter()
+                # 로컬 벤치마크이므로 호스트별 속도 제한 없음(동시성만 제한)
+                articles = fetch_articles_http(urls, enable_selenium_fallback=False, concurrency=concurrency,
+                                               rate_per_host=0, max_per_host=concurrency,
+                                               engine="threads" if engine == "threads" else "async",
+                                               parse_workers=workers, use_cache=use_cache)
+                sec = time.perf_counter() - t0
+                ok = sum(1 for a in articles if a.get("status_code") == 200)
+                print(f"  {engine:8s} parse={workers} {label:10s} {n}건 {sec:6.2f}s  {n / sec:7.1f} req/s  "
+                      f"성공={ok} 오류={n - ok} 서버 요청={counter.value - before}")
+    finally:
+        close_async_engine()
+        close_parse_pool()
+        close_html_cache()
+        proc.terminate()
+
+
+# ─── parse ──────────────────────────────────────────────
+def save_fixtures(urls: list[str], out_dir: str = FIXTURE_DIR, delay: float = 1.0) -> int:
+    """기사 페이지 원본을 out_dir/{url sha1}.html로 저장(요청 간 delay초)"""
+    os.makedirs(out_dir, exist_ok=True)
+    session, rotator, saved = make_session(), UARotator(), 0
+    for u in urls:
+        try:
+            resp = http_get(u, session=session, ua_rotator=rotator)
+        except Exception as e:
+            print(f"⚠️ 저장 실패: {u} → {e}")
+            continue
+        if resp.status_code == 200:
+            path = os.path.join(out_dir, hashlib.sha1(u.encode("utf-8")).hexdigest() + ".html")
+            with open(path, "wb") as f:
+                f.write(resp.content)
+            saved += 1
+        time.sleep(delay)
+    return saved
+
+
+def _synthetic_page(i: int, rng: random.Random) -> str:
+    """Yahoo 기사와 비슷한 크기/구조의 합성 페이지(스크립트·내비게이션·추천 기사 + 본문 문단)"""
+    words = ["market", "shares", "revenue", "guidance", "analysts", "quarter", "growth", "AI", "chip", "cloud"]
+    para = lambda n: " ".join(rng.choice(words) for _ in range(n))
+    nav = "".join(f"<li><a href='/quote/T{k}'>Ticker {k}</a></li>" for k in range(300))
+    related = "".join(f"<section data-testid='storyitem'><a href='/news/r-{i}-{k}.html'><h3>{para(8)}</h3></a></section>"
+                      for k in range(40))
+    body = "".join(f"<p>{para(60)} <a href='/x'>link</a> &amp; more<!-- c --></p>" for _ in range(rng.randint(6, 20)))
+    script = "<script>" + "var x = {};" * 5000 + "</script>"
+    return (
+        f"<!DOCTYPE html><html><head><title>Synthetic {i}</title>"
+        f"<meta property='og:title' content='Synthetic article {i}'>"
+        f"<meta name='description' content='{para(20)}'>{script}</head>"
+        f"<body><header><nav><ul>{nav}</ul></nav></header><main><article>"
+        f"<div class='caas-title-wrapper'><h1>Synthetic article {i}</h1></div>"
+        f"<time datetime='2025-01-0{i % 9 + 1}T23:30:00Z'>Jan</time>"
+        f"<div class='caas-body'>{body}</div></article><aside>{related}</aside></main>{script}</body></html>"
+    )
+
+
+def bench_parse(fixture_dir: str, repeat: int, backends: list[str], from_cache: int = 0) -> None:
+    paths = sorted(glob.glob(os.path.join(fixture_dir, "*.html")))
+    cache = get_html_cache() if from_cache else None
+    if cache is not None:
+        pages = [p.body.decode(p.encoding or "utf-8", errors="replace") for _, p in cache.iter_pages(from_cache)]
+        print(f"HTML 캐시 {len(pages)}개: {cache.path}")
+        if not pages:
+            return
+    elif paths:
+        pages = []
+        for p in paths:
+            with open(p, "rb") as f:
+                pages.append(f.read().decode("utf-8", errors="replace"))
+        print(f"fixture {len(pages)}개: {fixture_dir}")
+    else:
+        rng = random.Random(0)
+        pages = [_synthetic_page(i, rng) for i in range(30)]
+        print(f"fixture 없음({fixture_dir}) → 합성 페이지 {len(pages)}개")
+    print(f"평균 크기: {sum(map(len, pages)) / len(pages) / 1024:.0f} KB, 반복 {repeat}회")
+
+    backends = [b for b in backends if b in available_backends()]
+    reference = [extract_article(h, backend="bs4") for h in pages]
+    base_sec = None
+    for b in backends:
+        extract_article(pages[0], backend=b)  # 규칙 컴파일/로드 제외
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            out = [extract_article(h, backend=b) for h in pages]
+        sec = (time.perf_counter() - t0) / repeat
+        base_sec = base_sec or (sec if b == "bs4" else None)
+        same = {k: sum(o[k] == r[k] for o, r in zip(out, reference)) for k in ("title", "content", "date")}
+        speed = f"x{base_sec / sec:.1f}" if base_sec else ""
+        print(f"  {b:10s} {sec / len(pages) * 1000:7.2f} ms/page {speed:6s} "
+              f"bs4 일치: title={same['title']}/{len(pages)} content={same['content']}/{len(pages)} date={same['date']}/{len(pages)}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="StockMind 크롤러 벤치마크 (로컬 스텁)")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("fetch", help="본문 수집 엔진 처리량 비교")
+    f.add_argument("--n", type=int, default=200, help="요청 수")
+    f.add_argument("--latency-ms", type=float, default=100.0, help="스텁 서버 응답 지연")
+    f.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    f.add_argument("--fail-every", type=int, default=0, help="N번째 요청마다 503 (재시도 확인용)")
+    f.add_argument("--engines", type=str, default="threads,aiohttp,httpx", help="비교할 엔진(쉼표 구분: threads/aiohttp/httpx)")
+    f.add_argument("--heavy", action="store_true", help="Yahoo 기사 크기의 합성 페이지 응답(파싱 비용 포함)")
+    f.add_argument("--parse-workers", type=str, default="0", help="비교할 파싱 프로세스 수(쉼표 구분, 0=수집 스레드에서 파싱)")
+    f.add_argument("--cache", action="store_true", help="HTML 캐시 사용 + 같은 URL 재요청(304) 측정 (YF_HTML_CACHE_PATH 권장)")
+    x = sub.add_parser("fixtures", help="기사 페이지를 fixture로 저장")
+    x.add_argument("--urls-file", type=str, required=True, help="URL 목록 파일(한 줄에 하나)")
+    x.add_argument("--out", type=str, default=FIXTURE_DIR, help="저장 디렉토리")
+    x.add_argument("--delay", type=float, default=1.0, help="요청 간격(초)")
+    r = sub.add_parser("parse", help="HTML 파서 백엔드 속도/일치율 비교")
+    r.add_argument("--fixtures", type=str, default=FIXTURE_DIR, help="*.html fixture 디렉토리")
+    r.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    r.add_argument("--backends", type=str, default="bs4,lxml,selectolax", help="비교할 백엔드(쉼표 구분, bs4 기준)")
+    r.add_argument("--from-cache", type=int, default=0, help="fixture 대신 HTML 캐시의 최근 N개 페이지 사용")
+    args = p.parse_args()
+
+    if args.cmd == "fetch":
+        bench_fetch(args.n, args.latency_ms, args.concurrency, args.fail_every, args.engines.split(","),
+                    args.heavy, [int(w) for w in args.parse_workers.split(",")], args.cache)
+    elif args.cmd == "fixtures":
+        with open(args.urls_file, encoding="utf-8") as f:
+            urls = [line.strip() for line in f if line.strip()]
+        print(f"저장 완료: {save_fixtures(urls, args.out, args.delay)}/{len(urls)}")
+    elif args.cmd == "parse":
+        bench_parse(args.fixtures, args.repeat, args.backends.split(","), args.from_cache)
+
+if __name__ == "__main__":
+    main()
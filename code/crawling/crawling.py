@@ -7,20 +7,28 @@ import gc
 import time
 import random
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 
 import pandas as pd
-from bs4 import BeautifulSoup
 
 # Selenium
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import WebDriverException, TimeoutException
 
 # 프로젝트 설정/함수
-from .settings import RAW_DIR, UA_LIST, STOP_LOOKBACK_DAYS, STOP_TOPN
+from .settings import (
+    RAW_DIR, UA_LIST, STOP_LOOKBACK_DAYS, STOP_TOPN, FETCH_CONCURRENCY, PER_HOST_RPS,
+    DRIVER_POOL_SIZE, SELENIUM_FALLBACK, SELENIUM, PIPELINE_QUEUE, PIPELINE_QUEUE_MAXSIZE, PIPELINE_QUEUE_PUT_TIMEOUT,
+)
 from .article_fetcher import fetch_articles_http
+from .driver_pool import get_driver_pool, close_driver_pool
+from .async_http import close_async_engine
+from .parse_pool import close_parse_pool
+from .html_cache import close_html_cache
+from .url_index import get_url_index, normalize_url
+from .storage import write_part, compact_partition, fetched_ok
+from utils.manifest import get_manifest, partition_signature
+from utils.work_queue import get_work_queue
 
 # ───────────────────────────────────────────────────────────────────────────────
 # (선택) 리소스 모니터: psutil이 있으면 실행 후 요약 출력
@@ -135,85 +143,22 @@ def _last_date_dir(base_dir: str, ticker: str) -> Optional[str]:
 
 
 # ───────────────────────────────────────────────────────────────────────────────
-# stop set: url 컬럼만 가볍게 부분 로드
+# stop set: URL 색인에서 최근 URL 조회
 # ───────────────────────────────────────────────────────────────────────────────
-def _load_urls_head(save_dir: str, top_n: int) -> list[str]:
-    pq = os.path.join(save_dir, "news.parquet")
-    csv = os.path.join(save_dir, "news.csv")
-    try:
-        if os.path.exists(pq):
-            df = pd.read_parquet(pq, columns=["url"])
-            return df["url"].dropna().astype(str).str.strip().head(top_n).tolist()
-        if os.path.exists(csv):
-            df = pd.read_csv(csv, usecols=["url"], nrows=top_n * 2)
-            return df["url"].dropna().astype(str).str.strip().head(top_n).tolist()
-    except Exception:
-        return []
-    return []
-
-
 def _load_recent_urls_multi(out_dir: str, ticker: str, lookback_days: int, top_n: int) -> list[str]:
     """
-    최근 lookback_days 범위의 날짜 폴더에서 각 날짜의 상단 top_n개 URL만 모음.
-    (파일 전체를 로드하지 않도록 url 컬럼만 부분 로드)
+    최근 lookback_days 범위에서 최신순 top_n개 URL (URL 색인 조회, 날짜 폴더/파일 스캔 없음)
     """
-    base = os.path.join(out_dir, ticker)
-    if not os.path.exists(base):
-        return []
-
-    today = dt.date.today()
-    items = []
-    for name in os.listdir(base):
-        p = os.path.join(base, name)
-        if not os.path.isdir(p):
-            continue
-        try:
-            d = dt.datetime.strptime(name, DATE_FMT).date()
-        except ValueError:
-            continue
-        if (today - d).days <= lookback_days:
-            items.append(d)
-    if not items:
+    since = (dt.date.today() - dt.timedelta(days=lookback_days)).strftime(DATE_FMT)
+    try:
+        return get_url_index(out_dir).recent(ticker, since_date=since, top_n=top_n)
+    except Exception:
         return []
 
-    items.sort(reverse=True)
-    seen, st = [], set()
-    for d in items:
-        urls = _load_urls_head(os.path.join(base, d.strftime(DATE_FMT)), top_n=top_n)
-        for u in urls:
-            if u not in st:
-                st.add(u)
-                seen.append(u)
-                if len(seen) >= top_n:   # 충분하면 즉시 종료
-                    return seen
-    return seen
-
 
 # ───────────────────────────────────────────────────────────────────────────────
-# Selenium 드라이버(리소스 최소화 설정)
+# Selenium 드라이버: 공유 풀(driver_pool)에서 세션을 빌려 재사용
 # ───────────────────────────────────────────────────────────────────────────────
-def _make_driver(user_agent: str | None = None):
-    opts = Options()
-    opts.add_argument("--headless=new")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--window-size=1920,1080")
-
-    if user_agent:
-        opts.add_argument(f"--user-agent={user_agent}")
-
-    use_remote = os.getenv("USE_REMOTE_WEBDRIVER", "false").lower() == "true"
-
-    if use_remote:
-        remote_url = os.getenv("SELENIUM_REMOTE_URL", "http://selenium:4444")
-        return webdriver.Remote(command_executor=remote_url, options=opts)
-
-    # 로컬 실행용 (컨테이너 안에 크롬 있을 때만)
-    service = Service()
-    return webdriver.Chrome(service=service, options=opts)
-
-
 def _driver_get_with_retry(driver, url: str, tries: int = 2, sleep_sec: float = 2.0):
     last_err: Optional[Exception] = None
     for _ in range(tries):
@@ -227,81 +172,108 @@ def _driver_get_with_retry(driver, url: str, tries: int = 2, sleep_sec: float =
 
 
 # ───────────────────────────────────────────────────────────────────────────────
-# 링크 수집 (리소스 최소화): 스크롤 → 최종 page_source 한 번만 파싱
+# 링크 수집 (리소스 최소화): 라운드마다 새 카드만 JS로 조회 → 조기 종료
 # ───────────────────────────────────────────────────────────────────────────────
+# 인덱스 arguments[0] 이후(새로 로드된) 카드의 [href, datetime]만 반환 (page_source 파싱 없음)
+_JS_NEW_CARDS = """
+const cards = document.querySelectorAll('section[data-testid="storyitem"]');
+const out = [];
+for (let i = arguments[0]; i < cards.length; i++) {
+  const a = cards[i].querySelector('a');
+  const t = cards[i].querySelector('time[datetime]');
+  out.push([a ? a.getAttribute('href') : null, t ? t.getAttribute('datetime') : null]);
+}
+return out;
+"""
+_JS_CARD_COUNT = "return document.querySelectorAll('section[data-testid=\"storyitem\"]').length;"
+
+
+def _wait_card_growth(driver, prev_count: int, timeout: float, poll: float) -> int:
+    """카드 수가 prev_count보다 늘어날 때까지(최대 timeout초) 대기 후 현재 카드 수 반환"""
+    deadline = time.monotonic() + timeout
+    count = prev_count
+    while True:
+        try:
+            count = int(driver.execute_script(_JS_CARD_COUNT) or 0)
+        except WebDriverException:
+            pass
+        if count > prev_count or time.monotonic() >= deadline:
+            return count
+        time.sleep(poll)
+
+
 def collect_yahoo_links_incremental(
     ticker: str,
     max_scroll: int,
     last_date: Optional[str],
     user_agent: str,
+    stop_urls: Optional[set] = None,
 ) -> List[Dict]:
     """
-    리소스 최소화 버전:
-    - 스크롤만 반복
-    - 마지막에 단 1회 BeautifulSoup 파싱
-    - last_date보다 과거 카드들은 목록에서 제외(스크롤 중단은 의미 적음)
+    리소스 최소화 + 조기 종료 버전:
+    - 스크롤 후 고정 sleep 대신 카드 수(DOM) 증가를 대기
+    - 라운드마다 새로 로드된 카드만 가벼운 JS로 조회(전체 page_source 파싱 없음)
+    - last_date보다 과거 카드 또는 stop_urls(기존 수집 URL)에 도달하면 즉시 스크롤 중단
+    - 카드가 더 늘지 않는 라운드가 max_stable_rounds회 이어지면 중단
     반환: [{'url': str, 'date_guess': 'YYYY-MM-DD' or None}, ...]
     """
     url = YF_BASE_NEWS_URL.format(ticker=ticker)
-    driver = _make_driver(user_agent=user_agent)
-    html = ""
-    try:
-        _driver_get_with_retry(driver, url, tries=int(os.environ.get("YF_GET_RETRIES", "2")))
-        time.sleep(1.8)
+    stop_set = set(map(normalize_url, stop_urls or ()))
+    wait_timeout = SELENIUM.get("scroll_wait_timeout", 3.0)
+    poll = SELENIUM.get("scroll_poll", 0.2)
+    stable_need = SELENIUM.get("max_stable_rounds", 2)
 
-        for _ in range(max_scroll):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.2)
+    results, seen = [], set()
+    # 풀에서 빌린 세션 사용(오류 시 풀이 세션을 폐기/재생성)
+    with get_driver_pool().lease(user_agent=user_agent) as driver:
+        _driver_get_with_retry(driver, url, tries=int(os.environ.get("YF_GET_RETRIES", "2")))
+        _wait_card_growth(driver, 0, timeout=wait_timeout * 2, poll=poll)
 
-        html = driver.page_source  # 최종본만 사용
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        consumed, stable, reached_old = 0, 0, False
+        for round_no in range(max_scroll + 1):
+            new_cards = driver.execute_script(_JS_NEW_CARDS, consumed) or []
+            consumed += len(new_cards)
 
-    soup = BeautifulSoup(html, "html.parser")
-    cards = soup.select('section[data-testid="storyitem"]')
-    results, seen = [], set()
+            for href, dt_attr in new_cards:
+                if not href:
+                    continue
+                link = href if href.startswith("http") else ("https://finance.yahoo.com" + href)
+                if link in seen:
+                    continue
+                seen.add(link)
 
-    for card in cards:
-        a = card.find("a")
-        href = a.get("href") if a else None
-        if not href:
-            continue
-        link = href if href.startswith("http") else ("https://finance.yahoo.com" + href)
-        if link in seen:
-            continue
-        seen.add(link)
+                guess = dt_attr.split("T")[0] if dt_attr else None
 
-        # 날짜 추정
-        t = card.select_one("time[datetime]")
-        guess = None
-        if t and t.has_attr("datetime"):
-            try:
-                guess = t["datetime"].split("T")[0]
-            except Exception:
-                pass
+                # 이미 수집한 URL 또는 last_date 이전 카드 → 이후 카드는 모두 과거 기사
+                if normalize_url(link) in stop_set or (last_date and guess and guess < last_date):
+                    reached_old = True
+                    break
 
-        # 스크롤 완료 후 필터링(목록 축소)
-        if last_date and guess and guess < last_date:
-            continue
+                results.append({"url": link, "date_guess": guess})
 
-        results.append({"url": link, "date_guess": guess})
+            if reached_old or round_no == max_scroll:
+                break
 
-    # 메모리 해제 유도
-    del soup, cards, html
-    gc.collect()
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            if _wait_card_growth(driver, consumed, timeout=wait_timeout, poll=poll) > consumed:
+                stable = 0
+            else:
+                stable += 1
+                if stable >= stable_need:
+                    break
+
+    print(f"[{ticker}] 링크 {len(results)}건 수집 (카드 {consumed}개, 조기 종료={reached_old})")
     return results
 
 
 # ───────────────────────────────────────────────────────────────────────────────
-# 날짜별 저장(기존 url만 부분 로드 → 신규만 병합 → 저장)
+# 날짜별 저장(URL 색인으로 신규만 선별 → 조각 파일 추가 → 색인 갱신 → 필요 시 컴팩션)
 # ───────────────────────────────────────────────────────────────────────────────
-def _save_by_article_date(rows: List[Dict], ticker: str, out_dir: str) -> None:
+def _save_by_article_date(rows: List[Dict], ticker: str, out_dir: str, work_queue=None) -> None:
     if not rows:
         return
 
+    index = get_url_index(out_dir)
     df_all = pd.DataFrame(rows)
     for c in ["date", "url", "title", "content", "status_code", "fetched_at", "run_id", "ticker"]:
         if c not in df_all.columns:
@@ -311,51 +283,79 @@ def _save_by_article_date(rows: List[Dict], ticker: str, out_dir: str) -> None:
         save_dir = os.path.join(out_dir, ticker, str(date_str))
         os.makedirs(save_dir, exist_ok=True)
 
-        pq = os.path.join(save_dir, "news.parquet")
-        csv = os.path.join(save_dir, "news.csv")
-
-        # 기존 URL만 가볍게 읽어 중복 제거
-        existed = set()
-        try:
-            if os.path.exists(pq):
-                existed = set(pd.read_parquet(pq, columns=["url"])["url"].astype(str).map(_norm_url))
-            elif os.path.exists(csv):
-                existed = set(pd.read_csv(csv, usecols=["url"])["url"].astype(str).map(_norm_url))
-        except Exception:
-            existed = set()
-
+        # 기존 URL은 색인에서 조회해 중복 제거(파일 재로드 없음)
         df_day = df_day.copy()
         df_day["url"] = df_day["url"].astype(str).map(_norm_url)
-        df_new = df_day[~df_day["url"].isin(existed)]
+        existed = index.known(df_day["url"].tolist(), ticker)
+        df_new = df_day[~df_day["url"].isin(existed)].drop_duplicates(subset=["url"], keep="first")
 
         if df_new.empty:
             continue
 
-        # 최종 저장 직전에만 전체 로드 1회
-        if os.path.exists(pq):
-            old = pd.read_parquet(pq)
-        elif os.path.exists(csv):
-            old = pd.read_csv(csv)
-        else:
-            old = pd.DataFrame()
+        # 신규 행만 조각 파일로 추가(기존 파일 읽기/재작성 없음)
+        run_id = str(df_new["run_id"].iloc[0]) if "run_id" in df_new.columns else ""
+        path = write_part(save_dir, df_new, run_id=run_id)
+        print(f"[{ticker}] 저장 완료: {path} (rows={len(df_new)})")
 
-        merged = pd.concat([old, df_new], ignore_index=True, sort=False) if not old.empty else df_new
-        merged.drop_duplicates(subset=["url"], keep="first", inplace=True)
+        # 파일 저장 성공 후에만 색인 반영(한 트랜잭션). 수집 실패/빈 본문은 색인하지 않음 → 다음 실행에서 재시도
+        index.add_many(df_new.loc[fetched_ok(df_new), ["url", "ticker", "date", "fetched_at"]].to_dict("records"))
 
-        try:
-            merged.to_parquet(pq, index=False)
-            print(f"[{ticker}] 저장 완료: {pq} (rows={len(merged)})")
-        except Exception:
-            merged.to_csv(csv, index=False)
-            print(f"[{ticker}] Parquet 미지원으로 CSV 저장: {csv}")
+        # 조각이 충분히 쌓인 파티션만 주기적으로 컴팩션
+        compacted = compact_partition(save_dir)
+        if compacted:
+            print(f"[{ticker}] 컴팩션 완료: {compacted}")
+
+        # 매니페스트에 입력 지문 갱신 → 분석 단계 pending 판단
+        get_manifest(os.path.join(out_dir, ticker)).record_input(str(date_str), partition_signature(save_dir), len(df_new))
+
+        # 파이프라인 모드: 분석 소비자에게 파티션 전달(대기 작업이 많으면 여기서 대기)
+        if work_queue is not None and not work_queue.put(ticker, str(date_str), timeout=PIPELINE_QUEUE_PUT_TIMEOUT):
+            print(f"[{ticker}] ⚠️ 분석 큐 대기 시간 초과 → 계속 진행 ({date_str})")
 
         # 메모리 해제
-        del old, merged, df_new, df_day
+        del df_new, df_day
         gc.collect()
 
 
 # ───────────────────────────────────────────────────────────────────────────────
-# 메인 파이프라인 (폴백 Selenium OFF + 티커마다 GC + 리소스 요약)
+# 링크 수집 단계: 티커별 병렬(드라이버 풀 크기만큼 동시 세션)
+# ───────────────────────────────────────────────────────────────────────────────
+def _collect_links_for_ticker(ticker: str, out_dir: str, max_scroll: int) -> tuple[Optional[str], list[str], List[Dict]]:
+    last_date = _last_date_dir(out_dir, ticker)  # "YYYY-MM-DD" or None
+    stop_urls = _load_recent_urls_multi(
+        out_dir=out_dir,
+        ticker=ticker,
+        lookback_days=STOP_LOOKBACK_DAYS,
+        top_n=STOP_TOPN,
+    )
+
+    ua = random.choice(UA_LIST) if UA_LIST else ""
+    items = collect_yahoo_links_incremental(
+        ticker=ticker,
+        max_scroll=max_scroll,
+        last_date=last_date,
+        user_agent=ua,
+        stop_urls=set(stop_urls),
+    )
+    return last_date, stop_urls, items
+
+
+def _collect_links_parallel(tickers: List[str], out_dir: str, max_scroll: int) -> Dict[str, tuple]:
+    plans: Dict[str, tuple] = {}
+    workers = max(1, min(DRIVER_POOL_SIZE, len(tickers)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(_collect_links_for_ticker, t, out_dir, max_scroll): t for t in tickers}
+        for fut in as_completed(futures):
+            t = futures[fut]
+            try:
+                plans[t] = fut.result()
+            except Exception as e:
+                print(f"[{t}] 링크 수집 실패: {e}")
+    return plans
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# 메인 파이프라인 (티커마다 GC + 리소스 요약)
 # ───────────────────────────────────────────────────────────────────────────────
 def run_yahoo_pipeline(
     tickers: List[str],
@@ -368,90 +368,103 @@ def run_yahoo_pipeline(
 ) -> None:
     """
     리소스 최소화 원칙:
-    - 티커당 Selenium 1회(스크롤만), Soup 1회 파싱
-    - 본문 수집은 requests만 사용(폴백 Selenium OFF)
-    - 기존 파일은 url만 부분 로드해 중복 제거
+    - Selenium 세션은 드라이버 풀에서 재사용, 링크 수집은 티커별 병렬
+    - 티커당 스크롤은 새 카드만 JS로 확인하며 last_date/stop set 도달 시 조기 종료
+    - 본문 수집은 requests 우선(Selenium 폴백은 SELENIUM_FALLBACK 설정 시에만)
+    - URL 색인으로 중복 제거(이미 저장한 기사는 기간과 무관하게 재요청하지 않음)
     - 티커 경계마다 GC 강제 호출
     - 실행 후 리소스 요약 출력(psutil 있으면)
+    - PIPELINE_QUEUE 설정 시 티커별 저장 직후 작업 큐에 추가 → 분석(main_analysis --follow)이 크롤링과 동시에 진행
     """
     run_date = run_date or dt.datetime.now().strftime(DATE_FMT)
+    work_queue = get_work_queue(out_dir, maxsize=PIPELINE_QUEUE_MAXSIZE) if PIPELINE_QUEUE else None
+    if work_queue is not None:
+        work_queue.open_producer()
 
     with ResourceMonitor(label="crawling") as mon:
-        for ticker in tickers:
-            last_date = _last_date_dir(out_dir, ticker)  # "YYYY-MM-DD" or None
-            stop_urls = _load_recent_urls_multi(
-                out_dir=out_dir,
-                ticker=ticker,
-                lookback_days=STOP_LOOKBACK_DAYS,
-                top_n=STOP_TOPN,
-            )
-
-            ua = random.choice(UA_LIST) if UA_LIST else ""
-            items = collect_yahoo_links_incremental(
-                ticker=ticker,
-                max_scroll=max_scroll,
-                last_date=last_date,
-                user_agent=ua,
-            )
-            if not items:
-                print(f"[{ticker}] 새 링크 없음. (run_date={run_date})")
-                mon.tick(); gc.collect()
-                continue
-
-            # last_date 기반 1차 필터
-            if last_date:
-                items = [it for it in items if (it["date_guess"] is None) or (it["date_guess"] >= last_date)]
-                if not items:
-                    mon.tick(); gc.collect()
-                    continue
+        try:
+            plans = _collect_links_parallel(tickers, out_dir, max_scroll)
+            mon.tick()
 
-            # stop set 중복 제거
-            if stop_urls:
-                stop_set = set(map(_norm_url, stop_urls))
-                items = [it for it in items if _norm_url(it["url"]) not in stop_set]
+            for ticker in tickers:
+                if ticker not in plans:
+                    continue
+                last_date, stop_urls, items = plans.pop(ticker)
                 if not items:
+                    print(f"[{ticker}] 새 링크 없음. (run_date={run_date})")
                     mon.tick(); gc.collect()
                     continue
 
-            # 상한 컷
-            items = items[:max_articles_per_ticker]
-            urls = [it["url"] for it in items]
-
-            # 본문 수집: requests만 (폴백 Selenium OFF)
-            articles = fetch_articles_http(
-                urls=urls,
-                ua_mode=requests_ua_mode,
-                delay_range=(0.6, 1.1),
-                min_len_for_ok=120,
-                enable_selenium_fallback=False,
-            )
-            if not articles:
-                mon.tick(); gc.collect()
-                continue
-
-            # 본문 date 확정 후 last_date 기준 최종 필터
-            if last_date:
-                articles = [a for a in articles if a.get("date") and a["date"] >= last_date]
+                # last_date 기반 1차 필터
+                if last_date:
+                    items = [it for it in items if (it["date_guess"] is None) or (it["date_guess"] >= last_date)]
+                    if not items:
+                        mon.tick(); gc.collect()
+                        continue
+
+                # stop set 중복 제거
+                if stop_urls:
+                    stop_set = set(map(normalize_url, stop_urls))
+                    items = [it for it in items if normalize_url(it["url"]) not in stop_set]
+                    if not items:
+                        mon.tick(); gc.collect()
+                        continue
+
+                # URL 색인 중복 제거: 기간과 무관하게 이미 저장한 기사는 다시 요청하지 않음
+                known = get_url_index(out_dir).known([it["url"] for it in items], ticker)
+                if known:
+                    items = [it for it in items if it["url"] not in known]
+                    if not items:
+                        mon.tick(); gc.collect()
+                        continue
+
+                # 상한 컷
+                items = items[:max_articles_per_ticker]
+                urls = [it["url"] for it in items]
+
+                # 본문 수집: requests 우선, 호스트별 초당 요청 수로 속도 제한
+                articles = fetch_articles_http(
+                    urls=urls,
+                    ua_mode=requests_ua_mode,
+                    min_len_for_ok=120,
+                    enable_selenium_fallback=SELENIUM_FALLBACK,
+                    concurrency=FETCH_CONCURRENCY,
+                    rate_per_host=PER_HOST_RPS,
+                )
                 if not articles:
                     mon.tick(); gc.collect()
                     continue
 
-            now_iso = dt.datetime.now().isoformat(timespec="seconds")
-            rows: List[Dict] = [{
-                "ticker": ticker,
-                "url": a.get("url"),
-                "title": a.get("title", ""),
-                "date": a.get("date"),
-                "content": a.get("content", ""),
-                "status_code": a.get("status_code"),
-                "fetched_at": now_iso,
-                "run_id": run_id,
-            } for a in articles]
-
-            _save_by_article_date(rows, ticker=ticker, out_dir=out_dir)
-
-            # 티커 종료 시 샘플/GC
-            mon.tick()
-            del items, urls, articles, rows, stop_urls
-            gc.collect()
+                # 본문 date 확정 후 last_date 기준 최종 필터
+                if last_date:
+                    articles = [a for a in articles if a.get("date") and a["date"] >= last_date]
+                    if not articles:
+                        mon.tick(); gc.collect()
+                        continue
+
+                now_iso = dt.datetime.now().isoformat(timespec="seconds")
+                rows: List[Dict] = [{
+                    "ticker": ticker,
+                    "url": a.get("url"),
+                    "title": a.get("title", ""),
+                    "date": a.get("date"),
+                    "content": a.get("content", ""),
+                    "status_code": a.get("status_code"),
+                    "fetched_at": now_iso,
+                    "run_id": run_id,
+                } for a in articles]
+
+                _save_by_article_date(rows, ticker=ticker, out_dir=out_dir, work_queue=work_queue)
+
+                # 티커 종료 시 샘플/GC
+                mon.tick()
+                del items, urls, articles, rows, stop_urls
+                gc.collect()
+        finally:
+            close_driver_pool()
+            close_async_engine()
+            close_parse_pool()
+            close_html_cache()
+            if work_queue is not None:
+                work_queue.close_producer()
 
@@ -0,0 +1,124 @@
+import os
+import atexit
+import random
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from .settings import SELENIUM, UA_LIST, DRIVER_POOL_SIZE, DRIVER_MAX_PAGES
+
+
+def make_driver(user_agent: Optional[str] = None):
+    """
+    USE_REMOTE_WEBDRIVER=true 이면 Compose의 selenium 서비스로 원격 연결,
+    아니면 컨테이너 내부의 로컬 Chrome(설치 시)에 연결. (리소스 최소화 옵션)
+    """
+    opts = Options()
+    if SELENIUM.get("headless", True):
+        opts.add_argument("--headless=new")
+    if SELENIUM.get("disable_gpu", True):
+        opts.add_argument("--disable-gpu")
+    w, h = SELENIUM.get("window_size", (1920, 1080))
+    opts.add_argument(f"--window-size={w},{h}")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--blink-settings=imagesEnabled=false")
+    opts.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+    if user_agent:
+        opts.add_argument(f"--user-agent={user_agent}")
+
+    use_remote = os.getenv("USE_REMOTE_WEBDRIVER", "false").lower() == "true"
+    if use_remote:
+        remote_url = os.getenv("SELENIUM_REMOTE_URL", "http://selenium:4444")
+        driver = webdriver.Remote(command_executor=remote_url, options=opts)
+    else:
+        driver = webdriver.Chrome(service=Service(), options=opts)
+    driver.set_page_load_timeout(SELENIUM.get("page_load_timeout", 180))
+    return driver
+
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """
+    최대 size개의 Chrome 세션을 유지하며 재사용하는 풀.
+    - lease()로 빌려 쓰고 반납; 풀이 가득 차면 반납될 때까지 대기
+    - 세션당 max_pages회 사용 후, 또는 사용 중 예외 발생 시 폐기 후 다음 요청에서 재생성
+    - user_agent는 세션 생성 시에만 적용(재사용 세션은 생성 당시 UA 유지)
+    """
+    def __init__(self, size: int = DRIVER_POOL_SIZE, max_pages: int = DRIVER_MAX_PAGES,
+                 factory: Callable = make_driver):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.factory = factory
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: list[list] = []  # [driver, 사용 횟수]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def lease(self, user_agent: Optional[str] = None):
+        self._slots.acquire()
+        try:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                entry = [self.factory(user_agent or (random.choice(UA_LIST) if UA_LIST else None)), 0]
+            try:
+                yield entry[0]
+            except BaseException:
+                # 오류가 난 세션은 상태를 신뢰할 수 없으므로 폐기
+                _quit(entry[0])
+                raise
+            entry[1] += 1
+            with self._lock:
+                if not self._closed and entry[1] < self.max_pages:
+                    self._idle.append(entry)
+                    entry = None
+            if entry is not None:
+                _quit(entry[0])
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """유휴 세션 모두 종료(사용 중 세션은 반납 시 종료)"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            _quit(driver)
+
+
+# 프로세스 단위 공유 풀 (Lazy 싱글톤)
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool() -> DriverPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
+
+def close_driver_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,171 @@
+"""
+기사 원본 HTML 캐시 (SQLite, zlib 압축)
+- 키: 정규화 URL → 본문(압축), 인코딩, ETag/Last-Modified
+- 재수집 시 조건부 요청(If-None-Match/If-Modified-Since) → 304면 캐시 본문을 200 응답처럼 사용
+- 조회 시 accessed_at 갱신 → 전체 크기가 max_mb를 넘으면 가장 오래 안 쓴 항목부터(LRU) 삭제
+- 선택자 변경 후 재다운로드 없이 재추출할 때도 사용 (article_fetcher.reextract_articles)
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Iterator, NamedTuple, Optional
+
+from .settings import HTML_CACHE_ENABLED, HTML_CACHE_PATH, HTML_CACHE_MAX_MB
+from .url_index import normalize_url
+
+# 몇 번 저장할 때마다 크기 점검
+_EVICT_EVERY = 64
+
+
+def _header(headers, name: str) -> Optional[str]:
+    # requests는 대소문자 무시 dict, aiohttp/httpx 응답은 일반 dict로 복사되므로 직접 비교
+    if not headers:
+        return None
+    v = headers.get(name)
+    if v is None:
+        lname = name.lower()
+        v = next((val for k, val in headers.items() if k.lower() == lname), None)
+    return v
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    def conditional_headers(self) -> dict:
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+
+class HtmlCache:
+    def __init__(self, path: str = HTML_CACHE_PATH, max_mb: int = HTML_CACHE_MAX_MB):
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.revalidated = 0  # 304로 재사용한 횟수(실행 로그용)
+        # 여러 프로세스가 동시에 열 수 있도록 WAL + busy timeout
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 유실되어도 다시 받으면 되는 캐시 → 커밋마다 fsync하지 않음
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, encoding TEXT,"
+            " etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, encoding, etag, last_modified FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), key))
+        try:
+            body = zlib.decompress(row[0])
+        except zlib.error:
+            return None
+        return CachedPage(body, row[1], row[2], row[3])
+
+    def put(self, url: str, content: bytes, encoding: Optional[str], headers=None) -> None:
+        """200 응답 본문 저장(같은 URL이면 교체)"""
+        if not content:
+            return
+        blob = zlib.compress(content, 6)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, body, size, encoding, etag, last_modified, fetched_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (normalize_url(url), blob, len(blob), encoding,
+                     _header(headers, "ETag"), _header(headers, "Last-Modified"), now, now),
+                )
+            self._puts += 1
+            due = self._puts % _EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def refresh(self, url: str, headers=None) -> None:
+        """304 응답: 확인 시각 갱신(서버가 새 검증자를 주면 교체)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, _header(headers, "ETag"), _header(headers, "Last-Modified"), normalize_url(url)),
+            )
+            self.revalidated += 1
+
+    def evict(self) -> None:
+        """전체 크기가 상한을 넘으면 LRU로 상한의 90%까지 삭제"""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+            if total <= self.max_bytes:
+                return
+            excess, drop = total - int(self.max_bytes * 0.9), []
+            for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at ASC"):
+                drop.append((url,))
+                excess -= size
+                if excess <= 0:
+                    break
+            with self._conn:
+                self._conn.executemany("DELETE FROM pages WHERE url = ?", drop)
+
+    def iter_pages(self, limit: int = 0) -> Iterator[tuple[str, CachedPage]]:
+        """최근 저장 순 (정규화 URL, 페이지). limit=0이면 전부"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, body, encoding, etag, last_modified FROM pages ORDER BY fetched_at DESC"
+                + (" LIMIT ?" if limit else ""), (limit,) if limit else (),
+            ).fetchall()
+        for url, blob, enc, etag, lm in rows:
+            yield url, CachedPage(zlib.decompress(blob), enc, etag, lm)
+
+    def close(self) -> None:
+        try:
+            self.evict()
+            self._conn.close()
+        except Exception:
+            pass
+
+
+# Lazy 싱글톤 (비활성화 시 None)
+_cache: Optional[HtmlCache] = None
+_cache_lock = threading.Lock()
+
+def get_html_cache() -> Optional[HtmlCache]:
+    global _cache
+    if not HTML_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HtmlCache()
+        return _cache
+
+def close_html_cache() -> None:
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        if cache.revalidated:
+            print(f"🗄️ HTML 캐시: 304 재사용 {cache.revalidated}건")
+        cache.close()
@@ -0,0 +1,299 @@
+"""
+기사 HTML → 제목/본문/날짜 추출 (파서 백엔드 선택 + 추출 규칙 1회 컴파일)
+- 백엔드: selectolax(lexbor) / lxml(+cssselect) / bs4(html.parser). auto면 설치된 것 중 앞쪽 우선
+- 규칙(CSS 선택자)은 백엔드별로 처음 사용할 때 1회 컴파일 후 재사용 (bs4: soupsieve, lxml: cssselect → XPath)
+- 문서는 1번만 파싱하고 제목/본문/날짜 규칙을 같은 트리에 적용
+"""
+
+import datetime as dt
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import pandas as pd
+
+from .settings import HTML_PARSER
+
+# ─── 추출 규칙 (앞쪽 우선) ──────────────────────────────
+TITLE_META = ("meta[property='og:title']", "meta[name='title']")
+TITLE_HEADINGS = ("h1", "header h1", "article h1", "div.caas-title-wrapper h1", "div.caas-content-header h1")
+TITLE_TAG = "title"
+
+# 주력 본문 선택자(다중 OR) → fallback 후보들(구 Yahoo/caas/일반 기사 템플릿)
+CONTENT_PRIMARY = "article p, main p, div[data-test-locator='mega'] p"
+CONTENT_FALLBACKS = (
+    "div.caas-body p",
+    "div#article-body p",
+    "div[itemprop='articleBody'] p",
+    "div[itemprop='articleBody'] div p",  # 중첩 구조
+    "section[data-test-locator='mega'] p",
+)
+# 최후의 수단: meta description (name 우선)
+CONTENT_META = ("meta[name='description']", "meta[property='og:description']")
+
+DATE_TIME = "time[datetime]"
+DATE_META = (
+    "meta[property='article:published_time']",
+    "meta[name='article:published_time']",
+    "meta[name='publish-date']",
+    "meta[itemprop='datePublished']",
+)
+
+
+# ─── 백엔드 ─────────────────────────────────────────────
+class _Backend(ABC):
+    """parse(html) → 루트, select/first(루트 또는 노드, css), text(노드: 공백 제거 텍스트 연결), attr(노드, 이름)"""
+    name = ""
+
+    def __init__(self):
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _compile(self, css: str):
+        """CSS 선택자 → 백엔드별 컴파일 객체"""
+
+    def compiled(self, css: str):
+        c = self._compiled.get(css)
+        if c is None:
+            with self._lock:
+                c = self._compiled.setdefault(css, self._compile(css))
+        return c
+
+    @abstractmethod
+    def parse(self, html): ...
+
+    @abstractmethod
+    def select(self, root, css) -> list: ...
+
+    @abstractmethod
+    def first(self, root, css): ...
+
+    @abstractmethod
+    def text(self, node) -> str: ...
+
+    @abstractmethod
+    def attr(self, node, name: str) -> Optional[str]: ...
+
+
+class _Bs4Backend(_Backend):
+    name = "bs4"
+
+    def __init__(self):
+        super().__init__()
+        import soupsieve
+        from bs4 import BeautifulSoup
+        self._sv = soupsieve
+        self._bs = BeautifulSoup
+
+    def _compile(self, css):
+        return self._sv.compile(css)
+
+    def parse(self, html):
+        return self._bs(html, "html.parser")
+
+    def select(self, root, css):
+        return self.compiled(css).select(root)
+
+    def first(self, root, css):
+        return self.compiled(css).select_one(root)
+
+    def text(self, node):
+        return node.get_text(strip=True)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class _LxmlBackend(_Backend):
+    name = "lxml"
+
+    def __init__(self):
+        super().__init__()
+        import lxml.html
+        from lxml.cssselect import CSSSelector  # cssselect 필요
+        from lxml.etree import XPath
+        self._html = lxml.html
+        self._sel = CSSSelector
+        self._text_nodes = XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+    def _compile(self, css):
+        return self._sel(css, translator="html")
+
+    def parse(self, html):
+        if not (html.strip() if isinstance(html, (str, bytes)) else html):
+            return None
+        try:
+            return self._html.document_fromstring(html)
+        except ValueError:
+            # 인코딩 선언이 있는 str은 lxml이 거부 → bytes로 재시도
+            return self._html.document_fromstring(html.encode("utf-8")) if isinstance(html, str) else None
+        except Exception:
+            return None
+
+    def select(self, root, css):
+        return self.compiled(css)(root) if root is not None else []
+
+    def first(self, root, css):
+        found = self.select(root, css)
+        return found[0] if found else None
+
+    def text(self, node):
+        # bs4 get_text(strip=True)와 동일: 텍스트 노드별 strip 후 이어붙임(주석/script/style 제외)
+        return "".join(s.strip() for s in self._text_nodes(node))
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class _SelectolaxBackend(_Backend):
+    name = "selectolax"
+
+    def __init__(self):
+        super().__init__()
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def _compile(self, css):
+        # lexbor는 선택자를 내부에서 파싱하므로 문자열 그대로 사용
+        return css
+
+    def parse(self, html):
+        tree = self._parser(html)
+        # bs4 get_text와 같게 script/style 텍스트 제외(트리에서 1회 제거)
+        tree.strip_tags(["script", "style"])
+        return tree
+
+    def select(self, root, css):
+        nodes = root.css(css)
+        if "," not in css:
+            return nodes
+        # 선택자 그룹: lexbor는 여러 선택자에 걸리는 노드를 중복 반환(문서 순서는 유지) → 첫 번째만
+        seen = set()
+        return [n for n in nodes if not (n.mem_id in seen or seen.add(n.mem_id))]
+
+    def first(self, root, css):
+        return root.css_first(css)
+
+    def text(self, node):
+        return node.text(deep=True, separator="", strip=True)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+
+_BACKENDS = {"selectolax": _SelectolaxBackend, "lxml": _LxmlBackend, "bs4": _Bs4Backend}
+_instances: dict[str, _Backend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name: str = HTML_PARSER) -> _Backend:
+    """이름(auto/selectolax/lxml/bs4) → 백엔드 싱글톤. 미설치 백엔드는 다음 후보로 대체"""
+    order = list(_BACKENDS) if name == "auto" else [name] + [n for n in _BACKENDS if n != name]
+    with _instances_lock:
+        for n in order:
+            if n in _instances:
+                return _instances[n]
+            try:
+                _instances[n] = _BACKENDS[n]()
+            except ImportError:
+                if n == name:
+                    print(f"⚠️ HTML 파서 {n} 미설치 → 대체 백엔드 사용")
+                continue
+            return _instances[n]
+    raise ImportError("사용 가능한 HTML 파서 없음")
+
+
+def available_backends() -> list[str]:
+    out = []
+    for n, cls in _BACKENDS.items():
+        try:
+            cls()
+            out.append(n)
+        except ImportError:
+            pass
+    return out
+
+
+# ─── 추출 ───────────────────────────────────────────────
+def _to_kst_date(value: str) -> Optional[str]:
+    try:
+        utc_iso = value.replace("Z", "+00:00")
+        kst = pd.to_datetime(utc_iso).tz_convert("Asia/Seoul").to_pydatetime()
+        return kst.strftime("%Y-%m-%d")
+    except Exception:
+        return None
+
+
+def _title(b: _Backend, root) -> str:
+    # 1) 메타 우선
+    for css in TITLE_META:
+        node = b.first(root, css)
+        if node is not None and b.attr(node, "content"):
+            return b.attr(node, "content").strip()
+    # 2) 구조화된 h1 후보들
+    for css in TITLE_HEADINGS:
+        node = b.first(root, css)
+        if node is not None and b.text(node):
+            return b.text(node)
+    # 3) 최후: <title>
+    node = b.first(root, TITLE_TAG)
+    return b.text(node) if node is not None else ""
+
+
+def _content(b: _Backend, root) -> str:
+    for css in (CONTENT_PRIMARY, *CONTENT_FALLBACKS):
+        nodes = b.select(root, css)
+        if nodes:
+            return " ".join(t for t in (b.text(p) for p in nodes) if t)
+    for css in CONTENT_META:
+        node = b.first(root, css)
+        if node is not None:
+            return (b.attr(node, "content") or "").strip()
+    # 정말 없으면 빈 문자열(상위에서 "본문 없음" 처리)
+    return ""
+
+
+def _date(b: _Backend, root) -> str:
+    # 1) 가장 신뢰할 수 있는 time[datetime] → 2) 기사 메타의 퍼블리시드 타임 → 3) 실패 시 오늘 날짜
+    node = b.first(root, DATE_TIME)
+    if node is not None:
+        d = _to_kst_date(b.attr(node, "datetime") or "")
+        if d:
+            return d
+    for css in DATE_META:
+        node = b.first(root, css)
+        if node is not None and b.attr(node, "content"):
+            d = _to_kst_date(b.attr(node, "content"))
+            if d:
+                return d
+    return dt.datetime.now().strftime("%Y-%m-%d")
+
+
+def extract_article(html, backend: Optional[str] = None) -> dict:
+    """HTML(str/bytes) → {"title", "content", "date"(KST, YYYY-MM-DD)}"""
+    b = get_backend(backend or HTML_PARSER)
+    root = b.parse(html)
+    if root is None:
+        return {"title": "", "content": "", "date": dt.datetime.now().strftime("%Y-%m-%d")}
+    return {"title": _title(b, root), "content": _content(b, root), "date": _date(b, root)}
+
+
+def select_links(html, selectors: list[str], backend: Optional[str] = None) -> list[Optional[str]]:
+    """첫 번째로 매칭되는 선택자의 블록들에서 href 추출(블록 자신이 a가 아니면 첫 하위 a)"""
+    b = get_backend(backend or HTML_PARSER)
+    root = b.parse(html)
+    if root is None:
+        return []
+    blocks = []
+    for css in selectors:
+        blocks = b.select(root, css)
+        if blocks:
+            break
+    hrefs = []
+    for block in blocks:
+        a = b.first(block, "a")
+        if a is None:
+            a = block
+        hrefs.append(b.attr(a, "href"))
+    return hrefs
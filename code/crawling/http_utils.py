@@ -1,33 +1,100 @@
+import time
 import random
+import threading
+from contextlib import contextmanager
 from itertools import cycle
 from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from .html_cache import get_html_cache
 from .settings import UA_LIST, ACCEPT_LANGUAGE, REQUEST_TIMEOUT, TOTAL_RETRY, BACKOFF_FACTOR
 
 
+# 모든 요청 공통 헤더(세션/클라이언트에 1회 설정, 요청마다는 User-Agent만 지정)
+DEFAULT_HEADERS = {
+    "Accept-Language": ACCEPT_LANGUAGE,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
 class UARotator:
     def __init__(self, ua_list: Optional[List[str]] = None, mode: str = "round_robin"):
         self.ua_list = ua_list or UA_LIST
         self.mode = mode
         self._cycle: Iterable[str] = cycle(self.ua_list)
+        self._lock = threading.Lock()
 
     def pick(self) -> str:
         if self.mode == "random":
             return random.choice(self.ua_list)
-        return next(self._cycle)
+        with self._lock:
+            return next(self._cycle)
+
+
+class TokenBucket:
+    """초당 rate개 토큰을 채우는 버킷(최대 capacity). acquire()는 토큰 1개를 얻을 때까지 대기."""
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """호스트별 동시 요청 수(세마포어) + 초당 요청 수(토큰 버킷) 제한"""
+    def __init__(self, rate_per_host: float, burst: int = 1, max_concurrent_per_host: int = 1):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_concurrent_per_host = max(1, max_concurrent_per_host)
+        self._hosts: dict[str, tuple[threading.Semaphore, TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, host: str) -> tuple[threading.Semaphore, TokenBucket]:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    threading.Semaphore(self.max_concurrent_per_host),
+                    TokenBucket(self.rate_per_host, self.burst),
+                )
+            return self._hosts[host]
+
+    @contextmanager
+    def limit(self, url: str):
+        sem, bucket = self._get(urlsplit(url).netloc.lower())
+        with sem:
+            bucket.acquire()
+            yield
+
 
 def make_session(total_retry: int = TOTAL_RETRY, backoff_factor: float = BACKOFF_FACTOR) -> requests.Session:
     s = requests.Session()
+    s.headers.update(DEFAULT_HEADERS)
     r = Retry(
         total=total_retry,
         read=total_retry,
         connect=total_retry,
         backoff_factor=backoff_factor,
-        status_forcelist=(429, 500, 502, 503, 504),
+        status_forcelist=RETRY_STATUS,
         allowed_methods=("GET", "HEAD", "OPTIONS"),
         raise_on_status=False,
     )
@@ -36,11 +103,26 @@ def make_session(total_retry: int = TOTAL_RETRY, backoff_factor: float = BACKOFF
     s.mount("https://", adapter)
     return s
 
-def http_get(url: str, session: requests.Session, ua_rotator: UARotator, **kwargs) -> requests.Response:
-    headers = kwargs.pop("headers", {})
-    headers.setdefault("User-Agent", ua_rotator.pick())
-    headers.setdefault("Accept-Language", ACCEPT_LANGUAGE)
-    headers.setdefault("Accept", "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8")
+def http_get(url: str, session: requests.Session, ua_rotator: UARotator, use_cache: bool = True,
+             **kwargs) -> requests.Response:
+    """
+    GET (세션 재시도 포함). HTML 캐시에 있는 URL이면 조건부 요청을 보내고,
+    304면 캐시 본문을 담은 200 응답으로 반환. 새 200 응답은 캐시에 저장
+    """
+    # Accept/Accept-Language는 make_session에서 세션 헤더로 설정됨
+    headers = {"User-Agent": ua_rotator.pick(), **kwargs.pop("headers", {})}
     timeout = kwargs.pop("timeout", REQUEST_TIMEOUT)
-    return session.get(url, headers=headers, timeout=timeout, **kwargs)
+    cache = get_html_cache() if use_cache else None
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None:
+        headers = {**cached.conditional_headers(), **headers}
 
+    resp = session.get(url, headers=headers, timeout=timeout, **kwargs)
+    if cache is None:
+        return resp
+    if resp.status_code == 304 and cached is not None:
+        cache.refresh(url, resp.headers)
+        resp.status_code, resp._content, resp.encoding = 200, cached.body, cached.encoding
+    elif resp.status_code == 200:
+        cache.put(url, resp.content, resp.encoding, resp.headers)
+    return resp
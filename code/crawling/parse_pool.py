@@ -0,0 +1,78 @@
+"""
+기사 HTML 파싱 프로세스 풀 (수집 I/O와 CPU 파싱 분리)
+- 수집 스레드/이벤트 루프는 응답 원본(bytes)만 넘기고 바로 다음 다운로드로 진행
+- 워커 프로세스에서 extract_article(제목/본문/날짜) 실행 → 파싱이 GIL을 나누지 않고 여러 코어로 분산
+- 파싱 대기 중인 응답 수를 max_pending으로 제한: 가득 차면 submit이 블록 → 수집 쪽이 대기(메모리 상한)
+- 실행 전체가 풀 1개 공유 (Lazy 싱글톤, close_parse_pool()로 종료)
+"""
+
+import atexit
+import multiprocessing as mp
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from .html_extract import extract_article
+from .settings import HTML_PARSER, PARSE_WORKERS, PARSE_MAX_PENDING
+
+
+def _init_worker(backend: str) -> None:
+    # 파서 모듈 import/선택자 컴파일을 첫 기사 전에 끝냄
+    extract_article("<html><body><article><p>warmup</p></article></body></html>", backend=backend)
+
+
+def _extract(content: bytes, encoding: Optional[str], backend: str) -> dict:
+    html = content.decode(encoding or "utf-8", errors="replace")
+    return extract_article(html, backend=backend)
+
+
+class ParsePool:
+    def __init__(self, workers: int = PARSE_WORKERS, max_pending: int = PARSE_MAX_PENDING, backend: str = HTML_PARSER):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.backend = backend
+        self._closed = False
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        # 수집 스레드/이벤트 루프 스레드가 있는 부모를 fork하지 않도록 spawn 사용
+        self._ex = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                                       initializer=_init_worker, initargs=(backend,))
+
+    def submit(self, content: bytes, encoding: Optional[str] = None) -> Future:
+        """응답 원본 → {"title", "content", "date"} Future. 대기 중인 파싱이 max_pending개면 빈자리가 날 때까지 블록"""
+        self._slots.acquire()
+        try:
+            fut = self._ex.submit(_extract, content, encoding, self.backend)
+        except Exception:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _: self._slots.release())
+        return fut
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._ex.shutdown(wait=True, cancel_futures=True)
+
+
+# 프로세스 단위 공유 풀 (Lazy 싱글톤, PARSE_WORKERS=0이면 None → 수집 스레드에서 바로 파싱)
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+def get_parse_pool(workers: int = PARSE_WORKERS) -> Optional[ParsePool]:
+    """workers는 풀을 처음 만들 때만 적용"""
+    global _pool
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = ParsePool(workers=workers)
+            atexit.register(_pool.close)
+        return _pool
+
+def close_parse_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -12,6 +12,13 @@ DEFAULT_ARTICLES = int(os.getenv("YF_MAX_ARTICLES", "200"))
 STOP_TOPN = int(os.getenv("YF_STOP_TOPN", "15"))
 STOP_LOOKBACK_DAYS = int(os.getenv("YF_STOP_LOOKBACK_DAYS", "7"))
 
+# 수집 URL 색인(SQLite) 파일명: {RAW_DIR}/_url_index.sqlite
+URL_INDEX_FILENAME = "_url_index.sqlite"
+
+# 파티션 저장: 실행별 조각 파일 디렉토리명 / 컴팩션 기준 조각 수
+PARTS_DIRNAME = "parts"
+COMPACT_MIN_PARTS = int(os.getenv("YF_COMPACT_MIN_PARTS", "8"))
+
 # UA 3종(+1)과 공통 설정
 UA_LIST = [
     # Chrome (Windows)
@@ -32,6 +39,29 @@ REQUEST_TIMEOUT = 15
 TOTAL_RETRY = 3
 BACKOFF_FACTOR = 0.8
 
+# 동시 수집: 전체 동시 요청 수 / 호스트별 동시 요청 수 / 호스트별 초당 요청 수(토큰 버킷)
+FETCH_CONCURRENCY = int(os.getenv("YF_FETCH_CONCURRENCY", "8"))
+PER_HOST_CONCURRENCY = int(os.getenv("YF_PER_HOST_CONCURRENCY", "4"))
+PER_HOST_RPS = float(os.getenv("YF_PER_HOST_RPS", "2.0"))
+PER_HOST_BURST = int(os.getenv("YF_PER_HOST_BURST", "2"))
+
+# 본문 수집 엔진: threads(requests 세션 + 스레드 풀) 또는 async(aiohttp/httpx, 실행 전체가 연결 풀 1개 공유. 미설치 시 threads)
+FETCH_ENGINE = os.getenv("YF_FETCH_ENGINE", "threads").lower()
+ASYNC_BACKEND = os.getenv("YF_ASYNC_BACKEND", "auto").lower() # auto / aiohttp / httpx
+ASYNC_MAX_CONNECTIONS = int(os.getenv("YF_ASYNC_MAX_CONNECTIONS", "16"))
+ASYNC_HTTP2 = os.getenv("YF_HTTP2", "false").lower() == "true" # httpx[http2] 설치 시 HTTP/2 사용(auto면 httpx 선택)
+
+# 기사 HTML 파서: auto(selectolax → lxml(+cssselect) → bs4 중 설치된 것) / selectolax / lxml / bs4
+HTML_PARSER = os.getenv("YF_HTML_PARSER", "auto").lower()
+# 기사 파싱 프로세스 수(0이면 수집 스레드에서 바로 파싱) / 파싱 대기 응답 수 상한(초과 시 수집 대기)
+PARSE_WORKERS = int(os.getenv("YF_PARSE_WORKERS", "0"))
+PARSE_MAX_PENDING = int(os.getenv("YF_PARSE_MAX_PENDING", "32"))
+
+# 기사 원본 HTML 캐시(zlib 압축 SQLite): ETag/Last-Modified 조건부 요청, 304면 캐시 본문 사용 / 최대 크기(MB, 초과 시 LRU 삭제)
+HTML_CACHE_ENABLED = os.getenv("YF_HTML_CACHE", "true").lower() == "true"
+HTML_CACHE_PATH = os.getenv("YF_HTML_CACHE_PATH", os.path.join(BASE_DIR, "cache", "html_cache.sqlite"))
+HTML_CACHE_MAX_MB = int(os.getenv("YF_HTML_CACHE_MAX_MB", "512"))
+
 # Selenium 공통 옵션
 SELENIUM = {
     "headless": True,
@@ -40,4 +70,17 @@ SELENIUM = {
     "page_load_timeout": 180,
     "scroll_pause": 1.6,
     "max_stable_rounds": 2,
+    "scroll_wait_timeout": float(os.getenv("YF_SCROLL_WAIT_TIMEOUT", "3.0")),  # 스크롤 후 새 카드 대기 최대 시간
+    "scroll_poll": 0.2,
 }
+
+# Selenium 드라이버 풀: 유지할 세션 수(docker-compose SE_NODE_MAX_SESSIONS와 맞춤) / 세션당 최대 페이지 수(초과 시 재생성)
+DRIVER_POOL_SIZE = int(os.getenv("YF_DRIVER_POOL_SIZE", "5"))
+DRIVER_MAX_PAGES = int(os.getenv("YF_DRIVER_MAX_PAGES", "50"))
+# 본문이 빈약할 때 Selenium 폴백 사용 여부(드라이버 풀 재사용)
+SELENIUM_FALLBACK = os.getenv("YF_SELENIUM_FALLBACK", "false").lower() == "true"
+
+# 크롤링 → 분석 파이프라인 큐(data/raw/_work_queue.sqlite): 파티션 저장 직후 (ticker, date)를 넣어 분석(main_analysis --follow)이 바로 처리
+PIPELINE_QUEUE = os.getenv("STOCKMIND_PIPELINE_QUEUE", "false").lower() == "true"
+PIPELINE_QUEUE_MAXSIZE = int(os.getenv("STOCKMIND_PIPELINE_QUEUE_MAXSIZE", "16")) # 대기 작업 상한(초과 시 크롤러 대기)
+PIPELINE_QUEUE_PUT_TIMEOUT = float(os.getenv("STOCKMIND_PIPELINE_QUEUE_PUT_TIMEOUT", "600")) # backpressure 최대 대기(초)
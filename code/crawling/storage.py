@@ -0,0 +1,137 @@
+"""
+{ticker}/{date} 파티션 저장 레이아웃 (append-only)
+- news.parquet (또는 news.csv): 컴팩션된 기본 파일(기존 레이아웃과 호환)
+- parts/part-*.parquet (또는 .csv): 실행마다 신규 행만 추가하는 조각 파일
+- 조각이 COMPACT_MIN_PARTS개 이상 쌓이면 기본 파일로 병합 후 조각 삭제
+"""
+
+import os
+import re
+import uuid
+import datetime as dt
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from .settings import PARTS_DIRNAME, COMPACT_MIN_PARTS
+
+BASE_FILES = ("news.parquet", "news.csv")
+
+
+def _safe(x: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(x))[:40] or "run"
+
+
+def _atomic_write(df: pd.DataFrame, path: str) -> str:
+    """임시 파일에 쓴 뒤 os.replace로 교체(읽는 쪽이 쓰다 만 파일을 보지 않도록). Parquet 실패 시 CSV."""
+    tmp = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    try:
+        df.to_parquet(tmp, index=False)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        path = os.path.splitext(path)[0] + ".csv"
+        tmp = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def partition_files(save_dir: str) -> List[str]:
+    """기본 파일 → 조각 파일(생성 순) 순서의 파일 목록"""
+    files = [os.path.join(save_dir, f) for f in BASE_FILES if os.path.exists(os.path.join(save_dir, f))]
+    pdir = os.path.join(save_dir, PARTS_DIRNAME)
+    if os.path.isdir(pdir):
+        files += [
+            os.path.join(pdir, f) for f in sorted(os.listdir(pdir))
+            if f.startswith("part-") and f.endswith((".parquet", ".csv"))
+        ]
+    return files
+
+
+def _read_file(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    if columns:
+        return pd.read_csv(path, usecols=lambda c: c in columns)
+    return pd.read_csv(path)
+
+
+def iter_partition(save_dir: str, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """파티션을 파일 단위로 스트리밍(하루 전체를 메모리에 올리지 않음)"""
+    for path in partition_files(save_dir):
+        try:
+            yield _read_file(path, columns)
+        except FileNotFoundError:
+            # 컴팩션으로 조각이 방금 삭제된 경우(내용은 기본 파일에 병합됨)
+            continue
+
+
+def fetched_ok(df: pd.DataFrame) -> pd.Series:
+    """본문을 실제로 받은 행(수집 실패·빈 본문·비정상 상태 코드 제외) → 재수집하지 않아도 되는 행"""
+    content = df["content"].fillna("").astype(str).str.strip() if "content" in df.columns else pd.Series("", index=df.index)
+    ok = (content != "") & (content != "본문 없음")
+    if "status_code" in df.columns:
+        ok &= pd.to_numeric(df["status_code"], errors="coerce").eq(200)
+    return ok
+
+
+def read_partition(save_dir: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """파티션 전체를 하나의 DataFrame으로(url 기준 중복 제거, 본문을 받은 행 → 먼저 저장된 행 우선)"""
+    frames = [df for df in iter_partition(save_dir, columns) if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True, sort=False) if len(frames) > 1 else frames[0]
+    if "url" in df.columns:
+        # 이전 실행의 수집 실패 행보다 재시도로 받은 본문 행을 남김(원래 순서 유지)
+        order = (~fetched_ok(df)).sort_values(kind="stable").index if "content" in df.columns else df.index
+        df = df.loc[order].drop_duplicates(subset=["url"], keep="first").sort_index()
+    return df.reset_index(drop=True)
+
+
+def write_part(save_dir: str, df: pd.DataFrame, run_id: str = "") -> str:
+    """신규 행만 조각 파일로 추가(기존 파일은 읽거나 다시 쓰지 않음). 반환값: 저장 경로"""
+    pdir = os.path.join(save_dir, PARTS_DIRNAME)
+    os.makedirs(pdir, exist_ok=True)
+    name = f"part-{dt.datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{_safe(run_id)}-{uuid.uuid4().hex[:8]}.parquet"
+    return _atomic_write(df, os.path.join(pdir, name))
+
+
+def compact_partition(save_dir: str, min_parts: int = COMPACT_MIN_PARTS) -> Optional[str]:
+    """조각이 min_parts개 이상이면 기본 파일 + 조각을 병합해 news.parquet로 교체 후 조각 삭제"""
+    files = partition_files(save_dir)
+    parts = [f for f in files if os.path.basename(os.path.dirname(f)) == PARTS_DIRNAME]
+    if len(parts) < max(1, min_parts):
+        return None
+
+    merged = read_partition(save_dir)
+    out = _atomic_write(merged, os.path.join(save_dir, "news.parquet"))
+    # 형식이 바뀐 경우 이전 기본 파일 제거
+    for f in BASE_FILES:
+        p = os.path.join(save_dir, f)
+        if p != out and os.path.exists(p):
+            os.remove(p)
+    for p in parts:
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+    return out
+
+
+def compact_all(out_dir: str, min_parts: int = COMPACT_MIN_PARTS) -> int:
+    """out_dir 아래 모든 {ticker}/{date} 파티션 컴팩션. 반환값: 컴팩션한 파티션 수"""
+    n = 0
+    if not os.path.isdir(out_dir):
+        return n
+    for ticker in os.listdir(out_dir):
+        tdir = os.path.join(out_dir, ticker)
+        if not os.path.isdir(tdir):
+            continue
+        for date in os.listdir(tdir):
+            ddir = os.path.join(tdir, date)
+            if os.path.isdir(ddir) and compact_partition(ddir, min_parts):
+                n += 1
+    return n
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .settings import URL_INDEX_FILENAME
+from .storage import read_partition, fetched_ok
+
+# 추적/동의(consent)용 쿼리 파라미터는 같은 기사로 간주
+_DROP_QUERY_PREFIXES = ("utm_", "guccounter", "guce_", "ncid", ".tsrc")
+
+
+def normalize_url(u: Optional[str]) -> str:
+    """공백 제거 + scheme/host 소문자 + fragment/추적 파라미터 제거 + 끝 슬래시 제거"""
+    u = str(u).strip() if u is not None else ""
+    if not u:
+        return ""
+    try:
+        parts = urlsplit(u)
+    except ValueError:
+        return u
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_DROP_QUERY_PREFIXES)
+    ])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+class UrlIndex:
+    """
+    out_dir 아래 SQLite로 유지하는 수집 URL 색인.
+    - 키: (정규화 URL, ticker) → 기사 date, fetched_at
+    - 저장 성공 후 한 트랜잭션으로 갱신, HTTP 요청 전 known()으로 O(1) 조회
+    - 색인이 비어 있으면 기존 파티션 파일에서 1회 구축
+    """
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self.path = os.path.join(out_dir, URL_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            " url TEXT NOT NULL, ticker TEXT NOT NULL, date TEXT, fetched_at TEXT,"
+            " PRIMARY KEY (url, ticker))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_ticker_date ON urls(ticker, date)")
+        self._conn.commit()
+        if self._is_empty():
+            self.rebuild_from_disk()
+
+    def _is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM urls LIMIT 1").fetchone() is None
+
+    def known(self, urls: Iterable[str], ticker: str) -> set[str]:
+        """urls 중 ticker로 이미 저장된 것(정규화 URL 기준)을 원래 문자열로 반환"""
+        by_norm: dict[str, list[str]] = {}
+        for u in urls:
+            by_norm.setdefault(normalize_url(u), []).append(u)
+        keys = [k for k in by_norm if k]
+        found = set()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                q = f"SELECT url FROM urls WHERE ticker = ? AND url IN ({','.join('?' * len(part))})"
+                for (k,) in self._conn.execute(q, [ticker, *part]):
+                    found.update(by_norm[k])
+        return found
+
+    def recent(self, ticker: str, since_date: str, top_n: int) -> list[str]:
+        """since_date 이후 기사 중 최신순 top_n개 URL"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM urls WHERE ticker = ? AND date >= ? ORDER BY date DESC, fetched_at DESC LIMIT ?",
+                (ticker, since_date, top_n),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def add_many(self, rows: Iterable[dict]) -> None:
+        """rows: {'url', 'ticker', 'date', 'fetched_at'} (한 트랜잭션으로 원자적 반영)"""
+        data = [
+            (normalize_url(r.get("url")), str(r.get("ticker") or ""), str(r.get("date") or ""), str(r.get("fetched_at") or ""))
+            for r in rows
+        ]
+        data = [d for d in data if d[0] and d[1]]
+        if not data:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO urls (url, ticker, date, fetched_at) VALUES (?, ?, ?, ?)", data)
+
+    def rebuild_from_disk(self) -> None:
+        """{out_dir}/{ticker}/{date} 파티션(기본 파일 + 조각)의 url 컬럼만 읽어 색인 구축"""
+        if not os.path.isdir(self.out_dir):
+            return
+        for ticker in os.listdir(self.out_dir):
+            tdir = os.path.join(self.out_dir, ticker)
+            if not os.path.isdir(tdir):
+                continue
+            rows = []
+            for date in os.listdir(tdir):
+                ddir = os.path.join(tdir, date)
+                if not os.path.isdir(ddir):
+                    continue
+                for u in _read_url_column(ddir):
+                    rows.append({"url": u, "ticker": ticker, "date": date, "fetched_at": ""})
+            self.add_many(rows)
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+def _read_url_column(save_dir: str) -> list[str]:
+    """본문을 받은 행의 url (수집 실패 행은 색인하지 않음)"""
+    try:
+        df = read_partition(save_dir, columns=["url", "content"])
+    except Exception:
+        try:
+            df = read_partition(save_dir, columns=["url"])
+        except Exception:
+            return []
+    if "content" in df.columns:
+        df = df[fetched_ok(df)]
+    return df["url"].dropna().astype(str).tolist()
+
+
+# out_dir별 싱글톤
+_indexes: dict[str, UrlIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_url_index(out_dir: str) -> UrlIndex:
+    key = os.path.abspath(out_dir)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = UrlIndex(key)
+        return _indexes[key]
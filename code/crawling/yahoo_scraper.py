@@ -1,16 +1,14 @@
-import os
 import time, random
 from typing import List, Set, Optional
 
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 
 from .settings import SELENIUM, UA_LIST
+from .driver_pool import get_driver_pool
+from .html_extract import select_links
 
 YF_STORY_SEL = "section[data-testid='storyitem']"
 
@@ -20,41 +18,6 @@ YF_STORY_FALLBACKS = [
     "div.caas-content-wrapper a"
 ]
 
-def _get_driver(options: Options):
-    """
-    USE_REMOTE_WEBDRIVER=true 이면 Compose의 selenium 서비스로 원격 연결,
-    아니면 컨테이너 내부의 로컬 Chrome(설치 시)에 연결.
-    """
-    use_remote = os.getenv("USE_REMOTE_WEBDRIVER", "false").lower() == "true"
-    if use_remote:
-        remote_url = os.getenv("SELENIUM_REMOTE_URL", "http://selenium:4444")
-        return webdriver.Remote(command_executor=remote_url, options=options)
-    else:
-        return webdriver.Chrome(options=options)
-
-def _build_chrome_options(user_agent: Optional[str] = None) -> Options:
-    opts = Options()
-    if SELENIUM.get("headless", True):
-        opts.add_argument("--headless=new")
-    if SELENIUM.get("disable_gpu", True):
-        opts.add_argument("--disable-gpu")
-    w, h = SELENIUM.get("window_size", (1920, 1080))
-    opts.add_argument(f"--window-size={w}x{h}")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--blink-settings=imagesEnabled=false")
-    opts.add_experimental_option(
-        "prefs",
-        {
-            "profile.managed_default_content_settings.images": 2,
-            "profile.managed_default_content_settings.stylesheets": 2,
-            "profile.default_content_setting_values.notifications": 2,
-        },
-    )
-    if user_agent:
-        opts.add_argument(f"--user-agent={user_agent}")
-    return opts
-
 def _normalize_url(href: str) -> Optional[str]:
     if not href:
         return None
@@ -109,10 +72,8 @@ def _dismiss_consent(driver):
 
 def collect_yahoo_links(ticker: str, max_scroll: int, stop_urls: Set[str], user_agent: Optional[str] = None) -> List[str]:
     url = f"https://finance.yahoo.com/quote/{ticker}/news?p={ticker}"
-    options = _build_chrome_options(user_agent=user_agent or random.choice(UA_LIST))
-    driver = _get_driver(options)
-    try:
-        driver.set_page_load_timeout(SELENIUM.get("page_load_timeout", 180))
+    # 공유 드라이버 풀에서 세션을 빌려 사용(반납 후 재사용, 오류 시 폐기)
+    with get_driver_pool().lease(user_agent=user_agent or random.choice(UA_LIST)) as driver:
         driver.get(url)
         try:
             _dismiss_consent(driver)
@@ -126,30 +87,16 @@ def collect_yahoo_links(ticker: str, max_scroll: int, stop_urls: Set[str], user_
             stable_need=SELENIUM.get("max_stable_rounds", 2),
         )
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        blocks = soup.select(YF_STORY_SEL)
+        html = driver.page_source
 
-        if not blocks:
-            for sel in YF_STORY_FALLBACKS:
-                blocks = soup.select(sel)
-                if blocks:
-                    break
+    # 스토리 블록(없으면 fallback 선택자)의 링크만 추출(설정된 파서 백엔드, 선택자 1회 컴파일)
+    hrefs = select_links(html, [YF_STORY_SEL, *YF_STORY_FALLBACKS])
 
-        links, seen = [], set()
-        for sec in blocks:
-            a = sec.find("a") if hasattr(sec, "find") else None
-            if a is None and hasattr(sec, "get"):
-                a = sec
-            href = (a.get("href") if a else None)
-            u = _normalize_url(href)
-            if not u or u in seen:
-                continue
-            seen.add(u)
-            links.append(u)
-        return links
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+    links, seen = [], set()
+    for href in hrefs:
+        u = _normalize_url(href)
+        if not u or u in seen:
+            continue
+        seen.add(u)
+        links.append(u)
+    return links
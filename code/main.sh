@@ -1,5 +1,12 @@
 #!/bin/bash
 
-python -m crawling.main_crawling
-python -m analysis.main_analysis
-
+if [ "${STOCKMIND_PIPELINE_QUEUE:-false}" = "true" ]; then
+    # 파이프라인 모드: 크롤러가 파티션을 저장하는 대로 분석(--follow)이 작업 큐에서 받아 처리
+    python -m analysis.main_analysis --follow &
+    consumer=$!
+    python -m crawling.main_crawling
+    wait $consumer
+else
+    python -m crawling.main_crawling
+    python -m analysis.main_analysis
+fi
@@ -0,0 +1,114 @@
+"""
+티커별 파티션 매니페스트 (data/raw/{ticker}/_manifest.sqlite)
+- 크롤러: 파티션에 기사를 저장/컴팩션한 뒤 입력 지문(input_sig) 기록
+- 분석기: 결과 저장 후 처리한 입력 지문(output_sig) 기록
+- pending 판단 = input_sig != output_sig → 날짜별 파일 stat/결과 파일 열기 없이 쿼리 1회
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+import datetime as dt
+from typing import Dict, List, Optional
+
+MANIFEST_FILENAME = "_manifest.sqlite"
+BASE_FILES = ("news.parquet", "news.csv")
+PARTS_DIRNAME = "parts"
+
+
+def partition_signature(save_dir: str) -> Optional[str]:
+    """파티션 파일(기본 파일 + parts/part-*)의 (경로, 크기, mtime_ns) 해시. 파일이 없으면 None"""
+    entries = []
+    for f in BASE_FILES:
+        p = os.path.join(save_dir, f)
+        if os.path.exists(p):
+            st = os.stat(p)
+            entries.append((f, st.st_size, st.st_mtime_ns))
+    pdir = os.path.join(save_dir, PARTS_DIRNAME)
+    if os.path.isdir(pdir):
+        for f in sorted(os.listdir(pdir)):
+            if f.startswith("part-") and f.endswith((".parquet", ".csv")):
+                st = os.stat(os.path.join(pdir, f))
+                entries.append((f"{PARTS_DIRNAME}/{f}", st.st_size, st.st_mtime_ns))
+    if not entries:
+        return None
+    return hashlib.sha1(json.dumps(entries).encode("utf-8")).hexdigest()
+
+
+def _now() -> str:
+    return dt.datetime.now().isoformat(timespec="seconds")
+
+
+class PartitionManifest:
+    """크롤러/분석기(여러 프로세스)가 함께 쓰므로 SQLite(WAL) 사용"""
+    def __init__(self, ticker_dir: str):
+        os.makedirs(ticker_dir, exist_ok=True)
+        self.path = os.path.join(ticker_dir, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS partitions ("
+            " date TEXT PRIMARY KEY,"
+            " input_sig TEXT, input_rows INTEGER DEFAULT 0, input_updated_at TEXT,"
+            " output_sig TEXT, output_rows INTEGER, output_status TEXT, output_updated_at TEXT)"
+        )
+        self._conn.commit()
+
+    def entries(self) -> Dict[str, dict]:
+        with self._lock:
+            return {r["date"]: dict(r) for r in self._conn.execute("SELECT * FROM partitions")}
+
+    def pending(self) -> List[str]:
+        """입력이 기록됐고 (미처리 or 처리 후 입력 변경 or 마지막 처리 실패)인 날짜"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date FROM partitions WHERE input_sig IS NOT NULL"
+                " AND (output_sig IS NULL OR output_sig != input_sig OR output_status != 'success')"
+                " ORDER BY date"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def input_sig(self, date: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT input_sig FROM partitions WHERE date = ?", (date,)).fetchone()
+        return row[0] if row else None
+
+    def record_input(self, date: str, sig: Optional[str], rows_added: int = 0) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO partitions (date, input_sig, input_rows, input_updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(date) DO UPDATE SET input_sig = excluded.input_sig,"
+                " input_rows = COALESCE(input_rows, 0) + excluded.input_rows, input_updated_at = excluded.input_updated_at",
+                (date, sig, int(rows_added), _now()),
+            )
+
+    def record_output(self, date: str, sig: Optional[str], rows: Optional[int], status: str = "success") -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO partitions (date, output_sig, output_rows, output_status, output_updated_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(date) DO UPDATE SET output_sig = excluded.output_sig, output_rows = excluded.output_rows,"
+                " output_status = excluded.output_status, output_updated_at = excluded.output_updated_at",
+                (date, sig, rows, status, _now()),
+            )
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+# ticker 디렉토리별 싱글톤
+_manifests: Dict[str, PartitionManifest] = {}
+_manifests_lock = threading.Lock()
+
+def get_manifest(ticker_dir: str) -> PartitionManifest:
+    key = os.path.abspath(ticker_dir)
+    with _manifests_lock:
+        if key not in _manifests:
+            _manifests[key] = PartitionManifest(key)
+        return _manifests[key]
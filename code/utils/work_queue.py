@@ -0,0 +1,162 @@
+"""
+크롤링 → 분석 파이프라인 작업 큐 (data/raw/_work_queue.sqlite)
+- 크롤러(생산자): 파티션 저장 직후 (ticker, date) 추가. 대기 작업이 maxsize 이상이면 소비자가 따라잡을 때까지 대기(backpressure)
+- 분석기(소비자): lease를 잡고 처리 → 성공 시 ack, 실패 시 nack(재시도). lease 만료(소비자 중단) 작업은 다시 배달(at-least-once)
+- 처리 중인 파티션에 새 기사가 추가되면 dirty 표시 → ack 후 다시 대기열로
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import List, Tuple
+
+QUEUE_FILENAME = "_work_queue.sqlite"
+
+
+class WorkQueue:
+    """크롤러/분석기(서로 다른 프로세스)가 함께 쓰므로 SQLite(WAL) 사용"""
+    def __init__(self, raw_dir: str, maxsize: int = 16, lease_sec: float = 1800.0):
+        os.makedirs(raw_dir, exist_ok=True)
+        self.path = os.path.join(raw_dir, QUEUE_FILENAME)
+        self.maxsize = maxsize
+        self.lease_sec = lease_sec
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS units ("
+            " ticker TEXT NOT NULL, date TEXT NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending', dirty INTEGER NOT NULL DEFAULT 0,"
+            " attempts INTEGER NOT NULL DEFAULT 0, lease_until REAL, enqueued_at REAL NOT NULL,"
+            " PRIMARY KEY (ticker, date))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    # ─── 상태 ───────────────────────────────────────────────
+    def _set_meta(self, **kv) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(k, str(v)) for k, v in kv.items()],
+            )
+
+    def meta(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+    def depth(self) -> int:
+        """소비 가능한 작업 수(pending + lease 만료)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM units WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)",
+                (time.time(),),
+            ).fetchone()[0]
+
+    def unfinished(self) -> int:
+        """대기 + 처리 중 작업 수(실패 제외)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM units WHERE state != 'failed'").fetchone()[0]
+
+    # ─── 생산자(크롤러) ─────────────────────────────────────
+    def open_producer(self) -> None:
+        gen = int(self.meta().get("producer_gen", "0")) + 1
+        self._set_meta(producer_state="open", producer_gen=gen, producer_at=time.time())
+
+    def close_producer(self) -> None:
+        self._set_meta(producer_state="closed", producer_at=time.time())
+
+    def consumer_alive(self) -> bool:
+        return time.time() - float(self.meta().get("consumer_at", "0")) < self.lease_sec
+
+    def put(self, ticker: str, date: str, timeout: float = 600.0, poll: float = 1.0) -> bool:
+        """
+        (ticker, date) 추가. 이미 대기 중이면 합침, 처리 중이면 dirty 표시(처리 후 다시 배달).
+        대기 작업이 maxsize 이상이고 소비자가 살아 있으면 최대 timeout초 대기. 반환값: 대기 없이/제한 시간 내 추가했는지
+        """
+        deadline = time.monotonic() + timeout
+        ok = True
+        while self.maxsize and self.depth() >= self.maxsize and self.consumer_alive():
+            if time.monotonic() >= deadline:
+                ok = False
+                break
+            time.sleep(poll)
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO units (ticker, date, enqueued_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(ticker, date) DO UPDATE SET"
+                " dirty = CASE WHEN state = 'leased' THEN 1 ELSE dirty END,"
+                " state = CASE WHEN state = 'leased' THEN state ELSE 'pending' END,"
+                " attempts = CASE WHEN state = 'failed' THEN 0 ELSE attempts END",
+                (ticker, date, now),
+            )
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('producer_at', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(now),),
+            )
+        return ok
+
+    # ─── 소비자(분석기) ─────────────────────────────────────
+    def heartbeat(self) -> None:
+        self._set_meta(consumer_at=time.time())
+
+    def claim(self, n: int = 1) -> List[Tuple[str, str]]:
+        """먼저 들어온 작업부터 최대 n개 lease (lease 만료 작업 포함)"""
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT ticker, date FROM units"
+                " WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)"
+                " ORDER BY enqueued_at LIMIT ?",
+                (now, n),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE units SET state = 'leased', dirty = 0, lease_until = ? WHERE ticker = ? AND date = ?",
+                [(now + self.lease_sec, t, d) for t, d in rows],
+            )
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('consumer_at', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(now),),
+            )
+        return [(t, d) for t, d in rows]
+
+    def ack(self, ticker: str, date: str) -> None:
+        """처리 완료. 처리 중 새 입력(dirty)이 있었으면 다시 대기열로"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE units SET state = 'pending', dirty = 0, attempts = 0, lease_until = NULL"
+                " WHERE ticker = ? AND date = ? AND dirty = 1",
+                (ticker, date),
+            )
+            self._conn.execute("DELETE FROM units WHERE ticker = ? AND date = ? AND state = 'leased'", (ticker, date))
+
+    def nack(self, ticker: str, date: str, max_attempts: int = 3) -> None:
+        """처리 실패 → 재시도 대기. max_attempts회 실패하면 failed(다음 put 또는 pending 실행에서 다시 처리)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE units SET attempts = attempts + 1, lease_until = NULL,"
+                " state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END"
+                " WHERE ticker = ? AND date = ?",
+                (max_attempts, ticker, date),
+            )
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+# raw 디렉토리별 싱글톤
+_queues: dict = {}
+_queues_lock = threading.Lock()
+
+def get_work_queue(raw_dir: str, maxsize: int = 16, lease_sec: float = 1800.0) -> WorkQueue:
+    key = os.path.abspath(raw_dir)
+    with _queues_lock:
+        if key not in _queues:
+            _queues[key] = WorkQueue(key, maxsize=maxsize, lease_sec=lease_sec)
+        return _queues[key]